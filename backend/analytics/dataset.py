@@ -0,0 +1,272 @@
+import json
+from itertools import islice
+
+import numpy as np
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Case, IntegerField, When
+
+from employees.models import Employee, Position, Team
+from ratings.models import Competence, Domain, Rating, Skill
+
+# Коды соответствия навыку в колонке suitability
+YES_CODE = 0
+NO_CODE = 1
+NOT_REQUIRED_CODE = 2
+SUITABILITY_CODES = {
+    Rating.YES: YES_CODE,
+    Rating.NO: NO_CODE,
+    Rating.NOT_REQUIRED: NOT_REQUIRED_CODE,
+}
+# Количество оценок, читаемых из БД за один раз
+RATING_CHUNK_SIZE = 100_000
+# Справочники и колонки оценок набора
+DIMENSIONS = (
+    "employees", "skills", "teams", "positions", "competences", "domains"
+)
+RATING_COLUMNS = ("employee", "skill", "date", "value", "suitability")
+# Описание набора в каталоге с файлами колонок
+MANIFEST_FILE = "manifest.json"
+
+
+class Dimension:
+    """
+    Справочник измерения: объект с кодом i имеет id ids[i] и имя
+    names[i]. Остальные атрибуты хранятся массивами кодов в том же
+    порядке.
+    """
+
+    def __init__(self, ids, names, **columns):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.names = np.asarray(names, dtype=object)
+        self.columns = tuple(columns)
+        for name, column in columns.items():
+            setattr(self, name, np.asarray(column, dtype=np.int32))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def code(self, pk):
+        """Код объекта с id pk или -1, если такого объекта нет."""
+        index = int(np.searchsorted(self.ids, pk))
+        if index < len(self.ids) and self.ids[index] == pk:
+            return index
+        return -1
+
+    def codes(self, pks):
+        """Коды объектов с id из массива pks, все pks есть в справочнике."""
+        return np.searchsorted(self.ids, pks).astype(np.int32)
+
+    def save(self, path, prefix):
+        """Сохраняет справочник в файлы .npy с именами prefix.*."""
+        np.save(path / f"{prefix}.ids.npy", self.ids)
+        np.save(
+            path / f"{prefix}.names.npy",
+            np.asarray(self.names.tolist(), dtype=str),
+        )
+        for name in self.columns:
+            np.save(path / f"{prefix}.{name}.npy", getattr(self, name))
+
+    @classmethod
+    def open(cls, path, prefix, columns):
+        return cls(
+            np.load(path / f"{prefix}.ids.npy"),
+            np.load(path / f"{prefix}.names.npy").tolist(),
+            **{
+                name: np.load(path / f"{prefix}.{name}.npy")
+                for name in columns
+            },
+        )
+
+
+def load_columns(queryset, *fields):
+    """Колонки id и fields объектов queryset в порядке id."""
+    rows = list(queryset.order_by("id").values_list("id", *fields))
+    return list(zip(*rows)) if rows else [()] * (len(fields) + 1)
+
+
+def iter_chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class RatingDataset:
+    """
+    Оценки в виде колонок NumPy с целочисленными кодами измерений.
+
+    Колонки оценок - коды сотрудника, навыка и даты, оценка и код
+    соответствия. Команда, должность и грейд берутся из справочника
+    сотрудников, компетенция и домен - из справочника навыков: копии
+    этих атрибутов в оценках совпадают с ними (см. ratings.signals).
+    """
+
+    def __init__(self, employees, skills, teams, positions, competences,
+                 domains, grades, dates, employee, skill, date, value,
+                 suitability):
+        self.employees = employees
+        self.skills = skills
+        self.teams = teams
+        self.positions = positions
+        self.competences = competences
+        self.domains = domains
+        self.grades = np.asarray(grades, dtype=object)
+        self.dates = np.asarray(dates, dtype=object)
+        self.employee = employee
+        self.skill = skill
+        self.date = date
+        self.value = value
+        self.suitability = suitability
+
+    def __len__(self):
+        return len(self.employee)
+
+    @classmethod
+    def load(cls, using=DEFAULT_DB_ALIAS):
+        """
+        Читает оценки и справочники из БД.
+
+        Оценки читаются первыми: справочники, прочитанные позже,
+        содержат всех сотрудников и навыки из оценок, даже если импорт
+        добавил их во время загрузки.
+        """
+        columns = cls.load_ratings(using)
+        teams = Dimension(*load_columns(Team.objects.using(using), "name"))
+        positions = Dimension(
+            *load_columns(Position.objects.using(using), "name")
+        )
+        domains = Dimension(
+            *load_columns(Domain.objects.using(using), "name")
+        )
+        ids, names, domain_ids = load_columns(
+            Competence.objects.using(using), "name", "domain_id"
+        )
+        competences = Dimension(ids, names, domain=domains.codes(domain_ids))
+        ids, names, competence_ids = load_columns(
+            Skill.objects.using(using), "name", "competence_id"
+        )
+        skill_competences = competences.codes(competence_ids)
+        skills = Dimension(
+            ids,
+            names,
+            competence=skill_competences,
+            domain=competences.domain[skill_competences],
+        )
+        ids, names, team_ids, position_ids, employee_grades = load_columns(
+            Employee.objects.using(using),
+            "full_name",
+            "team_id",
+            "position_id",
+            "grade",
+        )
+        grades, grade_codes = np.unique(
+            np.asarray(employee_grades, dtype=str), return_inverse=True
+        )
+        employees = Dimension(
+            ids,
+            names,
+            team=teams.codes(team_ids),
+            position=positions.codes(position_ids),
+            grade=grade_codes,
+        )
+        return cls(
+            employees=employees,
+            skills=skills,
+            teams=teams,
+            positions=positions,
+            competences=competences,
+            domains=domains,
+            grades=grades.tolist(),
+            employee=employees.codes(columns["employee"]),
+            skill=skills.codes(columns["skill"]),
+            **{
+                name: column for name, column in columns.items()
+                if name not in ("employee", "skill")
+            },
+        )
+
+    def save(self, path):
+        """
+        Сохраняет набор в каталог path: каждая колонка и справочник -
+        в свой файл .npy, состав справочников - в MANIFEST_FILE.
+        """
+        for name in DIMENSIONS:
+            getattr(self, name).save(path, name)
+        np.save(
+            path / "grades.npy", np.asarray(self.grades.tolist(), dtype=str)
+        )
+        np.save(
+            path / "dates.npy",
+            np.asarray(self.dates.tolist(), dtype="datetime64[D]"),
+        )
+        for name in RATING_COLUMNS:
+            np.save(path / f"ratings.{name}.npy", getattr(self, name))
+        manifest = {
+            name: list(getattr(self, name).columns) for name in DIMENSIONS
+        }
+        (path / MANIFEST_FILE).write_text(json.dumps(manifest))
+
+    @classmethod
+    def open(cls, path):
+        """
+        Открывает набор, сохраненный save(). Колонки оценок
+        отображаются в память только для чтения и не копируются:
+        процессы, открывшие один каталог, делят одни страницы памяти.
+        Справочники невелики и читаются в память процесса.
+        """
+        manifest = json.loads((path / MANIFEST_FILE).read_text())
+        return cls(
+            **{
+                name: Dimension.open(path, name, columns)
+                for name, columns in manifest.items()
+            },
+            grades=np.load(path / "grades.npy").tolist(),
+            dates=np.load(path / "dates.npy").astype(object).tolist(),
+            **{
+                name: np.load(path / f"ratings.{name}.npy", mmap_mode="r")
+                for name in RATING_COLUMNS
+            },
+        )
+
+    @staticmethod
+    def load_ratings(using):
+        """Колонки оценок; даты заменяются кодами в таблице дат."""
+        ratings = Rating.objects.using(using).order_by().annotate(
+            suitability_code=Case(
+                *(
+                    When(suitability=suitability, then=code)
+                    for suitability, code in SUITABILITY_CODES.items()
+                ),
+                output_field=IntegerField(),
+            ),
+        ).values_list(
+            "employee_id",
+            "skill_id",
+            "rating_date",
+            "rating_value",
+            "suitability_code",
+        )
+        dtypes = {
+            "employee": np.int64,
+            "skill": np.int64,
+            "date": "datetime64[D]",
+            "value": np.int8,
+            "suitability": np.int8,
+        }
+        chunks = {name: [] for name in dtypes}
+        for rows in iter_chunks(
+            ratings.iterator(chunk_size=RATING_CHUNK_SIZE),
+            RATING_CHUNK_SIZE,
+        ):
+            for (name, dtype), column in zip(dtypes.items(), zip(*rows)):
+                chunks[name].append(np.array(column, dtype=dtype))
+        columns = {
+            name: (
+                np.concatenate(chunks[name]) if chunks[name]
+                else np.array([], dtype=dtype)
+            )
+            for name, dtype in dtypes.items()
+        }
+        dates, date_codes = np.unique(columns["date"], return_inverse=True)
+        columns["dates"] = dates.astype(object).tolist()
+        columns["date"] = date_codes.astype(np.int32)
+        return columns
@@ -0,0 +1,465 @@
+import math
+import threading
+import time
+from itertools import chain
+
+import numpy as np
+from django.conf import settings
+
+from analytics.dataset import SUITABILITY_CODES, RatingDataset
+from analytics.snapshot import (
+    get_snapshot_dir,
+    open_snapshot,
+    read_data_version,
+    read_version,
+    save_snapshot,
+    snapshot_lock,
+)
+from ratings.versions import get_data_version, is_data_version_tracked
+
+# Ключи групп из диапазона не больше этого размера или количества оценок
+# группируются np.bincount, из большего - сортировкой np.unique
+DENSE_GROUPS_LIMIT = 1 << 20
+# Количество попыток открыть текущий снимок, удаленный во время открытия
+SNAPSHOT_OPEN_ATTEMPTS = 3
+
+
+def factorize(values):
+    """Коды значений и список разных значений в порядке появления."""
+    uniques = {}
+    codes = [uniques.setdefault(value, len(uniques)) for value in values]
+    return np.asarray(codes, dtype=np.int32), list(uniques)
+
+
+def group_codes(keys, size):
+    """
+    Разные значения keys из диапазона [0, size) по возрастанию и номера
+    этих значений для каждого элемента keys, как np.unique с
+    return_inverse. Небольшой диапазон считается np.bincount без
+    сортировки keys.
+    """
+    if size > max(len(keys), DENSE_GROUPS_LIMIT):
+        uniques, inverse = np.unique(keys, return_inverse=True)
+        return uniques, inverse.ravel()
+    present = np.bincount(keys, minlength=size) > 0
+    inverse = np.cumsum(present, dtype=np.int64) - 1
+    return np.flatnonzero(present), inverse[keys]
+
+
+def round_half_up(total, count, precision):
+    """
+    total / count, округленное до precision знаков с половиной вверх,
+    как round(numeric) в PostgreSQL. Считается в целых числах, поэтому
+    не зависит от двоичного представления дробей.
+    """
+    scale = 10 ** precision
+    return (2 * total * scale + count) // (2 * count) / scale
+
+
+class EmployeeCount:
+    """Количество разных сотрудников в группе."""
+
+    def compute(self, dataset, rows, groups, size, results):
+        employee_count = len(dataset.employees)
+        pairs = (
+            groups.astype(np.int64) * employee_count + dataset.employee[rows]
+        )
+        if size * employee_count <= max(len(pairs), DENSE_GROUPS_LIMIT):
+            present = np.bincount(pairs, minlength=size * employee_count) > 0
+            return present.reshape(size, employee_count).sum(axis=1).tolist()
+        pairs = np.unique(pairs)
+        return np.bincount(pairs // employee_count, minlength=size).tolist()
+
+
+class TotalEmployeeCount:
+    """
+    Количество разных сотрудников во всех группах, одно для каждой
+    группы. Сотрудник из нескольких групп учитывается один раз.
+    """
+
+    def compute(self, dataset, rows, groups, size, results):
+        present = np.bincount(
+            dataset.employee[rows], minlength=len(dataset.employees)
+        ) > 0
+        return [int(present.sum())] * size
+
+
+class SuitabilityCount:
+    """Количество оценок с одним из соответствий suitabilities."""
+
+    def __init__(self, *suitabilities):
+        self.codes = [SUITABILITY_CODES[value] for value in suitabilities]
+
+    def compute(self, dataset, rows, groups, size, results):
+        matched = np.isin(dataset.suitability[rows], self.codes)
+        return np.bincount(
+            groups, weights=matched, minlength=size
+        ).astype(np.int64).tolist()
+
+
+class Average:
+    """
+    Средняя оценка в группе, None для группы без оценок. domain -
+    имя домена, оценки навыков других доменов не учитываются;
+    precision - количество знаков после запятой при округлении.
+    """
+
+    def __init__(self, domain=None, precision=None):
+        self.domain = domain
+        self.precision = precision
+
+    def compute(self, dataset, rows, groups, size, results):
+        if self.domain is not None:
+            domains = np.flatnonzero(dataset.domains.names == self.domain)
+            selected = np.isin(dataset.skills.domain, domains)[
+                dataset.skill[rows]
+            ]
+            rows = rows[selected]
+            groups = groups[selected]
+        counts = np.bincount(groups, minlength=size)
+        totals = np.bincount(
+            groups, weights=dataset.value[rows], minlength=size
+        )
+        averages = []
+        for total, count in zip(
+            totals.astype(np.int64).tolist(), counts.tolist()
+        ):
+            if not count:
+                averages.append(None)
+            elif self.precision is None:
+                averages.append(total / count)
+            else:
+                averages.append(round_half_up(total, count, self.precision))
+        return averages
+
+
+class Percentage:
+    """
+    Процент агрегата part от агрегата total, None при total = 0.
+    Без precision - целый, с половиной вверх, как приведение numeric
+    к integer в PostgreSQL; с precision - округленный до precision
+    знаков, как round(numeric).
+    """
+
+    def __init__(self, part, total, precision=None):
+        self.part = part
+        self.total = total
+        self.precision = precision
+
+    def compute(self, dataset, rows, groups, size, results):
+        if self.precision is None:
+            return [
+                (200 * part + total) // (2 * total) if total else None
+                for part, total in zip(
+                    results[self.part], results[self.total]
+                )
+            ]
+        return [
+            round_half_up(100 * part, total, self.precision)
+            if total else None
+            for part, total in zip(results[self.part], results[self.total])
+        ]
+
+
+class AnalyticsEngine:
+    """
+    Расчет чартов по оценкам в памяти, без запросов к БД.
+
+    Параметры RatingFilter превращаются в булевы маски над колонками
+    оценок, поля группировки - в коды групп, агрегаты считаются
+    np.bincount по кодам групп. Поля группировки называются так же,
+    как в values() запросов чартов, поэтому строки результата
+    подходят тем же сериализаторам. data_version - версия данных
+    (ratings.versions), по которой загружены оценки.
+    """
+
+    def __init__(self, dataset, data_version=None):
+        self.dataset = dataset
+        self.data_version = data_version
+        employees = dataset.employees
+        name_codes, names = factorize(employees.names.tolist())
+        # Поле группировки: коды значений для оценок rows и сами значения
+        self.fields = {
+            "employee__id": (
+                lambda rows: dataset.employee[rows],
+                employees.ids.tolist(),
+            ),
+            "employee__full_name": (
+                lambda rows: name_codes[dataset.employee[rows]],
+                names,
+            ),
+            "skill__id": (
+                lambda rows: dataset.skill[rows],
+                dataset.skills.ids.tolist(),
+            ),
+            "skill__name": (
+                lambda rows: dataset.skill[rows],
+                dataset.skills.names.tolist(),
+            ),
+            "team__id": (
+                lambda rows: employees.team[dataset.employee[rows]],
+                dataset.teams.ids.tolist(),
+            ),
+            "team__name": (
+                lambda rows: employees.team[dataset.employee[rows]],
+                dataset.teams.names.tolist(),
+            ),
+            "competence__id": (
+                lambda rows: dataset.skills.competence[dataset.skill[rows]],
+                dataset.competences.ids.tolist(),
+            ),
+            "competence__name": (
+                lambda rows: dataset.skills.competence[dataset.skill[rows]],
+                dataset.competences.names.tolist(),
+            ),
+            "domain__id": (
+                lambda rows: dataset.skills.domain[dataset.skill[rows]],
+                dataset.domains.ids.tolist(),
+            ),
+            "domain__name": (
+                lambda rows: dataset.skills.domain[dataset.skill[rows]],
+                dataset.domains.names.tolist(),
+            ),
+            "position__id": (
+                lambda rows: employees.position[dataset.employee[rows]],
+                dataset.positions.ids.tolist(),
+            ),
+            "position__name": (
+                lambda rows: employees.position[dataset.employee[rows]],
+                dataset.positions.names.tolist(),
+            ),
+            "grade": (
+                lambda rows: employees.grade[dataset.employee[rows]],
+                dataset.grades.tolist(),
+            ),
+            "rating_date": (
+                lambda rows: dataset.date[rows],
+                dataset.dates.tolist(),
+            ),
+        }
+
+    def get_masks(self, lookups):
+        """
+        Маски сотрудников, навыков, дат и оценок по парам
+        (параметр RatingFilter, значение).
+        """
+        dataset = self.dataset
+        employees = np.ones(len(dataset.employees), dtype=bool)
+        skills = np.ones(len(dataset.skills), dtype=bool)
+        dates = np.ones(len(dataset.dates), dtype=bool)
+        ratings = np.ones(len(dataset), dtype=bool)
+        for name, value in lookups:
+            if name == "employee":
+                employees &= dataset.employees.ids == value
+            elif name == "team":
+                employees &= (
+                    dataset.employees.team == dataset.teams.code(value)
+                )
+            elif name == "position":
+                employees &= (
+                    dataset.employees.position
+                    == dataset.positions.code(value)
+                )
+            elif name == "grade":
+                employees &= dataset.grades[dataset.employees.grade] == value
+            elif name == "skill":
+                skills &= dataset.skills.ids == value
+            elif name == "competence":
+                skills &= (
+                    dataset.skills.competence
+                    == dataset.competences.code(value)
+                )
+            elif name == "domain":
+                skills &= dataset.skills.domain == dataset.domains.code(value)
+            elif name == "start_date":
+                dates &= dataset.dates >= value
+            elif name == "end_date":
+                dates &= dataset.dates <= value
+            elif name == "suitability":
+                ratings &= dataset.suitability == SUITABILITY_CODES[value]
+            else:
+                raise ValueError(f"Неизвестный фильтр {name}")
+        return employees, skills, dates, ratings
+
+    def select(self, filters, **lookups):
+        """
+        Номера оценок, подходящих под параметры RatingFilter filters
+        и дополнительные условия lookups с теми же именами.
+        """
+        dataset = self.dataset
+        employees, skills, dates, ratings = self.get_masks(
+            chain(filters.items(), lookups.items())
+        )
+        if not employees.all():
+            ratings &= employees[dataset.employee]
+        if not skills.all():
+            ratings &= skills[dataset.skill]
+        if not dates.all():
+            ratings &= dates[dataset.date]
+        return np.flatnonzero(ratings)
+
+    def aggregate(self, rows, group_by, order_by=None, **aggregates):
+        """
+        Группирует оценки rows по полям group_by и считает агрегаты.
+
+        Возвращает список словарей, отсортированный по order_by
+        (None - в конце, как NULL при сортировке по возрастанию
+        в PostgreSQL), при равенстве - по полям группировки.
+        """
+        if not len(rows):
+            return []
+        codes, labels = zip(*(
+            (get_codes(rows), values)
+            for get_codes, values in (
+                self.fields[field] for field in group_by
+            )
+        ))
+        sizes = [len(values) for values in labels]
+        # Ключ группы - номер сочетания кодов полей, как в
+        # np.ravel_multi_index, но без проверки границ кодов
+        index = codes[0].astype(np.int64)
+        for field_codes, size in zip(codes[1:], sizes[1:]):
+            index *= size
+            index += field_codes
+        keys, groups = group_codes(index, math.prod(sizes))
+        results = {
+            field: [values[code] for code in field_codes.tolist()]
+            for field, values, field_codes in zip(
+                group_by, labels, np.unravel_index(keys, sizes)
+            )
+        }
+        for name, aggregate in aggregates.items():
+            results[name] = aggregate.compute(
+                self.dataset, rows, groups, len(keys), results
+            )
+        items = [
+            dict(zip(results, values)) for values in zip(*results.values())
+        ]
+        if order_by is not None:
+            items.sort(
+                key=lambda item: (item[order_by] is None, item[order_by] or 0)
+            )
+        return items
+
+
+_engine = None
+_engine_loaded = 0
+_snapshot_engine = None
+_snapshot_version = None
+_engine_lock = threading.Lock()
+
+
+def get_snapshot_engine(directory):
+    """
+    Движок по текущему снимку каталога directory или None, если
+    снимка еще нет. Снимок открывается заново, только если сменилась
+    его версия.
+    """
+    global _snapshot_engine, _snapshot_version
+    for _ in range(SNAPSHOT_OPEN_ATTEMPTS):
+        version = read_version(directory)
+        if version is None:
+            return None
+        if version == _snapshot_version:
+            return _snapshot_engine
+        try:
+            dataset = open_snapshot(directory, version)
+        except FileNotFoundError:
+            # Снимок удален после записи более новых, версия читается
+            # заново
+            continue
+        _snapshot_engine = AnalyticsEngine(
+            dataset, read_data_version(directory, version)
+        )
+        _snapshot_version = version
+        return _snapshot_engine
+    return None
+
+
+def is_current(engine, data_version):
+    """
+    Посчитаны ли оценки движка по версии данных data_version. Без
+    версии данных (она не меняется) загруженные из БД оценки
+    считаются актуальными ANALYTICS_ENGINE_TTL секунд, снимок - до
+    записи следующего.
+    """
+    if data_version is not None:
+        return engine.data_version == data_version
+    return engine is _snapshot_engine or (
+        time.monotonic() - _engine_loaded <= settings.ANALYTICS_ENGINE_TTL
+    )
+
+
+def get_current_snapshot_engine(directory, data_version):
+    """Движок по текущему снимку, если он записан по data_version."""
+    engine = get_snapshot_engine(directory)
+    if engine is not None and is_current(engine, data_version):
+        return engine
+    return None
+
+
+def load_engine(data_version):
+    """Загружает оценки из БД в память процесса."""
+    global _engine, _engine_loaded
+    _engine = AnalyticsEngine(RatingDataset.load(), data_version)
+    _engine_loaded = time.monotonic()
+    return _engine
+
+
+def rebuild_snapshot_engine(directory):
+    """
+    Записывает снимок по текущей версии данных и открывает его.
+
+    Снимок записывает один процесс хоста (см. snapshot_lock), остальные
+    после ожидания открывают уже записанный снимок. Записавший процесс
+    тоже отображает снимок в память, а не держит свою копию оценок.
+    """
+    global _engine
+    with snapshot_lock(directory):
+        # Пока процесс ждал блокировку, версия данных могла смениться,
+        # а снимок - записаться другим процессом
+        data_version = get_data_version()
+        engine = get_current_snapshot_engine(directory, data_version)
+        if engine is None:
+            save_snapshot(directory, data_version)
+            engine = get_current_snapshot_engine(directory, data_version)
+    if engine is None:
+        # Текущим остался более новый снимок по другой версии данных
+        return load_engine(data_version)
+    _engine = None
+    return engine
+
+
+def get_engine():
+    """
+    Движок процесса по текущей версии данных (ratings.versions).
+
+    Если задан каталог снимков ANALYTICS_SNAPSHOT_DIR, оценки
+    отображаются в память из текущего снимка (см. analytics.snapshot),
+    а снимок по прежней версии данных записывается заново одним
+    процессом хоста. Иначе оценки загружаются из БД в память процесса
+    и используются до смены версии данных.
+    """
+    with _engine_lock:
+        data_version = (
+            get_data_version() if is_data_version_tracked() else None
+        )
+        directory = get_snapshot_dir()
+        if directory is not None:
+            engine = get_current_snapshot_engine(directory, data_version)
+            if engine is not None:
+                return engine
+        if _engine is not None and is_current(_engine, data_version):
+            return _engine
+        if directory is not None and data_version is not None:
+            return rebuild_snapshot_engine(directory)
+        return load_engine(data_version)
+
+
+def reset_engine():
+    """Сбрасывает движок, следующий запрос загрузит оценки заново."""
+    global _engine, _snapshot_engine, _snapshot_version
+    with _engine_lock:
+        _engine = None
+        _snapshot_engine = None
+        _snapshot_version = None
@@ -0,0 +1,147 @@
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from analytics.dataset import RatingDataset
+from ratings.versions import get_data_version
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: снимки записываются без блокировки между процессами
+    fcntl = None
+
+# Файл с именем каталога текущего снимка
+CURRENT_FILE = "CURRENT"
+# Файл каталога снимка с версией данных (ratings.versions), по которой
+# он записан
+DATA_VERSION_FILE = "DATA_VERSION"
+# Суффикс каталога снимка, который еще записывается
+TEMP_SUFFIX = ".tmp"
+# Файл блокировки, которую держит процесс, записывающий снимок
+LOCK_FILE = "LOCK"
+
+
+def get_snapshot_dir():
+    """Каталог снимков или None, если снимки не используются."""
+    directory = settings.ANALYTICS_SNAPSHOT_DIR
+    return Path(directory) if directory else None
+
+
+@contextmanager
+def snapshot_lock(directory):
+    """
+    Блокировка записи снимка между процессами хоста. Пока один процесс
+    читает оценки из БД и записывает снимок, остальные ждут и затем
+    открывают записанный снимок, а не читают оценки сами. Блокировка
+    снимается и при остановке процесса.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(directory / LOCK_FILE, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_version(directory):
+    """Версия текущего снимка или None, если снимка еще нет."""
+    try:
+        return (directory / CURRENT_FILE).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def open_snapshot(directory, version):
+    """Набор оценок снимка version, колонки отображаются в память."""
+    return RatingDataset.open(directory / version)
+
+
+def read_data_version(directory, version):
+    """Версия данных снимка version или None, если она не записана."""
+    try:
+        return (directory / version / DATA_VERSION_FILE).read_text() or None
+    except FileNotFoundError:
+        return None
+
+
+def write_snapshot(dataset, directory, version, data_version=None):
+    """
+    Записывает снимок по версии данных data_version и делает его
+    текущим.
+
+    Файлы пишутся во временный каталог, который затем переименовывается
+    в каталог версии, а версия записывается в CURRENT_FILE заменой
+    файла (os.replace), поэтому процессы видят либо старый, либо новый
+    снимок целиком. Снимок не становится текущим, если текущий снимок
+    новее: его успел записать импорт, закончившийся позже.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{version}{TEMP_SUFFIX}"
+    path.mkdir()
+    dataset.save(path)
+    if data_version is not None:
+        (path / DATA_VERSION_FILE).write_text(data_version)
+    path = path.rename(directory / version)
+    previous = read_version(directory)
+    if previous is not None and previous > version:
+        shutil.rmtree(path, ignore_errors=True)
+        return False
+    temp_file = directory / f"{CURRENT_FILE}.{version}{TEMP_SUFFIX}"
+    temp_file.write_text(version)
+    os.replace(temp_file, directory / CURRENT_FILE)
+    remove_old_snapshots(directory, keep=(version, previous))
+    return True
+
+
+def remove_old_snapshots(directory, keep):
+    """
+    Удаляет каталоги снимков, кроме версий keep. Предыдущий снимок
+    остается: процесс мог прочитать его версию и еще не открыть файлы.
+    Уже открытые файлы удаленных снимков остаются доступны процессам
+    до закрытия.
+    """
+    for path in directory.iterdir():
+        if (
+            path.is_dir()
+            and not path.name.endswith(TEMP_SUFFIX)
+            and path.name not in keep
+        ):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def save_snapshot(directory, data_version, using=DEFAULT_DB_ALIAS):
+    """
+    Читает оценки из БД и записывает текущий снимок по версии данных
+    data_version. Версия снимка - время начала чтения, поэтому снимок
+    по более поздним данным новее. Вызывается под snapshot_lock().
+    """
+    version = f"{time.time_ns():020d}"
+    write_snapshot(
+        RatingDataset.load(using), directory, version, data_version
+    )
+    return version
+
+
+def build_snapshot(using=DEFAULT_DB_ALIAS, data_version=None):
+    """
+    Записывает текущий снимок по версии данных data_version, по
+    умолчанию - текущей. Она читается до оценок: если оценки изменятся
+    во время чтения, снимок будет считаться устаревшим (см. get_engine).
+    """
+    directory = get_snapshot_dir()
+    if directory is None:
+        return None
+    with snapshot_lock(directory):
+        return save_snapshot(
+            directory, data_version or get_data_version(), using
+        )
@@ -1,11 +1,11 @@
-from django.db.models import Avg, Count, F, IntegerField, Q
+from django.db.models import F, IntegerField
 from django.db.models.functions import Cast, Round
 from django.shortcuts import get_object_or_404
-from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema_view
 from rest_framework import mixins, viewsets
 from rest_framework.permissions import AllowAny
 
+from analytics.engine import Average, Percentage, SuitabilityCount
 from api.v1.chart_1.a_suit_position_serializers import (
     EmployeeSkillAverageRatingSerializer,
     SuitabilityPositionSerializer
@@ -14,9 +14,16 @@ from api.v1.chart_1.schemas import (
     CHART_1_A1_SCHEMA,
     CHART_1_A2_SCHEMA
 )
-from api.v1.filters import RatingFilter
+from api.v1.filters import RatingFilter, RollupFilterBackend
+from api.v1.mixins import (
+    AnalyticsEngineMixin,
+    ChartCacheMixin,
+    ConditionalGetMixin,
+    RollupMixin
+)
 from employees.models import Employee
 from ratings.models import Rating
+from rollups.models import EmployeeSkillRollup
 
 
 # --------------------------------------------
@@ -26,6 +33,10 @@ from ratings.models import Rating
 
 @extend_schema_view(**CHART_1_A1_SCHEMA)
 class SuitabilityPositionViewSet(
+    RollupMixin,
+    ConditionalGetMixin,
+    ChartCacheMixin,
+    AnalyticsEngineMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet,
 ):
@@ -36,27 +47,21 @@ class SuitabilityPositionViewSet(
 
     serializer_class = SuitabilityPositionSerializer
     permission_classes = (AllowAny,)
-    filter_backends = (DjangoFilterBackend, )
+    filter_backends = (RollupFilterBackend, )
     filterset_class = RatingFilter
+    rollup_models = (EmployeeSkillRollup,)
 
     def get_queryset(self):
-        return Rating.objects.select_related(
+        queryset = self.get_source_queryset()
+        return queryset.select_related(
             "employee",
-            "employee__team",
+            "team",
         ).values(
             "employee__id",
             "employee__full_name",
         ).annotate(
-            total=Count(
-                "skill",
-                # distinct=True,
-                filter=~Q(suitability="не требуется"),
-            ),
-            total_yes=Count(
-                "skill",
-                # distinct=True,
-                filter=Q(suitability="да")
-            ),
+            total=self.count_required(queryset),
+            total_yes=self.count_yes(queryset),
             percentage=Cast(
                 F("total_yes") * 100.0 / F("total"),
                 output_field=IntegerField(),
@@ -65,6 +70,16 @@ class SuitabilityPositionViewSet(
             "percentage",
         )
 
+    def get_engine_rows(self, engine, filters):
+        return engine.aggregate(
+            engine.select(filters),
+            ("employee__id", "employee__full_name"),
+            order_by="percentage",
+            total=SuitabilityCount(Rating.YES, Rating.NO),
+            total_yes=SuitabilityCount(Rating.YES),
+            percentage=Percentage("total_yes", "total"),
+        )
+
 
 # --------------------------------------------
 #    Чарт 1 Вкладка A2 после "проваливания"
@@ -74,6 +89,10 @@ class SuitabilityPositionViewSet(
 
 @extend_schema_view(**CHART_1_A2_SCHEMA)
 class EmployeeSkillsAverageRatingViewSet(
+    RollupMixin,
+    ConditionalGetMixin,
+    ChartCacheMixin,
+    AnalyticsEngineMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet,
 ):
@@ -84,7 +103,8 @@ class EmployeeSkillsAverageRatingViewSet(
     """
 
     serializer_class = EmployeeSkillAverageRatingSerializer
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (RollupFilterBackend,)
+    rollup_models = (EmployeeSkillRollup,)
 
     def get_queryset(self):
         employee = get_object_or_404(
@@ -94,12 +114,25 @@ class EmployeeSkillsAverageRatingViewSet(
 
         # Группируем данные по навыкам и
         # считаем среднюю оценку для каждого навыка
-        return Rating.objects.filter(
+        queryset = self.get_source_queryset()
+        return queryset.filter(
             employee=employee
         ).values(
             "skill__name"
         ).annotate(
-            average_rating=Round(Avg("rating_value"), precision=1)
+            average_rating=Round(self.average(queryset), precision=1)
         ).order_by(
             "average_rating"
         )
+
+    def get_engine_rows(self, engine, filters):
+        employee_id = self.get_engine_object_or_404(
+            engine.dataset.employees,
+            self.kwargs.get("employee_id"),
+        )
+        return engine.aggregate(
+            engine.select(filters, employee=employee_id),
+            ("skill__name",),
+            order_by="average_rating",
+            average_rating=Average(precision=1),
+        )
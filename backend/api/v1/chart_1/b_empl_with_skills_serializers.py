@@ -17,7 +17,7 @@ class EmployeesCountWithSkillsSerializer(
     """
 
     domain = serializers.CharField(
-        source="skill__competence__domain__name",
+        source="domain__name",
     )
     skill_id = serializers.CharField(
         source="skill__id",
@@ -57,7 +57,7 @@ class EmployeesWithSkillSerializer(
     """
 
     domain = serializers.CharField(
-        source="skill__competence__domain__name",
+        source="domain__name",
     )
     employee = serializers.CharField(
         source="employee__full_name",
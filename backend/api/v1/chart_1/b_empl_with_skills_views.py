@@ -1,11 +1,17 @@
 from django.db.models import Count
 from django.shortcuts import get_object_or_404
-from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema_view
 from rest_framework import mixins, viewsets
 from rest_framework.permissions import AllowAny
 
-from api.v1.filters import RatingFilter
+from analytics.engine import EmployeeCount
+from api.v1.filters import RatingFilter, RollupFilterBackend
+from api.v1.mixins import (
+    AnalyticsEngineMixin,
+    ChartCacheMixin,
+    ConditionalGetMixin,
+    RollupMixin
+)
 from api.v1.chart_1.b_empl_with_skills_serializers import (
     EmployeesCountWithSkillsSerializer,
     EmployeesWithSkillSerializer,
@@ -15,6 +21,7 @@ from api.v1.chart_1.schemas import (
     CHART_1_B2_SCHEMA
 )
 from ratings.models import Rating, Skill
+from rollups.models import EmployeeSkillRollup
 
 
 # --------------------------------------------
@@ -24,6 +31,10 @@ from ratings.models import Rating, Skill
 
 @extend_schema_view(**CHART_1_B1_SCHEMA)
 class EmployeesCountWithSkillsViewSet(
+    RollupMixin,
+    ConditionalGetMixin,
+    ChartCacheMixin,
+    AnalyticsEngineMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
 ):
@@ -35,18 +46,19 @@ class EmployeesCountWithSkillsViewSet(
 
     serializer_class = EmployeesCountWithSkillsSerializer
     permission_classes = (AllowAny,)
-    filter_backends = (DjangoFilterBackend, )
+    filter_backends = (RollupFilterBackend, )
     filterset_class = RatingFilter
+    rollup_models = (EmployeeSkillRollup,)
 
     def get_queryset(self):
-        return Rating.objects.select_related(
+        return self.filter_yes(
+            self.get_source_queryset()
+        ).select_related(
             "skill"
-        ).filter(
-            suitability="да"
         ).values(
             "skill__id",
             "skill__name",
-            "skill__competence__domain__name",
+            "domain__name",
         ).annotate(
             skill_employee_count=Count(
                 "employee",
@@ -56,6 +68,14 @@ class EmployeesCountWithSkillsViewSet(
             "skill_employee_count",
         )
 
+    def get_engine_rows(self, engine, filters):
+        return engine.aggregate(
+            engine.select(filters, suitability=Rating.YES),
+            ("skill__id", "skill__name", "domain__name"),
+            order_by="skill_employee_count",
+            skill_employee_count=EmployeeCount(),
+        )
+
 
 # --------------------------------------------
 #    Чарт 1 Вкладка B2 после "проваливания"
@@ -65,6 +85,10 @@ class EmployeesCountWithSkillsViewSet(
 
 @extend_schema_view(**CHART_1_B2_SCHEMA)
 class EmployeesWithSkillViewSet(
+    RollupMixin,
+    ConditionalGetMixin,
+    ChartCacheMixin,
+    AnalyticsEngineMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
 ):
@@ -76,24 +100,26 @@ class EmployeesWithSkillViewSet(
 
     serializer_class = EmployeesWithSkillSerializer
     permission_classes = (AllowAny,)
-    filter_backends = (DjangoFilterBackend, )
+    filter_backends = (RollupFilterBackend, )
     filterset_class = RatingFilter
+    rollup_models = (EmployeeSkillRollup,)
 
     def get_queryset(self):
         skill = get_object_or_404(
             Skill,
             id=self.kwargs.get("skill_id"),
         )
-        return Rating.objects.select_related(
+        return self.filter_yes(
+            self.get_source_queryset()
+        ).select_related(
             "employee",
             "skill",
-            "skill__competence",
-            "skill__competence__domain",
+            "competence",
+            "domain",
         ).filter(
-            suitability="да",
             skill=skill,
         ).values(
-            "skill__competence__domain__name",
+            "domain__name",
             "employee__full_name",
         ).annotate(
             skill_employee_count=Count(
@@ -101,3 +127,14 @@ class EmployeesWithSkillViewSet(
                 distinct=True,
             ),
         )
+
+    def get_engine_rows(self, engine, filters):
+        skill_id = self.get_engine_object_or_404(
+            engine.dataset.skills,
+            self.kwargs.get("skill_id"),
+        )
+        return engine.aggregate(
+            engine.select(filters, skill=skill_id, suitability=Rating.YES),
+            ("domain__name", "employee__full_name"),
+            skill_employee_count=EmployeeCount(),
+        )
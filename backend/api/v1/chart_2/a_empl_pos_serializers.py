@@ -14,11 +14,11 @@ class EmployeePositionsSerializer(
     """Сериализатор для чарта "Должности сотрудников"."""
 
     position = serializers.CharField(
-        source="employee__position__name",
+        source="position__name",
     )
     position_employee_count = serializers.IntegerField()
     total_employee_count = serializers.IntegerField()
-    percentage = serializers.SerializerMethodField()
+    percentage = serializers.FloatField()
 
     class Meta:
         model = Rating
@@ -32,17 +32,6 @@ class EmployeePositionsSerializer(
             "__all__",
         )
 
-    def get_percentage(self, obj):
-        """
-        Процент сотрудников, работающих на должности.
-        """
-        return round(
-            (obj["position_employee_count"]
-             / obj["total_employee_count"])
-            * 100,
-            1,
-        )
-
 
 
 class EmployeeGradesWithPositionsSerializer(serializers.ModelSerializer):
@@ -51,11 +40,11 @@ class EmployeeGradesWithPositionsSerializer(serializers.ModelSerializer):
     """
 
     position = serializers.CharField(
-        source="employee__position__name", read_only=True
+        source="position__name", read_only=True
     )
     position_employee_count = serializers.IntegerField(read_only=True)
     total_employee_count = serializers.IntegerField(read_only=True)
-    percentage = serializers.SerializerMethodField()
+    percentage = serializers.FloatField()
 
     class Meta:
         model = Rating
@@ -65,9 +54,3 @@ class EmployeeGradesWithPositionsSerializer(serializers.ModelSerializer):
             "total_employee_count",
             "percentage",
         )
-
-    def get_percentage(self, obj):
-        return round(
-            obj["position_employee_count"] * 100 / obj["total_employee_count"],
-            1,
-        )
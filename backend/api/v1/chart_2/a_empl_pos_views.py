@@ -1,15 +1,24 @@
-from django.db.models import Count, IntegerField, Value
-from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema_view
 from rest_framework import mixins, viewsets
 from rest_framework.permissions import AllowAny
 
-from api.v1.filters import RatingFilter
+from analytics.engine import (
+    EmployeeCount,
+    Percentage,
+    TotalEmployeeCount
+)
+from api.v1.filters import RatingFilter, RollupFilterBackend
+from api.v1.mixins import (
+    AnalyticsEngineMixin,
+    ChartCacheMixin,
+    ConditionalGetMixin,
+    RollupMixin
+)
 from api.v1.chart_2.a_empl_pos_serializers import (
     EmployeePositionsSerializer
 )
 from api.v1.chart_2.schemas import CHART_2_A_SCHEMA
-from ratings.models import Rating
+from rollups.models import EmployeeSkillRollup
 
 # --------------------------------------------
 #    Чарт 2 Вкладка A
@@ -18,6 +27,10 @@ from ratings.models import Rating
 
 @extend_schema_view(**CHART_2_A_SCHEMA)
 class EmployeePositionsViewSet(
+    RollupMixin,
+    ConditionalGetMixin,
+    ChartCacheMixin,
+    AnalyticsEngineMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
 ):
@@ -28,32 +41,27 @@ class EmployeePositionsViewSet(
 
     serializer_class = EmployeePositionsSerializer
     permission_classes = (AllowAny,)
-    filter_backends = (DjangoFilterBackend, )
+    filter_backends = (RollupFilterBackend, )
     filterset_class = RatingFilter
+    rollup_models = (EmployeeSkillRollup,)
 
     def get_queryset(self):
-        queryset = Rating.objects.select_related(
-            "employee",
-            "employee__position",
-        ).values(
-            "employee__position__name",
-        ).annotate(
-            position_employee_count=Count(
-                "employee",
-                distinct=True,
-            )
-        ).order_by(
+        return self.count_employees(
+            self.get_source_queryset(),
+            "position__name",
             "position_employee_count",
         )
 
-        filtered_queryset = self.filter_queryset(queryset)
-        total_employee_count = sum(
-            item["position_employee_count"] for item in filtered_queryset
+    def get_engine_rows(self, engine, filters):
+        return engine.aggregate(
+            engine.select(filters),
+            ("position__name",),
+            order_by="position_employee_count",
+            position_employee_count=EmployeeCount(),
+            total_employee_count=TotalEmployeeCount(),
+            percentage=Percentage(
+                "position_employee_count",
+                "total_employee_count",
+                precision=1,
+            ),
         )
-
-        return filtered_queryset.annotate(
-            total_employee_count=Value(
-                total_employee_count,
-                output_field=IntegerField(),
-            )
-        )
\ No newline at end of file
@@ -16,12 +16,10 @@ class EmployeeGradesSerializer(
     "Количество сотрудников по грейдам".
     """
 
-    grade = serializers.CharField(
-        source="employee__grade",
-    )
+    grade = serializers.CharField()
     grade_employee_count = serializers.IntegerField()
     total_employee_count = serializers.IntegerField()
-    percentage = serializers.SerializerMethodField()
+    percentage = serializers.FloatField()
 
     class Meta:
         model = Rating
@@ -35,17 +33,6 @@ class EmployeeGradesSerializer(
             "__all__",
         )
 
-    def get_percentage(self, obj):
-        """
-        Процент сотрудников с грейдом.
-        """
-        return round(
-            (obj["grade_employee_count"]
-             / obj["total_employee_count"])
-            * 100,
-            1,
-        )
-
 
 # --------------------------------------------
 #    Чарт 2 Вкладка B2 после "проваливания"
@@ -62,12 +49,12 @@ class EmployeeGradesWithPositionsSerializer(
     """
 
     position = serializers.CharField(
-        source="employee__position__name",
+        source="position__name",
         read_only=True
     )
     position_employee_count = serializers.IntegerField(read_only=True)
     total_employee_count = serializers.IntegerField(read_only=True)
-    percentage = serializers.SerializerMethodField()
+    percentage = serializers.FloatField()
 
     class Meta:
         model = Rating
@@ -80,14 +67,3 @@ class EmployeeGradesWithPositionsSerializer(
         read_only_fields = (
             "__all__",
         )
-
-    def get_percentage(self, obj):
-        """
-        Процент сотрудников с выбранным грейдом в выборке.
-        """
-        return round(
-            (obj["position_employee_count"]
-             / obj["total_employee_count"])
-            * 100,
-            1,
-        )
@@ -1,10 +1,19 @@
-from django.db.models import Count, IntegerField, Value
-from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema_view
 from rest_framework import mixins, viewsets
 from rest_framework.permissions import AllowAny
 
-from api.v1.filters import RatingFilter
+from analytics.engine import (
+    EmployeeCount,
+    Percentage,
+    TotalEmployeeCount
+)
+from api.v1.filters import RatingFilter, RollupFilterBackend
+from api.v1.mixins import (
+    AnalyticsEngineMixin,
+    ChartCacheMixin,
+    ConditionalGetMixin,
+    RollupMixin
+)
 from api.v1.chart_2.b_empl_grades_serializers import (
     EmployeeGradesWithPositionsSerializer,
     EmployeeGradesSerializer
@@ -13,7 +22,7 @@ from api.v1.chart_2.schemas import (
     CHART_2_B1_SCHEMA,
     CHART_2_B2_SCHEMA
 )
-from ratings.models import Rating
+from rollups.models import EmployeeSkillRollup
 
 
 # --------------------------------------------
@@ -23,6 +32,10 @@ from ratings.models import Rating
 
 @extend_schema_view(**CHART_2_B1_SCHEMA)
 class EmployeeGradesViewSet(
+    RollupMixin,
+    ConditionalGetMixin,
+    ChartCacheMixin,
+    AnalyticsEngineMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
 ):
@@ -33,33 +46,29 @@ class EmployeeGradesViewSet(
 
     serializer_class = EmployeeGradesSerializer
     permission_classes = (AllowAny,)
-    filter_backends = (DjangoFilterBackend, )
+    filter_backends = (RollupFilterBackend, )
     filterset_class = RatingFilter
+    rollup_models = (EmployeeSkillRollup,)
 
     def get_queryset(self):
-        queryset = Rating.objects.select_related(
-            "employee",
-        ).values(
-            "employee__grade",
-        ).annotate(
-            grade_employee_count=Count(
-                "employee",
-                distinct=True,
-            )
-        ).order_by(
+        return self.count_employees(
+            self.get_source_queryset(),
+            "grade",
             "grade_employee_count",
         )
 
-        filtered_queryset = self.filter_queryset(queryset)
-        total_employee_count = sum(
-            item["grade_employee_count"] for item in filtered_queryset
-        )
-
-        return filtered_queryset.annotate(
-            total_employee_count=Value(
-                total_employee_count,
-                output_field=IntegerField(),
-            )
+    def get_engine_rows(self, engine, filters):
+        return engine.aggregate(
+            engine.select(filters),
+            ("grade",),
+            order_by="grade_employee_count",
+            grade_employee_count=EmployeeCount(),
+            total_employee_count=TotalEmployeeCount(),
+            percentage=Percentage(
+                "grade_employee_count",
+                "total_employee_count",
+                precision=1,
+            ),
         )
 
 
@@ -71,6 +80,10 @@ class EmployeeGradesViewSet(
 
 @extend_schema_view(**CHART_2_B2_SCHEMA)
 class EmployeeGradesWithPositionsViewSet(
+    RollupMixin,
+    ConditionalGetMixin,
+    ChartCacheMixin,
+    AnalyticsEngineMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
 ):
@@ -81,35 +94,30 @@ class EmployeeGradesWithPositionsViewSet(
 
     serializer_class = EmployeeGradesWithPositionsSerializer
     permission_classes = (AllowAny,)
-    filter_backends = (DjangoFilterBackend, )
+    filter_backends = (RollupFilterBackend, )
     filterset_class = RatingFilter
+    rollup_models = (EmployeeSkillRollup,)
 
     def get_queryset(self):
         grade_name = self.kwargs.get("grade_name")
-        queryset = Rating.objects.select_related(
-            "employee",
-            "position"
-        ).filter(
-            employee__grade=grade_name,
-        ).values(
-            "employee__position__name",
-        ).annotate(
-            position_employee_count=Count(
-                "employee",
-                distinct=True,
-            )
-        ).order_by(
+        return self.count_employees(
+            self.get_source_queryset().filter(
+                grade=grade_name,
+            ),
+            "position__name",
             "position_employee_count",
         )
 
-        filtered_queryset = self.filter_queryset(queryset)
-        total_employee_count = sum(
-            item["position_employee_count"] for item in filtered_queryset
-        )
-
-        return filtered_queryset.annotate(
-            total_employee_count=Value(
-                total_employee_count,
-                output_field=IntegerField(),
-            )
+    def get_engine_rows(self, engine, filters):
+        return engine.aggregate(
+            engine.select(filters, grade=self.kwargs.get("grade_name")),
+            ("position__name",),
+            order_by="position_employee_count",
+            position_employee_count=EmployeeCount(),
+            total_employee_count=TotalEmployeeCount(),
+            percentage=Percentage(
+                "position_employee_count",
+                "total_employee_count",
+                precision=1,
+            ),
         )
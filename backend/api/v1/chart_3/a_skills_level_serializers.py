@@ -14,7 +14,7 @@ class SkillsLevelSerializer(
     """Сериализатор для чарта "Уровень владения навыками"."""
 
     domain = serializers.CharField(
-        source="skill__competence__domain__name",
+        source="domain__name",
     )
     skill_name = serializers.CharField(
         source="skill__name",
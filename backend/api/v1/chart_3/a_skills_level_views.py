@@ -1,14 +1,18 @@
-from django.db.models import Avg
-from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema_view
 from rest_framework import mixins, viewsets
 
-from api.v1.filters import RatingFilter
+from analytics.engine import Average
+from api.v1.filters import RatingFilter, RollupFilterBackend
+from api.v1.mixins import (
+    AnalyticsEngineMixin,
+    ChartCacheMixin,
+    ConditionalGetMixin,
+    RollupMixin
+)
 from api.v1.chart_3.a_skills_level_serializers import (
     SkillsLevelSerializer
 )
 from api.v1.chart_3.schemas import CHART_3_A_SCHEMA
-from ratings.models import Rating
 
 
 # --------------------------------------------
@@ -18,6 +22,10 @@ from ratings.models import Rating
 
 @extend_schema_view(**CHART_3_A_SCHEMA)
 class SkillsLevelViewSet(
+    RollupMixin,
+    ConditionalGetMixin,
+    ChartCacheMixin,
+    AnalyticsEngineMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
 ):
@@ -27,18 +35,27 @@ class SkillsLevelViewSet(
     """
 
     serializer_class = SkillsLevelSerializer
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (RollupFilterBackend,)
     filterset_class = RatingFilter
 
     def get_queryset(self):
-        return Rating.objects.select_related(
+        queryset = self.get_source_queryset()
+        return queryset.select_related(
             "skill",
-            "skill__competence__domain",
+            "domain",
         ).values(
-            "skill__competence__domain__name",
+            "domain__name",
             "skill__name"
         ).annotate(
-            skill_level=Avg("rating_value")
+            skill_level=self.average(queryset)
         ).order_by(
             "skill_level"
         )
+
+    def get_engine_rows(self, engine, filters):
+        return engine.aggregate(
+            engine.select(filters),
+            ("domain__name", "skill__name"),
+            order_by="skill_level",
+            skill_level=Average(),
+        )
@@ -20,10 +20,10 @@ class EmployeeScoresSerializer(
         source="employee__full_name",
     )
     domain = serializers.CharField(
-        source="skill__competence__domain__name",
+        source="domain__name",
     )
     competence_name = serializers.CharField(
-        source="skill__competence__name",
+        source="competence__name",
     )
     skill_name = serializers.CharField(
         source="skill__name",
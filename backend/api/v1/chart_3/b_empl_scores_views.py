@@ -3,6 +3,12 @@ from drf_spectacular.utils import extend_schema_view
 from rest_framework import mixins, viewsets
 
 from api.v1.filters import RatingFilter
+from api.v1.mixins import (
+    ChartCacheMixin,
+    ConditionalGetMixin,
+    StreamingExportMixin
+)
+from api.v1.pagination import EmployeeScoresPagination
 from api.v1.chart_3.b_empl_scores_serializers import (
     EmployeeScoresSerializer
 )
@@ -17,6 +23,9 @@ from ratings.models import Rating
 
 @extend_schema_view(**CHART_3_B_SCHEMA)
 class EmployeeScoresViewSet(
+    ConditionalGetMixin,
+    StreamingExportMixin,
+    ChartCacheMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
 ):
@@ -26,6 +35,7 @@ class EmployeeScoresViewSet(
     """
 
     serializer_class = EmployeeScoresSerializer
+    pagination_class = EmployeeScoresPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RatingFilter
 
@@ -33,15 +43,17 @@ class EmployeeScoresViewSet(
         return Rating.objects.select_related(
             "employee",
             "skill",
-            "skill__competence",
-            "skill__competence__domain"
+            "competence",
+            "domain"
         ).values(
             "employee__full_name",
-            "skill__competence__domain__name",
-            "skill__competence__name",
+            "domain__name",
+            "competence__name",
             "skill__name",
             "rating_date",
             "rating_value",
+            "employee_id",
+            "id",
         ).order_by(
-            "employee__full_name"
+            *EmployeeScoresPagination.ordering
         )
@@ -1,15 +1,21 @@
-from django.db.models import Avg, Q
-from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Q
 from drf_spectacular.utils import extend_schema_view
 from rest_framework import mixins, viewsets
 from rest_framework.permissions import AllowAny
 
+from analytics.engine import Average
 from api.v1.chart_4.a_skills_dev_serializers import (
     SkillsDevelopmentSerializer
 )
 from api.v1.chart_4.schemas import CHART_4_A_SCHEMA
-from api.v1.filters import RatingFilter
-from ratings.models import Rating
+from api.v1.filters import RatingFilter, RollupFilterBackend
+from api.v1.mixins import (
+    AnalyticsEngineMixin,
+    ChartCacheMixin,
+    ConditionalGetMixin,
+    RollupMixin
+)
+from rollups.models import SkillDateRollup
 
 # --------------------------------------------
 #    Чарт 4 Вкладка A
@@ -18,6 +24,10 @@ from ratings.models import Rating
 
 @extend_schema_view(**CHART_4_A_SCHEMA)
 class SkillsDevelopmentViewSet(
+    RollupMixin,
+    ConditionalGetMixin,
+    ChartCacheMixin,
+    AnalyticsEngineMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
 ):
@@ -28,26 +38,38 @@ class SkillsDevelopmentViewSet(
 
     serializer_class = SkillsDevelopmentSerializer
     permission_classes = (AllowAny,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (RollupFilterBackend,)
     filterset_class = RatingFilter
+    rollup_models = (SkillDateRollup,)
 
     def get_queryset(self):
-        return Rating.objects.select_related(
+        queryset = self.get_source_queryset()
+        return queryset.select_related(
             "skill",
-            "skill__competence",
-            "skill__competence__domain",
+            "competence",
+            "domain",
         ).values(
             "rating_date",
         ).annotate(
-            average_rating=Avg("rating_value"),
-            average_rating_hard=Avg(
-                "rating_value",
-                filter=Q(skill__competence__domain__name="Hard skills"),
+            average_rating=self.average(queryset),
+            average_rating_hard=self.average(
+                queryset,
+                filter=Q(domain__name="Hard skills"),
             ),
-            average_rating_soft=Avg(
-                "rating_value",
-                filter=Q(skill__competence__domain__name="Soft skills"),
+            average_rating_soft=self.average(
+                queryset,
+                filter=Q(domain__name="Soft skills"),
             ),
         ).order_by(
             "rating_date",
         )
+
+    def get_engine_rows(self, engine, filters):
+        return engine.aggregate(
+            engine.select(filters),
+            ("rating_date",),
+            order_by="rating_date",
+            average_rating=Average(),
+            average_rating_hard=Average(domain="Hard skills"),
+            average_rating_soft=Average(domain="Soft skills"),
+        )
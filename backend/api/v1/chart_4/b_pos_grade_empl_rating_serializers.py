@@ -17,10 +17,10 @@ class PositionRatingSerializer(
     """
 
     position = serializers.CharField(
-        source="employee__position__name",
+        source="position__name",
     )
     position_id = serializers.CharField(
-        source="employee__position__id",
+        source="position__id",
     )
     average_rating = serializers.DecimalField(
         max_digits=3,
@@ -53,9 +53,7 @@ class GradeRatingSerializer(
     "Оценки сотрудников по должностям".
     для ВЫБРАННОЙ ДОЛЖНОСТИ
     """
-    grade = serializers.CharField(
-        source="employee__grade",
-    )
+    grade = serializers.CharField()
     average_rating = serializers.DecimalField(
         max_digits=3,
         decimal_places=2,
@@ -1,11 +1,16 @@
-from django.db.models import Avg
 from django.shortcuts import get_object_or_404
-from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema_view
 from rest_framework import mixins, viewsets
 from rest_framework.permissions import AllowAny
 
-from api.v1.filters import RatingFilter
+from analytics.engine import Average
+from api.v1.filters import RatingFilter, RollupFilterBackend
+from api.v1.mixins import (
+    AnalyticsEngineMixin,
+    ChartCacheMixin,
+    ConditionalGetMixin,
+    RollupMixin
+)
 from api.v1.chart_4.b_pos_grade_empl_rating_serializers import (
     EmployeeRatingSerializer,
     GradeRatingSerializer,
@@ -17,7 +22,7 @@ from api.v1.chart_4.schemas import (
     CHART_4_B3_SCHEMA
 )
 from employees.models import Position
-from ratings.models import Rating
+from rollups.models import EmployeeSkillRollup
 
 
 # --------------------------------------------
@@ -27,6 +32,10 @@ from ratings.models import Rating
 
 @extend_schema_view(**CHART_4_B1_SCHEMA)
 class PositionRatingViewSet(
+    RollupMixin,
+    ConditionalGetMixin,
+    ChartCacheMixin,
+    AnalyticsEngineMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
 ):
@@ -37,22 +46,31 @@ class PositionRatingViewSet(
 
     serializer_class = PositionRatingSerializer
     permission_classes = (AllowAny,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (RollupFilterBackend,)
     filterset_class = RatingFilter
 
     def get_queryset(self):
-        return Rating.objects.select_related(
+        queryset = self.get_source_queryset()
+        return queryset.select_related(
             "employee",
-            "employee__position",
+            "position",
         ).values(
-            "employee__position__name",
-            "employee__position__id",
+            "position__name",
+            "position__id",
         ).annotate(
-            average_rating=Avg("rating_value"),
+            average_rating=self.average(queryset),
         ).order_by(
             "average_rating",
         )
 
+    def get_engine_rows(self, engine, filters):
+        return engine.aggregate(
+            engine.select(filters),
+            ("position__name", "position__id"),
+            order_by="average_rating",
+            average_rating=Average(),
+        )
+
 
 
 # --------------------------------------------
@@ -63,6 +81,10 @@ class PositionRatingViewSet(
 
 @extend_schema_view(**CHART_4_B2_SCHEMA)
 class GradeRatingViewSet(
+    RollupMixin,
+    ConditionalGetMixin,
+    ChartCacheMixin,
+    AnalyticsEngineMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
 ):
@@ -74,7 +96,7 @@ class GradeRatingViewSet(
 
     serializer_class = GradeRatingSerializer
     permission_classes = (AllowAny,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (RollupFilterBackend,)
     filterset_class = RatingFilter
 
     def get_queryset(self):
@@ -82,19 +104,32 @@ class GradeRatingViewSet(
             Position,
             id=self.kwargs.get("position_id"),
         )
-        return Rating.objects.select_related(
+        queryset = self.get_source_queryset()
+        return queryset.select_related(
             "employee",
-            "employee__position",
+            "position",
         ).filter(
-            employee__position=position,
+            position=position,
         ).values(
-            "employee__grade",
+            "grade",
         ).annotate(
-            average_rating=Avg("rating_value"),
+            average_rating=self.average(queryset),
         ).order_by(
             "average_rating",
         )
 
+    def get_engine_rows(self, engine, filters):
+        position = self.get_engine_object_or_404(
+            engine.dataset.positions,
+            self.kwargs.get("position_id"),
+        )
+        return engine.aggregate(
+            engine.select(filters, position=position),
+            ("grade",),
+            order_by="average_rating",
+            average_rating=Average(),
+        )
+
 
 # --------------------------------------------
 #    Чарт 4 Вкладка B3 после "проваливания" в
@@ -104,6 +139,10 @@ class GradeRatingViewSet(
 
 @extend_schema_view(**CHART_4_B3_SCHEMA)
 class EmployeeRatingViewSet(
+    RollupMixin,
+    ConditionalGetMixin,
+    ChartCacheMixin,
+    AnalyticsEngineMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
 ):
@@ -115,8 +154,9 @@ class EmployeeRatingViewSet(
 
     serializer_class = EmployeeRatingSerializer
     permission_classes = (AllowAny,)
-    filter_backends = (DjangoFilterBackend,)
+    filter_backends = (RollupFilterBackend,)
     filterset_class = RatingFilter
+    rollup_models = (EmployeeSkillRollup,)
 
     def get_queryset(self):
         position = get_object_or_404(
@@ -124,17 +164,34 @@ class EmployeeRatingViewSet(
             id=self.kwargs.get("position_id"),
         )
         grade_name = self.kwargs.get("grade_name")
-        return Rating.objects.select_related(
+        queryset = self.get_source_queryset()
+        return queryset.select_related(
             "employee",
-            "employee__position",
+            "position",
         ).filter(
-            employee__position=position,
-            employee__grade=grade_name,
+            position=position,
+            grade=grade_name,
         ).values(
             "employee__id",
             "employee__full_name",
         ).annotate(
-            average_rating=Avg("rating_value"),
+            average_rating=self.average(queryset),
         ).order_by(
             "average_rating",
         )
+
+    def get_engine_rows(self, engine, filters):
+        position = self.get_engine_object_or_404(
+            engine.dataset.positions,
+            self.kwargs.get("position_id"),
+        )
+        return engine.aggregate(
+            engine.select(
+                filters,
+                position=position,
+                grade=self.kwargs.get("grade_name"),
+            ),
+            ("employee__id", "employee__full_name"),
+            order_by="average_rating",
+            average_rating=Average(),
+        )
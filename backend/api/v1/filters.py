@@ -1,30 +1,38 @@
 import django_filters
+from django_filters.rest_framework import DjangoFilterBackend
 
 from ratings.models import Rating
+from rollups.models import EmployeeSkillRollup, SkillDateRollup
 
 
 class RatingFilter(django_filters.FilterSet):
+    """
+    Фильтр оценок.
+
+    Атрибуты сотрудника и навыка берутся из денормализованных полей
+    оценки, поэтому фильтры не добавляют JOIN к запросам чартов.
+    """
 
     team = django_filters.NumberFilter(
-        field_name="employee__team__id",
+        field_name="team",
     )
     grade = django_filters.CharFilter(
-        field_name="employee__grade",
+        field_name="grade",
     )
     position = django_filters.NumberFilter(
-        field_name="employee__position__id",
+        field_name="position",
     )
     skill = django_filters.NumberFilter(
-        field_name="skill__id",
+        field_name="skill",
     )
     employee = django_filters.NumberFilter(
-        field_name="employee__id",
+        field_name="employee",
     )
     competence = django_filters.NumberFilter(
-        field_name="skill__competence__id",
+        field_name="competence",
     )
     domain = django_filters.NumberFilter(
-        field_name="skill__competence__domain__id",
+        field_name="domain",
     )
     start_date = django_filters.DateFilter(
         field_name="rating_date",
@@ -48,3 +56,40 @@ class RatingFilter(django_filters.FilterSet):
             "start_date",
             "end_date",
         )
+
+
+class EmployeeSkillRollupFilter(RatingFilter):
+    """Фильтр итогов сотрудников по навыкам с параметрами RatingFilter."""
+
+    class Meta(RatingFilter.Meta):
+        model = EmployeeSkillRollup
+
+
+class SkillDateRollupFilter(RatingFilter):
+    """Фильтр итогов по навыкам на даты с параметрами RatingFilter."""
+
+    class Meta(RatingFilter.Meta):
+        model = SkillDateRollup
+
+
+ROLLUP_FILTERS = {
+    EmployeeSkillRollup: EmployeeSkillRollupFilter,
+    SkillDateRollup: SkillDateRollupFilter,
+}
+
+
+class RollupFilterBackend(DjangoFilterBackend):
+    """
+    Фильтрация чартов, которые могут читать витрины итогов
+    (см. RollupMixin): к витрине применяется фильтр той же модели.
+    Вьюсет без filterset_class не фильтруется, как и при чтении оценок.
+    """
+
+    def get_filterset_class(self, view, queryset=None):
+        if (
+            getattr(view, "filterset_class", None) is not None
+            and queryset is not None
+            and queryset.model in ROLLUP_FILTERS
+        ):
+            return ROLLUP_FILTERS[queryset.model]
+        return super().get_filterset_class(view, queryset)
@@ -0,0 +1,488 @@
+import hashlib
+from contextlib import nullcontext
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.validators import EMPTY_VALUES
+from django.db.models import (
+    Avg,
+    Count,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    IntegerField,
+    Q,
+    Sum,
+    Window
+)
+from django.db.models.functions import Cast, DenseRank, Round
+from django.http import Http404, StreamingHttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+from django_filters import utils
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from analytics.dataset import iter_chunks
+from analytics.engine import get_engine
+from api.v1.filters import RatingFilter
+from api.v1.renderers import CSVRenderer, NDJSONRenderer, StreamingRenderer
+from api.v1.singleflight import SingleFlight, flight_lock
+from ratings.models import Rating
+from ratings.versions import (
+    get_data_modified,
+    get_data_version,
+    is_data_version_tracked
+)
+from rollups.models import ROLLUP_MODELS
+
+# Счетчики кэша ответов чартов по значению заголовка X-Chart-Cache:
+# попадания, промахи и ответы, взятые у одновременного расчета
+# того же запроса
+CACHE_COUNTERS = {
+    "hit": "hits",
+    "miss": "misses",
+    "coalesced": "coalesced",
+}
+
+# Одновременные расчеты ответов чартов в процессе
+chart_flights = SingleFlight()
+
+
+def clean_filters(view):
+    """
+    Параметры фильтра вьюсета view из запроса, проверенные формой
+    фильтра, как в DjangoFilterBackend. Пустые параметры
+    отбрасываются, числа приводятся к int.
+    """
+    if getattr(view, "filterset_class", None) is None:
+        return {}
+    filterset = view.filterset_class(
+        view.request.query_params,
+        queryset=Rating.objects.none(),
+    )
+    if not filterset.is_valid():
+        raise utils.translate_validation(filterset.errors)
+    return {
+        name: int(value) if isinstance(value, Decimal) else value
+        for name, value in filterset.form.cleaned_data.items()
+        if value not in EMPTY_VALUES
+    }
+
+
+def get_chart_cache():
+    return caches[settings.CHART_CACHE_ALIAS]
+
+
+def count_chart_cache(counter):
+    """
+    Увеличивает счетчик кэша чартов. Файловый кэш увеличивает значение
+    не атомарно, поэтому при одновременных запросах счетчики
+    приблизительные.
+    """
+    cache = get_chart_cache()
+    key = f"chart_cache:{counter}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def get_chart_cache_stats():
+    """Состояние кэша ответов чартов и его счетчики."""
+    cache = get_chart_cache()
+    return {
+        "enabled": settings.USE_CHART_CACHE,
+        "data_version": (
+            get_data_version() if is_data_version_tracked() else None
+        ),
+        **{
+            counter: cache.get(f"chart_cache:{counter}", 0)
+            for counter in CACHE_COUNTERS.values()
+        },
+    }
+
+
+class WindowValue(ExpressionWrapper):
+    """
+    Выражение над оконными функциями запроса с группировкой. Окна
+    считаются после группировки, поэтому выражение не добавляется
+    в GROUP BY.
+    """
+
+    def get_group_by_cols(self):
+        return []
+
+
+class RollupMixin:
+    """
+    Выбор источника данных для чарта: витрина итогов или оценки.
+
+    Витрина из rollup_models используется, если к ней применимы все
+    фильтры запроса, иначе чарт считается по самим оценкам. Поля
+    группировки у оценок и витрин называются одинаково, а агрегаты
+    строятся методами миксина, поэтому get_queryset не зависит
+    от источника.
+    """
+
+    rollup_models = ROLLUP_MODELS
+
+    def get_rollup_model(self):
+        """Первая витрина, поддерживающая все фильтры запроса."""
+        # При генерации схемы API параметры описываются по оценкам
+        if not settings.USE_ROLLUPS or getattr(
+            self, "swagger_fake_view", False
+        ):
+            return None
+        filters = set(self.request.query_params) & set(
+            RatingFilter.base_filters
+        )
+        for model in self.rollup_models:
+            if filters <= set(model.FILTER_FIELDS):
+                return model
+        return None
+
+    def get_source_queryset(self):
+        model = self.get_rollup_model()
+        return (model or Rating).objects.all()
+
+    @staticmethod
+    def is_rollup(queryset):
+        return queryset.model is not Rating
+
+    def filter_yes(self, queryset):
+        """Оценки или итоги, где есть соответствие навыку 'да'."""
+        if self.is_rollup(queryset):
+            return queryset.filter(yes_count__gt=0)
+        return queryset.filter(suitability=Rating.YES)
+
+    def count_yes(self, queryset):
+        """Количество оценок с соответствием 'да'."""
+        if self.is_rollup(queryset):
+            return Sum("yes_count")
+        return Count("skill", filter=Q(suitability=Rating.YES))
+
+    def count_required(self, queryset):
+        """Количество оценок, где навык требуется."""
+        if self.is_rollup(queryset):
+            return Sum("required_count")
+        return Count("skill", filter=~Q(suitability=Rating.NOT_REQUIRED))
+
+    def average(self, queryset, filter=None):
+        """
+        Средняя оценка. По витрине считается как отношение сумм
+        оценок и их количества.
+        """
+        if not self.is_rollup(queryset):
+            return Avg("rating_value", filter=filter)
+        return Cast(
+            Sum("rating_sum", filter=filter), FloatField()
+        ) / Sum("rating_count", filter=filter)
+
+    def count_employees(self, queryset, field, count_name):
+        """
+        Количество разных сотрудников по значениям field (count_name),
+        общее количество разных сотрудников (total_employee_count) и их
+        процент (percentage) одним запросом.
+
+        Оценки группируются по значению и сотруднику, оконные функции
+        по этим парам дают количество сотрудников значения и общее
+        количество: DENSE_RANK по возрастанию и по убыванию id
+        сотрудника в сумме на 1 больше числа разных сотрудников.
+        Сотрудник с несколькими значениями за период учитывается в
+        общем количестве один раз. DISTINCT оставляет по строке на
+        значение.
+        """
+        count = Window(Count("employee"), partition_by=F(field))
+        total = (
+            Window(DenseRank(), order_by=F("employee").asc())
+            + Window(DenseRank(), order_by=F("employee").desc())
+            - 1
+        )
+        return queryset.values(
+            field,
+            "employee",
+        ).alias(
+            # Группировка по значению и сотруднику
+            ratings=Count("pk"),
+        ).annotate(**{
+            count_name: count,
+            "total_employee_count": WindowValue(
+                total,
+                output_field=IntegerField(),
+            ),
+            "percentage": WindowValue(
+                Round(count * 100.0 / total, precision=1),
+                output_field=FloatField(),
+            ),
+        }).values(
+            field,
+            count_name,
+            "total_employee_count",
+            "percentage",
+        ).distinct().order_by(
+            count_name,
+        )
+
+
+class AnalyticsEngineMixin:
+    """
+    Расчет чарта по оценкам в памяти (приложение analytics).
+
+    Движок включается для вьюсета настройкой ANALYTICS_ENGINE_VIEWS,
+    поэтому чарт можно сравнить с расчетом через ORM на тех же
+    запросах. Вьюсет описывает расчет в get_engine_rows, строки
+    результата передаются тому же сериализатору. engine_data_version -
+    версия данных, по которой движок посчитал ответ (см.
+    ChartCacheMixin).
+    """
+
+    engine_data_version = None
+
+    def use_engine(self):
+        views = settings.ANALYTICS_ENGINE_VIEWS
+        return "*" in views or type(self).__name__ in views
+
+    def get_engine_filters(self):
+        """
+        Параметры RatingFilter запроса, проверенные формой фильтра,
+        как в DjangoFilterBackend.
+        """
+        return clean_filters(self)
+
+    @staticmethod
+    def get_engine_object_or_404(dimension, pk):
+        """id объекта справочника движка, 404 если такого объекта нет."""
+        pk = int(pk)
+        if dimension.code(pk) < 0:
+            raise Http404
+        return pk
+
+    def get_engine(self):
+        engine = get_engine()
+        self.engine_data_version = engine.data_version
+        return engine
+
+    def get_engine_rows(self, engine, filters):
+        raise NotImplementedError
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_engine():
+            return super().list(request, *args, **kwargs)
+        rows = self.get_engine_rows(
+            self.get_engine(), self.get_engine_filters()
+        )
+        return Response(self.get_serializer(rows, many=True).data)
+
+
+class ChartCacheMixin:
+    """
+    Кэш ответов чарта до изменения оценок или справочников
+    (USE_CHART_CACHE).
+
+    Ключ ответа составляют версия данных (ratings.versions), вьюсет
+    и его действие, параметры адреса, нормализованные параметры
+    фильтра и остальные параметры запроса, поэтому одинаковые по смыслу
+    запросы ("?team=01" и "?team=1") получают один ответ. Закэшированный ответ
+    отдается без запросов к БД. Заголовок X-Chart-Cache показывает,
+    взят ли ответ из кэша, счетчики - get_chart_cache_stats().
+
+    Одинаковые одновременные запросы (USE_SINGLE_FLIGHT) ждут один
+    расчет ответа в процессе и получают его результат, в том числе
+    без кэша. С кэшем расчет одного ключа в разных процессах сервера
+    разделяет блокировка в каталоге CHART_LOCK_DIR: дождавшийся
+    блокировки процесс берет ответ из кэша.
+
+    Ответ, посчитанный движком (AnalyticsEngineMixin) по другой версии
+    данных, чем в ключе, отдается, но не кэшируется: движок мог
+    загрузить оценки до их изменения.
+    """
+
+    # Версия данных ключа ответа
+    cache_data_version = None
+
+    def get_cache_key(self, filters):
+        filterset_class = getattr(self, "filterset_class", None)
+        filter_names = set(getattr(filterset_class, "base_filters", ()))
+        params = sorted(
+            (name, value)
+            for name, values in self.request.query_params.lists()
+            if name not in filter_names
+            for value in values
+        )
+        key = repr((
+            type(self).__name__,
+            getattr(self, "action", None),
+            sorted(self.kwargs.items()),
+            sorted(filters.items()),
+            params,
+        ))
+        self.cache_data_version = get_data_version()
+        return (
+            f"chart:{self.cache_data_version}:"
+            f"{hashlib.md5(key.encode()).hexdigest()}"
+        )
+
+    def get_cached_response(self, get_response, request, *args, **kwargs):
+        """
+        Ответ get_response(request, *args, **kwargs) из кэша или
+        посчитанный и сохраненный в кэш.
+        """
+        use_cache = settings.USE_CHART_CACHE
+        if not use_cache and not settings.USE_SINGLE_FLIGHT:
+            return get_response(request, *args, **kwargs)
+        try:
+            filters = clean_filters(self)
+        except ValidationError:
+            # Ошибку фильтра вернет сам расчет чарта
+            return get_response(request, *args, **kwargs)
+        key = self.get_cache_key(filters)
+        data = get_chart_cache().get(key) if use_cache else None
+        if data is not None:
+            status, state = 200, "hit"
+        elif settings.USE_SINGLE_FLIGHT:
+            (status, data, state), shared = chart_flights.do(
+                key,
+                lambda: self.compute_response(
+                    key, get_response, request, *args, **kwargs
+                ),
+            )
+            if shared:
+                state = "coalesced"
+        else:
+            status, data, state = self.compute_response(
+                key, get_response, request, *args, **kwargs
+            )
+        response = Response(data, status=status)
+        if use_cache:
+            count_chart_cache(CACHE_COUNTERS[state])
+            response["X-Chart-Cache"] = state
+        return response
+
+    def compute_response(self, key, get_response, request, *args, **kwargs):
+        """
+        Статус и данные ответа get_response(request, *args, **kwargs)
+        и значение заголовка X-Chart-Cache. Ответ, посчитанный другим
+        процессом, пока этот ждал блокировку ключа, берется из кэша.
+        """
+        use_cache = settings.USE_CHART_CACHE
+        cache = get_chart_cache()
+        with flight_lock(key) if use_cache else nullcontext():
+            data = cache.get(key) if use_cache else None
+            if data is not None:
+                return 200, data, "hit"
+            response = get_response(request, *args, **kwargs)
+            data = response.data
+            if response.status_code == 200:
+                # Копия без ссылки на сериализатор (ReturnList, ReturnDict)
+                data = list(data) if isinstance(data, list) else dict(data)
+                if use_cache and self.is_cacheable():
+                    cache.set(key, data)
+            return response.status_code, data, "miss"
+
+    def is_cacheable(self):
+        """Посчитан ли ответ по версии данных ключа."""
+        engine_data_version = getattr(self, "engine_data_version", None)
+        return engine_data_version in (None, self.cache_data_version)
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin:
+    """
+    Условные GET-запросы к данным дашборда (USE_CONDITIONAL_GET).
+
+    Ответ получает строгий ETag по версии данных (ratings.versions),
+    адресу, параметрам запроса и заголовку Accept и Last-Modified -
+    время записи версии данных. Запрос с актуальным If-None-Match или
+    If-Modified-Since получает 304 до расчета ответа, без запросов
+    к БД. Cache-Control: no-cache заставляет браузер и прокси
+    проверять ответ при каждом запросе, а не считать его свежим
+    по Last-Modified. ETag и Last-Modified получают только ответы 200
+    (и 304 на них): ошибку не должен подтверждать следующий запрос.
+    """
+
+    def get_etag(self, request, *args, **kwargs):
+        key = repr((
+            self.data_version,
+            request.path,
+            sorted(request.GET.lists()),
+            request.headers.get("Accept", ""),
+        ))
+        return f'"{hashlib.md5(key.encode()).hexdigest()}"'
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return get_data_modified(self.data_version)
+
+    def dispatch(self, request, *args, **kwargs):
+        if not settings.USE_CONDITIONAL_GET:
+            return super().dispatch(request, *args, **kwargs)
+        self.data_version = get_data_version()
+        response = condition(
+            etag_func=self.get_etag,
+            last_modified_func=self.get_last_modified,
+        )(super().dispatch)(request, *args, **kwargs)
+        if response.status_code not in (200, 304):
+            response.headers.pop("ETag", None)
+            response.headers.pop("Last-Modified", None)
+        patch_cache_control(response, no_cache=True)
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+
+class StreamingExportMixin:
+    """
+    Выгрузка всего списка строками: ?format=ndjson или ?format=csv.
+
+    Строки читаются из БД курсором на стороне сервера порциями
+    EXPORT_CHUNK_SIZE (QuerySet.iterator) и отправляются по мере
+    чтения, поэтому память процесса не зависит от размера выгрузки.
+    Выгрузка не делится на страницы и не кэшируется, строки
+    упорядочены так же, как на страницах списка.
+    """
+
+    def get_renderers(self):
+        return [*super().get_renderers(), NDJSONRenderer(), CSVRenderer()]
+
+    def get_export_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = getattr(self.paginator, "ordering", None)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, StreamingRenderer):
+            return super().list(request, *args, **kwargs)
+        queryset = self.get_export_queryset()
+        serializer = self.get_serializer()
+        rows = (
+            serializer.to_representation(item)
+            for item in queryset.iterator(
+                chunk_size=settings.EXPORT_CHUNK_SIZE
+            )
+        )
+        fields = [
+            name for name, field in serializer.fields.items()
+            if not field.write_only
+        ]
+        response = StreamingHttpResponse(
+            (
+                "".join(lines)
+                for lines in iter_chunks(
+                    renderer.iter_lines(rows, fields),
+                    settings.EXPORT_CHUNK_SIZE,
+                )
+            ),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.basename}.{renderer.format}"'
+        )
+        return response
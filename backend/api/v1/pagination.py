@@ -0,0 +1,128 @@
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Постраничный вывод по ключу (keyset): курсор хранит значения всех
+    полей сортировки последней строки страницы, следующая страница -
+    строки после этих значений, LIMIT размер страницы.
+
+    В отличие от CursorPagination сравнивается весь набор полей, а не
+    первое поле со смещением, поэтому страницы не зависят от
+    количества строк с одинаковым первым полем. Поля ordering должны
+    быть NOT NULL и вместе уникальны. Общее количество строк
+    (COUNT(*)) не считается.
+    """
+
+    ordering = ("id",)
+    page_size_query_param = "page_size"
+
+    def __init__(self):
+        self.page_size = settings.RATING_PAGE_SIZE
+        self.max_page_size = settings.RATING_PAGE_SIZE_MAX
+
+    @staticmethod
+    def get_field(order):
+        return order.lstrip("-")
+
+    def get_position_filter(self, ordering, position):
+        """
+        Условие "строка после position" при сортировке ordering:
+        (a > x) OR (a = x AND b > y) OR ... Условие a >= x добавлено
+        для поиска диапазона по индексу.
+        """
+        if not isinstance(position, list) or len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        condition = Q()
+        equal = {}
+        for order, value in zip(ordering, position):
+            lookup = "lt" if order.startswith("-") else "gt"
+            field = self.get_field(order)
+            condition |= Q(**equal, **{f"{field}__{lookup}": value})
+            equal[field] = value
+        first = ordering[0]
+        lookup = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{self.get_field(first)}__{lookup}": position[0]}) & (
+            condition
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor else None
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(
+                order[1:] if order.startswith("-") else f"-{order}"
+                for order in ordering
+            )
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(
+                    self.get_position_filter(ordering, json.loads(position))
+                )
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = position is not None
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = [
+            instance[field] if isinstance(instance, dict)
+            else getattr(instance, field)
+            for field in map(self.get_field, ordering)
+        ]
+        return json.dumps(values, cls=DjangoJSONEncoder)
+
+    def get_link(self, item, reverse):
+        if item is None:
+            position = self.cursor.position
+        else:
+            position = self._get_position_from_instance(item, self.ordering)
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=reverse, position=position)
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.get_link(self.page[-1] if self.page else None, False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.get_link(self.page[0] if self.page else None, True)
+
+
+class EmployeeScoresPagination(KeysetPagination):
+    """
+    Оценки по именам сотрудников: id сотрудника разделяет тезок, дата
+    и id оценки делают порядок уникальным. Имя сотрудника заполняется
+    при сохранении и импорте сотрудника и не бывает NULL: у сотрудника,
+    сохраненного без имени, это пустая строка.
+    """
+
+    ordering = ("employee__full_name", "employee_id", "rating_date", "id")
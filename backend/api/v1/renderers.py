@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class StreamingRenderer(BaseRenderer):
+    """
+    Формат выгрузки, в котором строки записываются независимо друг
+    от друга: iter_lines() отдает текст по строке, поэтому ответ можно
+    отправлять по мере чтения строк из БД (см. StreamingExportMixin).
+    render() нужен для остальных ответов в этом формате, например
+    ошибок фильтра.
+    """
+
+    charset = "utf-8"
+
+    def iter_lines(self, rows, fields):
+        """Текст строк rows - словарей с ключами fields."""
+        raise NotImplementedError
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        fields = list(rows[0]) if rows else []
+        return "".join(self.iter_lines(rows, fields)).encode(self.charset)
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """Строки JSON, по объекту в строке."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def iter_lines(self, rows, fields):
+        for row in rows:
+            yield json.dumps(row, cls=JSONEncoder, ensure_ascii=False) + "\n"
+
+
+class CSVRenderer(StreamingRenderer):
+    """CSV с заголовком из имен полей."""
+
+    media_type = "text/csv"
+    format = "csv"
+
+    def iter_lines(self, rows, fields):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
@@ -1,8 +1,18 @@
+import os
+
 from rest_framework import serializers
 
 from employees.models import Employee, Position, Team
+from imports.constants import SOURCE_EXTENSIONS, UPLOAD_MAX_SIZE
+from imports.models import ImportJob
 from ratings.models import Competence, Domain, Rating, Skill
 
+# Разрезы списка навыков с наименьшим Bus-фактором
+BUS_FACTOR_SCOPES = ("team", "competence", "domain")
+# Количество навыков в списке по умолчанию и наибольшее
+BUS_FACTOR_TOP_DEFAULT = 10
+BUS_FACTOR_TOP_MAX = 100
+
 
 class TeamSerializer(serializers.ModelSerializer):
     """Сериализатор для работы с командами."""
@@ -122,3 +132,117 @@ class BusFactorSerializer(
         read_only_fields = (
             "__all__",
         )
+
+
+class BusFactorTopQuerySerializer(serializers.Serializer):
+    """Параметры списка навыков с наименьшим Bus-фактором."""
+
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=BUS_FACTOR_TOP_MAX,
+        default=BUS_FACTOR_TOP_DEFAULT,
+        help_text="Количество навыков (в каждом разрезе)",
+    )
+    scope = serializers.ChoiceField(
+        choices=BUS_FACTOR_SCOPES,
+        required=False,
+        help_text="Разрез: команда, компетенция или домен",
+    )
+
+
+class BusFactorTopSerializer(serializers.Serializer):
+    """
+    Сериализатор для навыка из списка с наименьшим Bus-фактором.
+    Поля разреза есть в ответе, только если разрез задан.
+    """
+
+    scope_id = serializers.IntegerField(required=False)
+    scope = serializers.CharField(required=False)
+    rank = serializers.IntegerField()
+    skill_id = serializers.IntegerField(source="skill__id")
+    skill = serializers.CharField(source="skill__name")
+    bus_factor = serializers.IntegerField(source="skill_employee_count")
+
+
+# --------------------------------------------
+#    Кэш ответов чартов
+# --------------------------------------------
+
+
+class ChartCacheStatsSerializer(serializers.Serializer):
+    """Сериализатор для состояния кэша ответов чартов."""
+
+    enabled = serializers.BooleanField()
+    data_version = serializers.CharField(allow_null=True)
+    hits = serializers.IntegerField()
+    misses = serializers.IntegerField()
+    coalesced = serializers.IntegerField()
+
+
+# --------------------------------------------
+#    Задачи импорта
+# --------------------------------------------
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Сериализатор для задач импорта оценок."""
+
+    file = serializers.FileField(write_only=True)
+    # Без явного default поле, не переданное в multipart, станет False
+    upsert = serializers.BooleanField(default=True)
+    atomic = serializers.BooleanField(default=False)
+    file_name = serializers.SerializerMethodField()
+    status_display = serializers.CharField(
+        source="get_status_display", read_only=True
+    )
+    elapsed = serializers.FloatField(read_only=True)
+    rows_per_second = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = ImportJob
+        fields = (
+            "id",
+            "file",
+            "file_name",
+            "upsert",
+            "atomic",
+            "status",
+            "status_display",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "elapsed",
+            "rows_read",
+            "rows_inserted",
+            "rows_updated",
+            "rows_unchanged",
+            "rows_skipped",
+            "rows_per_second",
+            "errors",
+        )
+        read_only_fields = (
+            "status",
+            "created_at",
+            "started_at",
+            "finished_at",
+            "rows_read",
+            "rows_inserted",
+            "rows_updated",
+            "rows_unchanged",
+            "rows_skipped",
+            "errors",
+        )
+
+    def get_file_name(self, obj):
+        return os.path.basename(obj.file.name)
+
+    def validate_file(self, value):
+        if not value.name.lower().endswith(SOURCE_EXTENSIONS):
+            raise serializers.ValidationError(
+                "Поддерживаются файлы: " + ", ".join(SOURCE_EXTENSIONS)
+            )
+        if value.size > UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Размер файла больше {UPLOAD_MAX_SIZE // (1024 * 1024)} МБ."
+            )
+        return value
@@ -0,0 +1,75 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Количество файлов блокировок: разные ключи с одним файлом ждут друг
+# друга, зато число файлов не растет с числом ключей
+LOCK_STRIPES = 256
+
+
+class SingleFlight:
+    """
+    Одно вычисление на ключ для одновременных запросов процесса.
+
+    Первый поток с ключом выполняет функцию, остальные ждут и получают
+    ее результат или исключение. После завершения ключ освобождается,
+    следующий запрос снова вычисляет результат.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, function):
+        """
+        Результат function() и True, если он взят у одновременного
+        вызова с тем же ключом.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            shared = call is not None
+            if not shared:
+                call = self._calls[key] = Future()
+        if shared:
+            return call.result(), True
+        try:
+            result = function()
+        except BaseException as error:
+            call.set_exception(error)
+            raise
+        else:
+            call.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+@contextmanager
+def flight_lock(key):
+    """
+    Блокировка ключа между процессами одного сервера: файл блокировки
+    в каталоге CHART_LOCK_DIR. Без каталога или без fcntl (Windows)
+    блокировка не берется.
+    """
+    directory = settings.CHART_LOCK_DIR
+    if not directory or fcntl is None:
+        yield
+        return
+    os.makedirs(directory, exist_ok=True)
+    stripe = int(hashlib.md5(key.encode()).hexdigest(), 16) % LOCK_STRIPES
+    with open(os.path.join(directory, f"{stripe}.lock"), "a") as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
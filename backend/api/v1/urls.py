@@ -32,9 +32,11 @@ from api.v1.chart_4.b_pos_grade_empl_rating_views import (
 )
 from api.v1.views import (
     BusFactorViewSet,
+    ChartCacheStatsViewSet,
     CompetenceViewSet,
     DomainViewSet,
     EmployeeViewSet,
+    ImportJobViewSet,
     PositionViewSet,
     RatingViewSet,
     SkillViewSet,
@@ -153,6 +155,24 @@ router_v1.register(
     basename="bus_factor",
 )
 
+# --------------------------------------------
+#    Кэш ответов чартов
+# --------------------------------------------
+router_v1.register(
+    r"dashboard/cache_stats",
+    ChartCacheStatsViewSet,
+    basename="chart_cache_stats",
+)
+
+# --------------------------------------------
+#    Задачи импорта
+# --------------------------------------------
+router_v1.register(
+    r"imports",
+    ImportJobViewSet,
+    basename="imports",
+)
+
 urlpatterns = [
     path("", include(router_v1.urls)),
 ]
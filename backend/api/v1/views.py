@@ -1,22 +1,45 @@
-from django.db.models import Count
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import mixins, viewsets
-from rest_framework.permissions import AllowAny
+from drf_spectacular.utils import extend_schema
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 
-from api.v1.filters import RatingFilter
-from api.v1.serializers import (BusFactorSerializer, CompetenceSerializer,
+from analytics.engine import EmployeeCount
+from api.v1.filters import RatingFilter, RollupFilterBackend
+from api.v1.mixins import (
+    AnalyticsEngineMixin,
+    ChartCacheMixin,
+    ConditionalGetMixin,
+    RollupMixin,
+    StreamingExportMixin,
+    get_chart_cache_stats
+)
+from api.v1.pagination import KeysetPagination
+from api.v1.serializers import (BusFactorSerializer,
+                                BusFactorTopQuerySerializer,
+                                BusFactorTopSerializer,
+                                ChartCacheStatsSerializer,
+                                CompetenceSerializer,
                                 DomainSerializer,
                                 EmployeeSerializer,
+                                ImportJobSerializer,
                                 PositionSerializer,
                                 RatingSerializer,
                                 SkillSerializer,
                                 TeamSerializer)
 from employees.models import Employee, Position, Team
+from imports.jobs import enqueue_job
+from imports.models import ImportJob
 from ratings.models import Competence, Domain, Rating, Skill
+from rollups.models import EmployeeSkillRollup
 
 
-class PositionViewSet(viewsets.ReadOnlyModelViewSet):
+class PositionViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """Вьюсет для работы с должностями."""
 
     queryset = Position.objects.all()
@@ -26,7 +49,7 @@ class PositionViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = "name"
 
 
-class TeamViewSet(viewsets.ReadOnlyModelViewSet):
+class TeamViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """Вьюсет для работы с командами."""
 
     queryset = Team.objects.all()
@@ -36,17 +59,17 @@ class TeamViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = "name"
 
 
-class EmployeeViewSet(viewsets.ReadOnlyModelViewSet):
+class EmployeeViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """Вьюсет для работы с сотрудниками."""
 
-    queryset = Employee.objects.all()
+    queryset = Employee.objects.select_related("team", "position")
     serializer_class = EmployeeSerializer
     permission_classes = (AllowAny,)
     pagination_class = None
     ordering_fields = "name"
 
 
-class DomainViewSet(viewsets.ReadOnlyModelViewSet):
+class DomainViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """Вьюсет для работы с доменами."""
 
     queryset = Domain.objects.all()
@@ -56,7 +79,7 @@ class DomainViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = "name"
 
 
-class SkillViewSet(viewsets.ReadOnlyModelViewSet):
+class SkillViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """Вьюсет для работы с навыками."""
 
     queryset = Skill.objects.all()
@@ -66,7 +89,7 @@ class SkillViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = "name"
 
 
-class CompetenceViewSet(viewsets.ReadOnlyModelViewSet):
+class CompetenceViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """Вьюсет для работы с компетенциями."""
 
     queryset = Competence.objects.all()
@@ -76,13 +99,19 @@ class CompetenceViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = "name"
 
 
-class RatingViewSet(viewsets.ReadOnlyModelViewSet):
+class RatingViewSet(
+    ConditionalGetMixin,
+    StreamingExportMixin,
+    viewsets.ReadOnlyModelViewSet
+):
     """Вьюсет для работы с оценками сотрудников."""
 
-    queryset = Rating.objects.all()
+    queryset = Rating.objects.select_related(
+        "employee__team", "employee__position", "skill"
+    )
     serializer_class = RatingSerializer
     permission_classes = (AllowAny,)
-    pagination_class = None
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_class = RatingFilter
 
@@ -91,6 +120,10 @@ class RatingViewSet(viewsets.ReadOnlyModelViewSet):
 #    Bus-фактор
 # --------------------------------------------
 class BusFactorViewSet(
+    RollupMixin,
+    ConditionalGetMixin,
+    ChartCacheMixin,
+    AnalyticsEngineMixin,
     mixins.ListModelMixin,
     viewsets.GenericViewSet
 ):
@@ -98,28 +131,174 @@ class BusFactorViewSet(
 
     serializer_class = BusFactorSerializer
     permission_classes = (AllowAny,)
-    filter_backends = (DjangoFilterBackend, )
+    filter_backends = (RollupFilterBackend, )
     filterset_class = RatingFilter
+    rollup_models = (EmployeeSkillRollup,)
 
     def get_queryset(self):
-        return Rating.objects.select_related(
-            "skill"
-        ).filter(
-            suitability="да"
+        return self.get_top_queryset()
+
+    def get_top_queryset(self, scope=None):
+        """
+        Навыки по возрастанию количества сотрудников с соответствием
+        "да" и номер навыка в этом порядке, в разрезе scope (команды,
+        компетенции или домена) - номер внутри разреза. При равном
+        количестве навыки упорядочены по названию и id, поэтому ответ
+        не зависит от плана запроса.
+        """
+        order_by = (
+            F("skill_employee_count").asc(),
+            F("skill__name").asc(),
+            F("skill__id").asc(),
+        )
+        scope_fields = {}
+        if scope:
+            scope_fields = {"scope_id": F(scope), "scope": F(f"{scope}__name")}
+        return self.filter_yes(
+            self.get_source_queryset()
         ).values(
+            "skill__id",
             "skill__name",
+            **scope_fields,
         ).annotate(
             skill_employee_count=Count(
                 "employee",
                 distinct=True,
             )
+        ).annotate(
+            rank=Window(
+                RowNumber(),
+                partition_by=F(scope) if scope else None,
+                order_by=order_by,
+            )
         ).order_by(
-            "skill_employee_count",
+            *(("scope", "scope_id") if scope else ()),
+            *order_by,
         )
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
+    def get_engine_rows(self, engine, filters, scope=None):
+        scope_fields = (f"{scope}__id", f"{scope}__name") if scope else ()
+        rows = engine.aggregate(
+            engine.select(filters, suitability=Rating.YES),
+            scope_fields + ("skill__id", "skill__name"),
+            skill_employee_count=EmployeeCount(),
+        )
+        for row in rows:
+            if scope:
+                row["scope_id"] = row.pop(f"{scope}__id")
+                row["scope"] = row.pop(f"{scope}__name")
+        rows.sort(key=lambda row: (
+            row.get("scope", ""),
+            row.get("scope_id", 0),
+            row["skill_employee_count"],
+            row["skill__name"],
+            row["skill__id"],
+        ))
+        for row, previous in zip(rows, [None] + rows):
+            same_scope = previous is not None and (
+                previous.get("scope_id") == row.get("scope_id")
+            )
+            row["rank"] = previous["rank"] + 1 if same_scope else 1
+        return rows
+
+    def get_top_rows(self, limit, scope=None):
+        """
+        Не больше limit навыков с наименьшим Bus-фактором, в разрезе
+        scope - в каждом значении разреза. Ограничение выполняется
+        в БД одним запросом: без разреза - LIMIT, в разрезе - фильтр
+        по номеру навыка внутри разреза.
+        """
+        if self.use_engine():
+            rows = self.get_engine_rows(
+                self.get_engine(), self.get_engine_filters(), scope
+            )
+            return [row for row in rows if row["rank"] <= limit]
+        queryset = self.filter_queryset(self.get_top_queryset(scope))
+        if scope:
+            return queryset.filter(rank__lte=limit)
+        return queryset[:limit]
+
+    def get_bus_factor(self, request, *args, **kwargs):
+        rows = self.get_top_rows(1)
+        if not rows:
+            raise NotFound("Нет навыков с соответствием 'да'.")
         serializer = self.get_serializer(
-            queryset[0]
+            rows[0]
         )
         return Response(serializer.data)
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            self.get_bus_factor, request, *args, **kwargs
+        )
+
+    def get_top(self, request, *args, **kwargs):
+        params = BusFactorTopQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        rows = self.get_top_rows(
+            params.validated_data["limit"],
+            params.validated_data.get("scope"),
+        )
+        return Response(BusFactorTopSerializer(rows, many=True).data)
+
+    @extend_schema(
+        parameters=[BusFactorTopQuerySerializer],
+        responses=BusFactorTopSerializer(many=True),
+    )
+    @action(detail=False)
+    def top(self, request, *args, **kwargs):
+        """
+        Навыки с наименьшим Bus-фактором, по limit навыков в каждой
+        команде, компетенции или домене (scope).
+        """
+        return self.get_cached_response(
+            self.get_top, request, *args, **kwargs
+        )
+
+
+# --------------------------------------------
+#    Кэш ответов чартов
+# --------------------------------------------
+class ChartCacheStatsViewSet(viewsets.ViewSet):
+    """Вьюсет для состояния и счетчиков кэша ответов чартов."""
+
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(responses=ChartCacheStatsSerializer)
+    def list(self, request):
+        return Response(
+            ChartCacheStatsSerializer(get_chart_cache_stats()).data
+        )
+
+
+# --------------------------------------------
+#    Задачи импорта
+# --------------------------------------------
+class ImportJobViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet
+):
+    """
+    Вьюсет для фоновых задач импорта.
+
+    POST принимает файл и сразу возвращает задачу со статусом
+    "В очереди" (202), импорт выполняется вне обработчика запроса.
+    По GET видны статус, прогресс, скорость и ошибки импорта.
+    """
+
+    queryset = ImportJob.objects.all()
+    serializer_class = ImportJobSerializer
+    permission_classes = (IsAdminUser,)
+    parser_classes = (MultiPartParser, FormParser)
+    pagination_class = None
+
+    def perform_create(self, serializer):
+        job = serializer.save(created_by=self.request.user)
+        enqueue_job(job)
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
@@ -0,0 +1,163 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+
+from employees.models import Employee, Position, Team
+from ratings.models import Competence, Domain, Skill
+
+logger = logging.getLogger(__name__)
+
+# Чарты без параметров адреса: прогреваются без фильтров и с каждым
+# значением фильтров из CHART_WARMUP_FILTERS. Баллы сотрудников
+# (employee_scores) - сами оценки, а не итоги, их не прогреваем
+CHART_ROUTES = (
+    "suitability_position",
+    "employees_count_with_skills",
+    "employee_positions",
+    "employee_grades",
+    "skill_level",
+    "skills_development",
+    "position_rating",
+    "bus_factor",
+)
+
+
+def get_grades():
+    return Employee.objects.order_by("grade").values_list(
+        "grade", flat=True
+    ).distinct()
+
+
+def get_pks(model):
+    return lambda: model.objects.values_list("pk", flat=True)
+
+
+# Значения фильтров RatingFilter, с которыми прогреваются чарты
+FILTER_VALUES = {
+    "team": get_pks(Team),
+    "position": get_pks(Position),
+    "grade": get_grades,
+    "skill": get_pks(Skill),
+    "competence": get_pks(Competence),
+    "domain": get_pks(Domain),
+}
+
+
+def get_drilldown_requests():
+    """
+    Запросы чартов после "проваливания" в навык, грейд и должность.
+    Чарт сотрудника не прогревается: сотрудников слишком много.
+    """
+    grades = list(get_grades())
+    positions = list(Position.objects.values_list("pk", flat=True))
+    for skill_id in Skill.objects.values_list("pk", flat=True):
+        yield reverse("api:skill_employee-list", args=(skill_id,)), {}
+    for grade_name in grades:
+        yield reverse(
+            "api:employee_grades_positions-list", args=(grade_name,)
+        ), {}
+    for position_id in positions:
+        yield reverse("api:grade_rating-list", args=(position_id,)), {}
+        for grade_name in grades:
+            yield reverse(
+                "api:employee_rating-list", args=(position_id, grade_name)
+            ), {}
+
+
+def get_warmup_requests(filters=None):
+    """
+    Адреса и параметры прогреваемых запросов: чарты без фильтров,
+    с каждым значением фильтров filters (по умолчанию
+    CHART_WARMUP_FILTERS) и чарты после "проваливания".
+    """
+    if filters is None:
+        filters = settings.CHART_WARMUP_FILTERS
+    params = [{}] + [
+        {name: value}
+        for name in filters
+        for value in FILTER_VALUES[name]()
+    ]
+    requests = [
+        (reverse(f"api:{route}-list"), query)
+        for route in CHART_ROUTES
+        for query in params
+    ]
+    requests.extend(get_drilldown_requests())
+    return requests
+
+
+class ChartWarmup:
+    """
+    Прогрев кэша ответов чартов после импорта.
+
+    Запросы выполняются теми же вьюсетами, что и запросы
+    пользователей, поэтому ответы попадают в кэш под теми же ключами.
+    Потоков не больше workers, каждый закрывает свои соединения с БД
+    после запроса. Уже закэшированные ответы не пересчитываются, ошибка
+    одного запроса записывается в лог и не прерывает прогрев: запрос
+    выполняется в своей транзакции (точке сохранения, если прогрев
+    запущен внутри транзакции).
+    """
+
+    def __init__(self, workers=None, filters=None):
+        self.workers = workers or settings.CHART_WARMUP_WORKERS
+        self.filters = filters
+        self.requests = 0
+        self.populated = 0
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def fetch(self, path, query):
+        request = RequestFactory().get(path, query)
+        match = resolve(path)
+        try:
+            with transaction.atomic():
+                return match.func(request, *match.args, **match.kwargs)
+        except Exception:
+            logger.exception("Ошибка прогрева %s %s", path, query)
+            return None
+        finally:
+            if self.workers > 1:
+                connections.close_all()
+
+    def count(self, response):
+        self.requests += 1
+        if response is None or response.status_code != 200:
+            self.errors += 1
+        elif response.get("X-Chart-Cache") == "miss":
+            self.populated += 1
+
+    def run(self):
+        started = time.monotonic()
+        requests = get_warmup_requests(self.filters)
+        if self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for response in executor.map(
+                    lambda request: self.fetch(*request), requests
+                ):
+                    self.count(response)
+        else:
+            for path, query in requests:
+                self.count(self.fetch(path, query))
+        self.elapsed = time.monotonic() - started
+        return self
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "populated": self.populated,
+            "errors": self.errors,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+    def summary(self):
+        return (
+            f"Кэш чартов прогрет за {self.elapsed:.1f} с: "
+            f"запросов {self.requests}, записано ответов {self.populated}, "
+            f"ошибок {self.errors}"
+        )
@@ -52,6 +52,9 @@ INSTALLED_APPS = [
 
     'employees.apps.EmployeesConfig',
     'ratings.apps.RatingsConfig',
+    'imports.apps.ImportsConfig',
+    'rollups.apps.RollupsConfig',
+    'analytics.apps.AnalyticsConfig',
 ]
 
 MIDDLEWARE = [
@@ -161,6 +164,13 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": None,
 }
+# Количество оценок на странице списков оценок по умолчанию и наибольшее
+# количество, которое можно запросить параметром page_size
+RATING_PAGE_SIZE = int(os.getenv("RATING_PAGE_SIZE", 1000))
+RATING_PAGE_SIZE_MAX = int(os.getenv("RATING_PAGE_SIZE_MAX", 10000))
+# Количество строк, которые выгрузки ?format=ndjson и ?format=csv читают
+# из БД и отправляют за один раз
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
 
 
 # ------------------------------------------------
@@ -182,3 +192,101 @@ SPECTACULAR_SETTINGS = {
     "SCHEMA_COERCE_PATH_PK_SUFFIX": True,
     "REDOC_DIST": "SIDECAR",
 }
+
+
+# ------------------------------------------------
+#    Фоновые задачи импорта оценок
+# ------------------------------------------------
+# Загруженные файлы хранятся вне MEDIA_ROOT, который раздает nginx
+IMPORT_UPLOAD_ROOT = os.getenv(
+    "IMPORT_UPLOAD_ROOT",
+    os.path.join(BASE_DIR, "import_uploads")
+)
+# False - задачи выполняет отдельный процесс manage.py run_import_jobs.
+# True - пул потоков в каждом процессе gunicorn: разбор файла занимает
+# GIL процесса и замедляет ответы на запросы
+IMPORT_JOBS_IN_PROCESS = os.getenv("IMPORT_JOBS_IN_PROCESS", "False") == "True"
+# Количество потоков, выполняющих задачи импорта в процессе приложения
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", 1))
+# Через сколько секунд без сигнала (сигнал отмечается после каждой
+# пачки) задача "Выполняется" считается прерванной (процесс остановлен)
+# и завершается с ошибкой
+IMPORT_JOB_TIMEOUT = int(os.getenv("IMPORT_JOB_TIMEOUT", 10 * 60))
+
+
+# ------------------------------------------------
+#    Витрины итогов оценок
+# ------------------------------------------------
+# False - чарты всегда считаются по самим оценкам
+USE_ROLLUPS = os.getenv("USE_ROLLUPS", "True") == "True"
+
+
+# ------------------------------------------------
+#    Расчет чартов в памяти (приложение analytics)
+# ------------------------------------------------
+# Вьюсеты чартов, которые считаются по оценкам в памяти вместо запросов
+# к БД: имена классов через запятую, "*" - все чарты
+ANALYTICS_ENGINE_VIEWS = [
+    name for name in os.getenv("ANALYTICS_ENGINE_VIEWS", "").split(",")
+    if name
+]
+# Через сколько секунд оценки из БД загружаются в память заново, если
+# версия данных недоступна; иначе - после смены версии данных
+ANALYTICS_ENGINE_TTL = int(os.getenv("ANALYTICS_ENGINE_TTL", 300))
+# Каталог снимков оценок, которые процессы gunicorn отображают в память
+# вместо загрузки из БД; снимок записывается после каждого импорта
+# и одним процессом после смены версии данных, остальные его ждут.
+# Пустое значение - снимки не используются
+ANALYTICS_SNAPSHOT_DIR = os.getenv("ANALYTICS_SNAPSHOT_DIR", "")
+
+
+# ------------------------------------------------
+#    Кэш ответов чартов
+# ------------------------------------------------
+# True - ответы чартов кэшируются до изменения оценок или справочников.
+# Пока кэш выключен, изменения данных не отмечаются: перед включением
+# кэш нужно очистить
+USE_CHART_CACHE = os.getenv("USE_CHART_CACHE", "False") == "True"
+# True - ответы API получают ETag и Last-Modified по версии данных,
+# на повторный запрос без изменений данных отдается 304. Версия данных
+# хранится в кэше чартов, как и версия, по которой движок analytics
+# загружает оценки заново
+USE_CONDITIONAL_GET = os.getenv("USE_CONDITIONAL_GET", "False") == "True"
+CHART_CACHE_ALIAS = "charts"
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Файловый кэш общий для процессов gunicorn на одном сервере;
+    # локальный (locmem) подходит только для одного процесса
+    CHART_CACHE_ALIAS: {
+        "BACKEND": os.getenv(
+            "CHART_CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache"
+        ) if (
+            USE_CHART_CACHE or USE_CONDITIONAL_GET or ANALYTICS_ENGINE_VIEWS
+        ) else (
+            "django.core.cache.backends.dummy.DummyCache"
+        ),
+        "LOCATION": os.getenv(
+            "CHART_CACHE_LOCATION",
+            os.path.join(BASE_DIR, "chart_cache")
+        ),
+        "TIMEOUT": int(os.getenv("CHART_CACHE_TIMEOUT", 24 * 60 * 60)),
+    },
+}
+# True - одинаковые одновременные запросы чартов в процессе ждут один
+# расчет ответа
+USE_SINGLE_FLIGHT = os.getenv("USE_SINGLE_FLIGHT", "True") == "True"
+# Каталог файлов блокировок, с которыми одинаковые запросы чартов
+# в разных процессах сервера ждут один расчет и берут ответ из кэша
+# чартов. Пустое значение - расчеты разделяются только внутри процесса
+CHART_LOCK_DIR = os.getenv("CHART_LOCK_DIR", "")
+# Фильтры, с каждым значением которых прогреваются чарты после импорта
+# (manage.py warm_chart_cache): имена фильтров RatingFilter через запятую
+CHART_WARMUP_FILTERS = [
+    name for name in os.getenv("CHART_WARMUP_FILTERS", "team").split(",")
+    if name
+]
+# Количество потоков, выполняющих запросы прогрева
+CHART_WARMUP_WORKERS = int(os.getenv("CHART_WARMUP_WORKERS", 4))
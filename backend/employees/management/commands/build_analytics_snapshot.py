@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from analytics.snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+
+    help = "Запись снимка оценок для расчета чартов в памяти."
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        version = build_snapshot()
+        if version is None:
+            self.stdout.write(self.style.ERROR(
+                "Каталог снимков ANALYTICS_SNAPSHOT_DIR не задан."
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Снимок {version} записан за "
+            f"{time.monotonic() - started:.1f} с"
+        ))
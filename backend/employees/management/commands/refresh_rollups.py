@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from rollups.builders import refresh_rollups
+from rollups.models import EmployeeSkillRollup, SkillDateRollup
+
+
+class Command(BaseCommand):
+
+    help = "Построение витрин итогов оценок для чартов заново."
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        refresh_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f"Витрины построены за {time.monotonic() - started:.1f} с: "
+            f"итогов сотрудников {EmployeeSkillRollup.objects.count()}, "
+            f"итогов на даты {SkillDateRollup.objects.count()}"
+        ))
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from imports.constants import JOB_QUEUED
+from imports.jobs import fail_stale_jobs, process_job
+from imports.models import ImportJob
+
+
+class Command(BaseCommand):
+
+    help = "Выполнение задач импорта, загруженных через API."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Не завершаться, а ждать новые задачи.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Пауза между проверками очереди в секундах.",
+        )
+
+    def run_queued(self):
+        """
+        Выполняет задачи из очереди в порядке создания. Задачи,
+        прерванные остановкой процесса, завершаются с ошибкой.
+        """
+        stale = fail_stale_jobs()
+        if stale:
+            self.stdout.write(f"Прервано задач: {stale}")
+        job_ids = list(
+            ImportJob.objects.filter(
+                status=JOB_QUEUED
+            ).order_by("created_at").values_list("pk", flat=True)
+        )
+        for job_id in job_ids:
+            process_job(job_id)
+            job = ImportJob.objects.get(pk=job_id)
+            self.stdout.write(
+                f"Задача {job_id}: {job.get_status_display()}, "
+                f"прочитано строк: {job.rows_read}"
+            )
+
+    def handle(self, *args, **options):
+        while True:
+            self.run_queued()
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.v1.warmup import ChartWarmup
+
+
+class Command(BaseCommand):
+
+    help = "Прогрев кэша ответов чартов."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.CHART_WARMUP_WORKERS,
+            help="Количество потоков, выполняющих запросы.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.USE_CHART_CACHE:
+            self.stdout.write(self.style.ERROR(
+                "Кэш ответов чартов выключен (USE_CHART_CACHE)."
+            ))
+            return
+        warmup = ChartWarmup(workers=options["workers"]).run()
+        self.stdout.write(self.style.SUCCESS(warmup.summary()))
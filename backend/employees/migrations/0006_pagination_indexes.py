@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 07:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_alter_employee_first_name_alter_employee_last_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['full_name', 'id'], name='employee_full_name_id_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2 on 2026-10-18 07:38
+
+from django.db import migrations
+from django.db.models import Value
+from django.db.models.functions import Concat
+
+
+def fill_full_name(apps, schema_editor):
+    """Заполняет полное имя сотрудников, сохраненных без него."""
+    Employee = apps.get_model("employees", "Employee")
+    Employee.objects.filter(full_name__isnull=True).update(
+        full_name=Concat("last_name", Value(" "), "first_name")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0006_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_full_name, migrations.RunPython.noop),
+    ]
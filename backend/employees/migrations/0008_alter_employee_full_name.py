@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 07:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0007_fill_employee_full_name'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='employee',
+            name='full_name',
+            field=models.CharField(blank=True, default='', max_length=150, verbose_name='Полное имя сотрудника'),
+        ),
+    ]
@@ -87,11 +87,13 @@ class Employee(models.Model):
             ),
         ],
     )
+    # NOT NULL: имя входит в ключ постраничного вывода
+    # (см. api.v1.pagination)
     full_name = models.CharField(
         max_length=FULL_NAME_MAX_LENGTH,
         verbose_name="Полное имя сотрудника",
         blank=True,
-        null=True,
+        default="",
     )
     position = models.ForeignKey(
         Position,
@@ -115,6 +117,14 @@ class Employee(models.Model):
         verbose_name_plural = "Сотрудники"
         default_related_name = "employees"
         ordering = ("last_name", "first_name")
+        indexes = [
+            # Баллы сотрудников по страницам в порядке имен
+            # (см. api.v1.pagination)
+            models.Index(
+                fields=["full_name", "id"],
+                name="employee_full_name_id_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.last_name} {self.first_name}"
@@ -0,0 +1,29 @@
+from django.contrib import admin
+
+from .models import ImportJob, ImportSource
+
+
+@admin.register(ImportSource)
+class ImportSourceAdmin(admin.ModelAdmin):
+    """Админка для модели ImportSource."""
+
+    list_display = ("path", "file_hash", "imported_at")
+    search_fields = ("path",)
+    readonly_fields = ("file_hash", "imported_at")
+    ordering = ("path",)
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    """Админка для модели ImportJob."""
+
+    list_display = (
+        "file", "status", "created_by", "created_at", "finished_at",
+        "rows_read", "rows_inserted", "rows_updated", "rows_skipped",
+    )
+    list_filter = ("status",)
+    readonly_fields = (
+        "status", "created_at", "started_at", "finished_at", "rows_read",
+        "rows_inserted", "rows_updated", "rows_unchanged", "rows_skipped",
+        "errors",
+    )
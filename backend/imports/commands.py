@@ -0,0 +1,265 @@
+import json
+import os
+from contextlib import nullcontext
+from itertools import chain
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from dashboard_backend.settings import BASE_DIR
+from api.v1.warmup import ChartWarmup
+from config import FILE_DIRECTORY, FILE_NAME
+from imports.constants import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PROGRESS_INTERVAL,
+    DEFAULT_WORKERS,
+    PHASE_LOADING,
+    PHASE_VALIDATION,
+    REQUIRED_COLUMNS,
+)
+from imports.fingerprints import FingerprintStore
+from imports.pipeline import RatingImportPipeline
+from imports.progress import ProgressReporter
+from imports.readers import (
+    find_files,
+    find_sources,
+    iter_parallel,
+    iter_read_errors,
+    iter_sources_chunks,
+    read_sheet,
+    ReadError,
+    split_chunks,
+)
+from imports.validators import ImportValidator
+
+
+class BaseImportCommand(BaseCommand):
+    """
+    Общая логика команд импорта оценок сотрудников.
+
+    Источником может быть файл, каталог или маска glob с файлами
+    xlsx, csv или parquet; из каждой книги Excel импортируются все
+    листы с нужными колонками. Данные сначала целиком проверяются
+    ImportValidator, и только если ошибок нет, строки загружаются в БД.
+    При atomic = True загрузка выполняется в одной транзакции.
+    """
+
+    atomic = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "file_path",
+            nargs="?",
+            default=os.path.join(BASE_DIR, FILE_DIRECTORY, FILE_NAME),
+            help=(
+                "Путь к файлу, каталогу или маска glob "
+                "(по умолчанию FILE_DIRECTORY/FILE_NAME)."
+            ),
+        )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            help=(
+                "Потоковый импорт: файл читается и записывается в БД "
+                "пачками, не загружаясь в память целиком."
+            ),
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Количество строк в пачке для потокового импорта.",
+        )
+        parser.add_argument(
+            "--upsert",
+            action="store_true",
+            help=(
+                "Повторный импорт: существующие оценки обновляются, "
+                "если изменились значение или соответствие."
+            ),
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "Инкрементальный импорт: загружаются только строки, "
+                "новые или изменившиеся с прошлого импорта этого файла."
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_WORKERS,
+            help="Количество процессов для параллельного разбора листов.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только проверить файл и вывести отчет об ошибках.",
+        )
+        parser.add_argument(
+            "--progress-interval",
+            type=float,
+            default=DEFAULT_PROGRESS_INTERVAL,
+            help="Интервал вывода прогресса в секундах.",
+        )
+        parser.add_argument(
+            "--json-summary",
+            action="store_true",
+            help="Вывести итоги импорта одной строкой JSON.",
+        )
+        parser.add_argument(
+            "--no-warmup",
+            action="store_true",
+            help=(
+                "Не прогревать кэш ответов чартов после импорта "
+                "(при USE_CHART_CACHE = True)."
+            ),
+        )
+
+    def read(self, sources, options):
+        """
+        Возвращает последовательность пачек строк всех листов.
+
+        Потоковое чтение ленивое: первая пачка читается сразу, а ошибки
+        чтения следующих пачек выбрасываются как ReadError там, где
+        пачки обрабатываются.
+        """
+        if options["workers"] > 1 and len(sources) > 1:
+            frames = iter_parallel(sources, options["workers"])
+            if not options["stream"]:
+                return list(frames)
+            chunks = split_chunks(frames, options["chunk_size"])
+        elif options["stream"]:
+            chunks = iter_sources_chunks(sources, options["chunk_size"])
+        else:
+            return [read_sheet(source) for source in sources]
+        chunks = iter_read_errors(chunks)
+        first = next(chunks, None)
+        if first is None:
+            return []
+        return chain([first], chunks)
+
+    def write_read_error(self, error):
+        self.stdout.write(self.style.ERROR(
+            f"Ошибка при чтении файла: {error}")
+        )
+
+    def validate(self, chunks, progress):
+        """Проверяет файл и выводит отчет."""
+        progress.start_phase(PHASE_VALIDATION)
+        validator = ImportValidator().run(progress.track(chunks))
+        progress.finish_phase()
+        style = (
+            self.style.SUCCESS if validator.is_valid else self.style.ERROR
+        )
+        for line in validator.report():
+            self.stdout.write(style(line))
+        return validator
+
+    def handle(self, *args, **options):
+
+        file_path = options["file_path"]
+        files = find_files(file_path)
+        # Проверка существования файла
+        if not files:
+            self.stdout.write(self.style.ERROR(
+                f"Файл не найден: {file_path}")
+            )
+            return
+
+        fingerprints = None
+        if options["incremental"] and not options["dry_run"]:
+            if len(files) > 1:
+                self.stdout.write(self.style.ERROR(
+                    "Инкрементальный импорт возможен только для одного файла."
+                ))
+                return
+            fingerprints = FingerprintStore(files[0])
+            if fingerprints.is_unchanged:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Файл не изменился с прошлого импорта: {file_path}")
+                )
+                return
+
+        # Проверка, что файлы читаются
+        try:
+            sources = find_sources(files)
+            chunks = self.read(sources, options)
+        except Exception as e:
+            self.write_read_error(e)
+            return
+        if not sources:
+            self.stdout.write(self.style.ERROR(
+                f"Нет листов с колонками: {', '.join(REQUIRED_COLUMNS)}")
+            )
+            return
+
+        # Если все прошло успешно, выводим сообщение
+        self.stdout.write(self.style.SUCCESS(
+            f"Файл успешно прочитан: {file_path}, листов: {len(sources)}")
+        )
+
+        progress = ProgressReporter(
+            self.stdout,
+            self.style,
+            interval=options["progress_interval"],
+            enabled=options["verbosity"] >= 1,
+        )
+        # Проверка выполняется до открытия транзакций записи
+        try:
+            validator = self.validate(chunks, progress)
+        except ReadError as e:
+            self.write_read_error(e)
+            return
+        if options["dry_run"]:
+            return
+        if not validator.is_valid:
+            self.stdout.write(self.style.ERROR(
+                "Импорт отменен: файл содержит ошибки.")
+            )
+            return
+
+        if options["stream"]:
+            # Потоковое чтение одноразовое, файлы читаются повторно
+            try:
+                chunks = self.read(sources, options)
+            except Exception as e:
+                self.write_read_error(e)
+                return
+
+        pipeline = RatingImportPipeline(
+            self.stdout,
+            self.style,
+            # Изменившиеся строки уже есть в БД и должны обновиться
+            upsert=options["upsert"] or options["incremental"],
+            fingerprints=fingerprints,
+            on_chunk=lambda stats: progress.update(stats.rows_read),
+            verbosity=options["verbosity"],
+        )
+        progress.start_phase(PHASE_LOADING, total=validator.rows)
+        try:
+            with transaction.atomic() if self.atomic else nullcontext():
+                stats = pipeline.run(chunks)
+        except ReadError as e:
+            self.write_read_error(e)
+            return
+        progress.finish_phase()
+        # Версия данных уже сменилась после фиксации импорта
+        warmup = None
+        if (
+            stats.rows_loaded
+            and settings.USE_CHART_CACHE
+            and not options["no_warmup"]
+        ):
+            warmup = ChartWarmup().run()
+        if options["json_summary"]:
+            summary = stats.as_dict()
+            if warmup is not None:
+                summary["warmup"] = warmup.as_dict()
+            self.stdout.write(json.dumps(summary, ensure_ascii=False))
+        else:
+            self.stdout.write(self.style.SUCCESS(stats.summary()))
+            if warmup is not None:
+                self.stdout.write(self.style.SUCCESS(warmup.summary()))
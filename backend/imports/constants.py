@@ -0,0 +1,123 @@
+# Колонки входного файла с оценками сотрудников
+EMPLOYEE_COLUMN = "сотрудник"
+POSITION_COLUMN = "должность"
+TEAM_COLUMN = "команда"
+DOMAIN_COLUMN = "домен"
+COMPETENCE_COLUMN = "компетенция"
+SKILL_COLUMN = "навык"
+GRADE_COLUMN = "грейд"
+DATE_COLUMN = "дата"
+RATING_VALUE_COLUMN = "оценка_"
+SUITABILITY_COLUMN = "соответствие"
+
+REQUIRED_COLUMNS = (
+    EMPLOYEE_COLUMN,
+    POSITION_COLUMN,
+    TEAM_COLUMN,
+    DOMAIN_COLUMN,
+    COMPETENCE_COLUMN,
+    SKILL_COLUMN,
+    GRADE_COLUMN,
+    DATE_COLUMN,
+    RATING_VALUE_COLUMN,
+    SUITABILITY_COLUMN,
+)
+
+# Форматы входных файлов
+XLSX_FORMAT = "xlsx"
+CSV_FORMAT = "csv"
+PARQUET_FORMAT = "parquet"
+
+# Расширения файлов каждого формата
+FORMAT_EXTENSIONS = {
+    XLSX_FORMAT: (".xlsx",),
+    CSV_FORMAT: (".csv",),
+    PARQUET_FORMAT: (".parquet", ".pq"),
+}
+
+# Расширения файлов, импортируемых из каталога
+SOURCE_EXTENSIONS = tuple(
+    extension
+    for extensions in FORMAT_EXTENSIONS.values()
+    for extension in extensions
+)
+
+# Сигнатуры в начале файла для определения формата без расширения
+FORMAT_SIGNATURES = {
+    XLSX_FORMAT: b"PK\x03\x04",
+    PARQUET_FORMAT: b"PAR1",
+}
+
+# Кодировка CSV-файлов (utf-8-sig пропускает BOM выгрузок из Excel)
+CSV_ENCODING = "utf-8-sig"
+
+# Допустимые разделители колонок CSV-файлов
+CSV_DELIMITERS = ",;\t"
+
+# Количество строк файла, обрабатываемых за один проход
+DEFAULT_CHUNK_SIZE = 5000
+
+# Количество процессов для разбора файлов (1 - без пула процессов)
+DEFAULT_WORKERS = 1
+
+# Размер пачки для bulk_create оценок
+RATING_BATCH_SIZE = 999
+
+# Колонки, добавляемые при разборе имени сотрудника
+LAST_NAME_COLUMN = "last_name"
+FIRST_NAME_COLUMN = "first_name"
+
+# Максимальное количество значений в одном запросе name__in
+LOOKUP_BATCH_SIZE = 500
+
+# Служебные колонки с хешами строк для инкрементального импорта
+KEY_HASH_COLUMN = "key_hash"
+ROW_HASH_COLUMN = "row_hash"
+
+# Размер блока при вычислении хеша файла
+FILE_HASH_BLOCK_SIZE = 1024 * 1024
+
+SOURCE_PATH_MAX_LENGTH = 500
+FILE_HASH_MAX_LENGTH = 64
+
+# Ключ DataFrame.attrs с источником пачки строк: (файл, лист)
+SOURCE_ATTR = "source"
+
+# Количество строк с ошибками, выводимых в отчете проверки
+VALIDATION_REPORT_LIMIT = 50
+
+# CHOICES для статуса задачи импорта ImportJob
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+JOB_STATUS_CHOICES = (
+    (JOB_QUEUED, "В очереди"),
+    (JOB_RUNNING, "Выполняется"),
+    (JOB_SUCCEEDED, "Завершена"),
+    (JOB_FAILED, "Ошибка"),
+)
+
+JOB_STATUS_MAX_LENGTH = max(len(status) for status, _ in JOB_STATUS_CHOICES)
+
+# Ошибка задачи, которую не завершил остановленный процесс
+JOB_TIMEOUT_MESSAGE = (
+    "Задача прервана: процесс импорта остановлен до завершения"
+)
+
+# Максимальный размер загружаемого файла (как client_max_body_size в nginx)
+UPLOAD_MAX_SIZE = 20 * 1024 * 1024
+
+# Каталог для загруженных файлов внутри IMPORT_UPLOAD_ROOT
+UPLOAD_TO = "%Y/%m/%d/"
+
+# Уровень --verbosity, с которого выводится сообщение о каждой строке
+VERBOSITY_ROWS = 3
+
+# Интервал вывода прогресса импорта в секундах
+DEFAULT_PROGRESS_INTERVAL = 5
+
+# Названия этапов импорта в сообщениях о прогрессе
+PHASE_VALIDATION = "проверка"
+PHASE_LOADING = "загрузка"
@@ -0,0 +1,116 @@
+import hashlib
+import os
+
+import pandas as pd
+
+from imports.constants import (
+    DATE_COLUMN,
+    EMPLOYEE_COLUMN,
+    FILE_HASH_BLOCK_SIZE,
+    KEY_HASH_COLUMN,
+    RATING_BATCH_SIZE,
+    REQUIRED_COLUMNS,
+    ROW_HASH_COLUMN,
+    SKILL_COLUMN,
+)
+from imports.models import ImportSource, RowFingerprint
+from imports.resolvers import batched
+
+# Колонки, однозначно определяющие оценку в файле
+KEY_COLUMNS = (EMPLOYEE_COLUMN, SKILL_COLUMN, DATE_COLUMN)
+
+
+def get_file_hash(file_path):
+    """SHA-256 содержимого файла."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(FILE_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_columns(chunk, columns):
+    """
+    64-битный хеш значений колонок для каждой строки пачки.
+
+    Значения приводятся к строкам, чтобы хеш не зависел от того,
+    каким типом их вернул читатель файла.
+    """
+    hashes = pd.util.hash_pandas_object(
+        chunk[list(columns)].astype(str),
+        index=False,
+    )
+    return pd.Series(hashes.to_numpy().view("int64"), index=chunk.index)
+
+
+class FingerprintStore:
+    """
+    Отпечатки источника для инкрементального импорта.
+
+    Хранит хеш файла целиком и хеши строк по ключу
+    (сотрудник, навык, дата). Неизменный файл не читается повторно,
+    а из измененного загружаются только новые и изменившиеся строки.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = os.path.abspath(file_path)
+        self.file_hash = get_file_hash(self.file_path)
+        self.source, _ = ImportSource.objects.get_or_create(
+            path=self.file_path
+        )
+
+    @property
+    def is_unchanged(self):
+        return self.source.file_hash == self.file_hash
+
+    def filter_changed(self, chunk):
+        """
+        Возвращает новые и изменившиеся строки пачки
+        с добавленными колонками хешей.
+        """
+        chunk = chunk.assign(**{
+            KEY_HASH_COLUMN: hash_columns(chunk, KEY_COLUMNS),
+            ROW_HASH_COLUMN: hash_columns(chunk, REQUIRED_COLUMNS),
+        })
+        known = {}
+        for keys in batched(chunk[KEY_HASH_COLUMN].unique().tolist()):
+            known.update(
+                RowFingerprint.objects.filter(
+                    source=self.source,
+                    key__in=keys,
+                ).values_list("key", "digest")
+            )
+        changed = [
+            known.get(key) != digest
+            for key, digest in zip(
+                chunk[KEY_HASH_COLUMN],
+                chunk[ROW_HASH_COLUMN],
+            )
+        ]
+        return chunk[changed]
+
+    def save(self, chunk):
+        """Сохраняет отпечатки загруженных строк пачки."""
+        chunk = chunk.drop_duplicates(KEY_HASH_COLUMN, keep="last")
+        RowFingerprint.objects.bulk_create(
+            [
+                RowFingerprint(
+                    source=self.source,
+                    key=int(key),
+                    digest=int(digest),
+                )
+                for key, digest in zip(
+                    chunk[KEY_HASH_COLUMN],
+                    chunk[ROW_HASH_COLUMN],
+                )
+            ],
+            batch_size=RATING_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=("source", "key"),
+            update_fields=("digest",),
+        )
+
+    def finish(self):
+        """Запоминает хеш полностью загруженного файла."""
+        self.source.file_hash = self.file_hash
+        self.source.save(update_fields=("file_hash", "imported_at"))
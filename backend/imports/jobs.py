@@ -0,0 +1,208 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from imports.constants import (
+    DEFAULT_CHUNK_SIZE,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    JOB_TIMEOUT_MESSAGE,
+    REQUIRED_COLUMNS,
+)
+from imports.models import ImportJob
+from imports.pipeline import RatingImportPipeline
+from imports.readers import find_sources, iter_sources_chunks
+from imports.validators import ImportValidator
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Пул потоков для задач импорта, создается при первой задаче."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMPORT_JOB_WORKERS,
+                thread_name_prefix="import-job",
+            )
+        return _executor
+
+
+def enqueue_job(job):
+    """
+    Оставляет задачу в таблице со статусом "В очереди" до запуска
+    manage.py run_import_jobs. Если IMPORT_JOBS_IN_PROCESS = True,
+    задача ставится в пул потоков процесса приложения после фиксации
+    транзакции.
+    """
+    fail_stale_jobs()
+    if settings.IMPORT_JOBS_IN_PROCESS:
+        transaction.on_commit(lambda: get_executor().submit(run_job, job.pk))
+
+
+def claim_job(job_id):
+    """
+    Переводит задачу из очереди в работу. Возвращает False,
+    если задачу уже взял другой поток или процесс.
+    """
+    return bool(
+        ImportJob.objects.filter(pk=job_id, status=JOB_QUEUED).update(
+            status=JOB_RUNNING,
+            started_at=timezone.now(),
+            heartbeat_at=timezone.now(),
+        )
+    )
+
+
+def delete_file(job):
+    """Удаляет загруженный файл задачи, имя файла остается в БД."""
+    try:
+        job.file.storage.delete(job.file.name)
+    except OSError:
+        logger.exception("Не удалось удалить файл задачи %s", job.pk)
+
+
+def fail_stale_jobs():
+    """
+    Завершает с ошибкой задачи, от которых больше IMPORT_JOB_TIMEOUT
+    секунд нет сигнала: процесс, выполнявший задачу, остановлен
+    (перезапуск приложения, нехватка памяти), и статус "Выполняется"
+    больше никто не сменит. Возвращает число задач.
+
+    Строку задачи с atomic = True блокирует транзакция импорта, и
+    сигналы из нее до фиксации не видны. Такие задачи пропускаются:
+    блокировка держится, только пока жив процесс импорта.
+    """
+    deadline = timezone.now() - timedelta(
+        seconds=settings.IMPORT_JOB_TIMEOUT
+    )
+    with transaction.atomic():
+        # Задачи, начатые до появления сигналов, проверяются по началу
+        stale_jobs = list(
+            ImportJob.objects.select_for_update(skip_locked=True).filter(
+                Q(heartbeat_at__lt=deadline)
+                | Q(heartbeat_at__isnull=True, started_at__lt=deadline),
+                status=JOB_RUNNING,
+            )
+        )
+        for job in stale_jobs:
+            finish_job(job.pk, JOB_FAILED, [JOB_TIMEOUT_MESSAGE])
+    for job in stale_jobs:
+        delete_file(job)
+    return len(stale_jobs)
+
+
+def send_heartbeat(job_id):
+    ImportJob.objects.filter(pk=job_id).update(heartbeat_at=timezone.now())
+
+
+def iter_heartbeat(job_id, chunks):
+    """Отмечает сигнал задачи после чтения каждой пачки."""
+    for chunk in chunks:
+        send_heartbeat(job_id)
+        yield chunk
+
+
+def save_progress(job_id, stats):
+    ImportJob.objects.filter(pk=job_id).update(
+        rows_read=stats.rows_read,
+        rows_inserted=stats.rows_inserted,
+        rows_updated=stats.rows_updated,
+        rows_unchanged=stats.rows_unchanged,
+        rows_skipped=stats.rows_skipped,
+        heartbeat_at=timezone.now(),
+    )
+
+
+def finish_job(job_id, status, errors=()):
+    """
+    Сохраняет итог задачи. Возвращает False, если задача уже
+    завершена, например по тайм-ауту в fail_stale_jobs().
+    """
+    return bool(
+        ImportJob.objects.filter(pk=job_id, status=JOB_RUNNING).update(
+            status=status,
+            errors=list(errors),
+            finished_at=timezone.now(),
+        )
+    )
+
+
+def execute_job(job):
+    """
+    Проверяет файл задачи и загружает его пачками. Возвращает
+    статус и список ошибок.
+
+    По умолчанию каждая пачка фиксируется сразу, и счетчики строк
+    видны во время импорта. Задача с atomic = True загружается в одной
+    транзакции: при ошибке в БД не остается части строк, но счетчики
+    строк видны только после фиксации.
+    """
+    sources = find_sources([job.file.path])
+    if not sources:
+        return JOB_FAILED, [
+            f"Нет листов с колонками: {', '.join(REQUIRED_COLUMNS)}"
+        ]
+    validator = ImportValidator().run(
+        iter_heartbeat(job.pk, iter_sources_chunks(sources))
+    )
+    if not validator.is_valid:
+        return JOB_FAILED, validator.report()
+    # Сообщения о каждой строке в задаче не нужны
+    with open(os.devnull, "w") as devnull:
+        pipeline = RatingImportPipeline(
+            devnull,
+            no_style(),
+            upsert=job.upsert,
+            on_chunk=lambda stats: save_progress(job.pk, stats),
+        )
+        with transaction.atomic() if job.atomic else nullcontext():
+            if job.atomic:
+                # Блокировка строки задачи до фиксации: fail_stale_jobs()
+                # не завершит задачу, сигналы которой еще не видны
+                ImportJob.objects.select_for_update().get(pk=job.pk)
+            pipeline.run(iter_sources_chunks(sources, DEFAULT_CHUNK_SIZE))
+    return JOB_SUCCEEDED, []
+
+
+def process_job(job_id):
+    """
+    Выполняет задачу импорта, если она еще в очереди. Загруженный
+    файл после выполнения удаляется при любом исходе.
+    """
+    if not claim_job(job_id):
+        return
+    job = ImportJob.objects.get(pk=job_id)
+    try:
+        status, errors = execute_job(job)
+    except Exception as error:
+        logger.exception("Ошибка задачи импорта %s", job_id)
+        status, errors = JOB_FAILED, [f"Ошибка импорта: {error}"]
+    finally:
+        delete_file(job)
+    finish_job(job_id, status, errors)
+
+
+def run_job(job_id):
+    """Выполняет задачу в потоке пула."""
+    # Поток пула живет дольше запроса, соединения с БД закрываем сами
+    close_old_connections()
+    try:
+        process_job(job_id)
+    finally:
+        close_old_connections()
@@ -0,0 +1,275 @@
+import csv
+import io
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from imports.constants import RATING_BATCH_SIZE
+from imports.resolvers import batched
+from ratings.models import Rating
+from rollups.deltas import RollupDeltas
+
+# Порядок значений в строке оценки, передаваемой загрузчику
+RATING_FIELDS = (
+    "employee",
+    "skill",
+    "rating_date",
+    "rating_value",
+    "suitability",
+    # Денормализованные атрибуты сотрудника и навыка
+    "team",
+    "position",
+    "grade",
+    "competence",
+    "domain",
+)
+RATING_ATTNAMES = tuple(
+    Rating._meta.get_field(name).attname for name in RATING_FIELDS
+)
+# Поля ограничения unique_employee_skill_rating_on_date
+UNIQUE_FIELDS = ("rating_date", "skill", "employee")
+UPDATE_FIELDS = ("rating_value", "suitability")
+
+
+def rating_key(row):
+    """Ключ уникальности оценки: (сотрудник, навык, дата)."""
+    employee_id, skill_id, rating_date, *_ = row
+    return employee_id, skill_id, rating_date
+
+
+def rating_values(row):
+    """Обновляемые при повторном импорте значения оценки."""
+    return tuple(row[3:3 + len(UPDATE_FIELDS)])
+
+
+def deduplicate(rows):
+    """Оставляет последнюю строку для каждого ключа уникальности."""
+    return list({rating_key(row): row for row in rows}.values())
+
+
+class BulkCreateLoader:
+    """Загрузка оценок через Rating.objects.bulk_create."""
+
+    def __init__(self, using=DEFAULT_DB_ALIAS, batch_size=RATING_BATCH_SIZE):
+        self.using = using
+        self.batch_size = batch_size
+
+    @staticmethod
+    def to_instances(rows):
+        return [Rating(**dict(zip(RATING_ATTNAMES, row))) for row in rows]
+
+    def load(self, rows):
+        Rating.objects.using(self.using).bulk_create(
+            self.to_instances(rows),
+            batch_size=self.batch_size,
+        )
+        return len(rows)
+
+    def fetch_existing(self, rows):
+        """Текущие значения оценок с теми же ключами, что и у rows."""
+        keys = {rating_key(row) for row in rows}
+        skill_ids = {skill_id for _, skill_id, _ in keys}
+        rating_dates = {rating_date for _, _, rating_date in keys}
+        existing = {}
+        for employee_ids in batched({employee_id for employee_id, *_ in keys}):
+            ratings = Rating.objects.using(self.using).filter(
+                employee_id__in=employee_ids,
+                skill_id__in=skill_ids,
+                rating_date__in=rating_dates,
+            ).values_list(
+                "employee_id",
+                "skill_id",
+                "rating_date",
+                *UPDATE_FIELDS,
+            ).order_by()
+            for row in ratings:
+                if rating_key(row) in keys:
+                    existing[rating_key(row)] = rating_values(row)
+        return existing
+
+    def upsert(self, rows):
+        """
+        Добавляет новые оценки и обновляет изменившиеся.
+
+        Возвращает количество добавленных, обновленных и
+        не изменившихся оценок.
+        """
+        rows = deduplicate(rows)
+        existing = self.fetch_existing(rows)
+        changed = [
+            row for row in rows
+            if existing.get(rating_key(row)) != rating_values(row)
+        ]
+        inserted = sum(
+            1 for row in changed if rating_key(row) not in existing
+        )
+        Rating.objects.using(self.using).bulk_create(
+            self.to_instances(changed),
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=UNIQUE_FIELDS,
+            update_fields=UPDATE_FIELDS,
+        )
+        return inserted, len(changed) - inserted, len(rows) - len(changed)
+
+
+class PostgresCopyLoader:
+    """
+    Загрузка оценок в PostgreSQL через COPY ... FROM STDIN.
+
+    Строки пачки в формате CSV копируются во временную таблицу,
+    откуда переносятся в таблицу оценок одним INSERT ... SELECT.
+    Модели Rating при этом не создаются, поэтому разница итогов
+    витрин считается по строкам пачки.
+    """
+
+    staging_table = "ratings_rating_staging"
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self.connection = connections[using]
+        self.fields = [Rating._meta.get_field(name) for name in RATING_FIELDS]
+        self.columns = ", ".join(
+            self.connection.ops.quote_name(field.column)
+            for field in self.fields
+        )
+
+    def create_staging_table(self, cursor):
+        columns = ", ".join(
+            f"{self.connection.ops.quote_name(field.column)} "
+            f"{field.db_type(self.connection)}"
+            f"{'' if field.null else ' NOT NULL'}"
+            for field in self.fields
+        )
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE IF NOT EXISTS "
+            f"{self.staging_table} ({columns})"
+        )
+        cursor.execute(f"TRUNCATE {self.staging_table}")
+
+    def copy(self, cursor, data):
+        sql = (
+            f"COPY {self.staging_table} ({self.columns}) "
+            f"FROM STDIN WITH (FORMAT csv)"
+        )
+        raw_cursor = cursor.cursor
+        if hasattr(raw_cursor, "copy_expert"):
+            # psycopg2
+            raw_cursor.copy_expert(sql, data)
+        else:
+            # psycopg 3
+            with raw_cursor.copy(sql) as copy:
+                copy.write(data.read())
+
+    def merge(self, cursor):
+        """Переносит строки из временной таблицы в таблицу оценок."""
+        cursor.execute(
+            f"INSERT INTO {Rating._meta.db_table} ({self.columns}) "
+            f"SELECT {self.columns} FROM {self.staging_table}"
+        )
+        return cursor.rowcount
+
+    def merge_conflicts(self, cursor, deltas):
+        """
+        Переносит строки из временной таблицы, обновляя существующие
+        оценки только при изменении значения или соответствия.
+
+        Для добавленных строк системная колонка xmax равна нулю, что
+        позволяет отличить их от обновленных. Прежние значения
+        обновляемых оценок вычитаются из итогов витрин, значения
+        перенесенных строк прибавляются.
+        """
+        quote_name = self.connection.ops.quote_name
+        table = quote_name(Rating._meta.db_table)
+        unique_columns = [
+            quote_name(Rating._meta.get_field(name).column)
+            for name in UNIQUE_FIELDS
+        ]
+        update_columns = [
+            quote_name(Rating._meta.get_field(name).column)
+            for name in UPDATE_FIELDS
+        ]
+        assignments = ", ".join(
+            f"{column} = EXCLUDED.{column}" for column in update_columns
+        )
+        current = ", ".join(
+            f"{table}.{column}" for column in update_columns
+        )
+        excluded = ", ".join(
+            f"EXCLUDED.{column}" for column in update_columns
+        )
+        staged = ", ".join(
+            f"{self.staging_table}.{column}" for column in update_columns
+        )
+        join = " AND ".join(
+            f"{table}.{column} = {self.staging_table}.{column}"
+            for column in unique_columns
+        )
+        current_columns = ", ".join(
+            f"{table}.{quote_name(field.column)}" for field in self.fields
+        )
+        cursor.execute(
+            f"SELECT {current_columns} FROM {table} "
+            f"JOIN {self.staging_table} ON {join} "
+            f"WHERE ({current}) IS DISTINCT FROM ({staged})"
+        )
+        for row in cursor.fetchall():
+            deltas.add_rating(dict(zip(RATING_FIELDS, row)), -1)
+        cursor.execute(
+            f"INSERT INTO {table} ({self.columns}) "
+            f"SELECT {self.columns} FROM {self.staging_table} "
+            f"ON CONFLICT ({', '.join(unique_columns)}) "
+            f"DO UPDATE SET {assignments} "
+            f"WHERE ({current}) IS DISTINCT FROM ({excluded}) "
+            f"RETURNING {self.columns}, (xmax = 0)"
+        )
+        inserted = 0
+        for *row, is_inserted in cursor.fetchall():
+            deltas.add_rating(dict(zip(RATING_FIELDS, row)))
+            inserted += is_inserted
+        return inserted, cursor.rowcount - inserted
+
+    def stage(self, cursor, rows):
+        """Копирует строки во временную таблицу."""
+        data = io.StringIO()
+        writer = csv.writer(data)
+        writer.writerows(rows)
+        data.seek(0)
+        self.create_staging_table(cursor)
+        self.copy(cursor, data)
+
+    def load(self, rows):
+        deltas = RollupDeltas(self.using)
+        with transaction.atomic(using=self.using):
+            with self.connection.cursor() as cursor:
+                self.stage(cursor, rows)
+                loaded = self.merge(cursor)
+            for row in rows:
+                deltas.add_rating(dict(zip(RATING_FIELDS, row)))
+            deltas.apply()
+        return loaded
+
+    def upsert(self, rows):
+        """
+        Добавляет новые оценки и обновляет изменившиеся.
+
+        Возвращает количество добавленных, обновленных и
+        не изменившихся оценок.
+        """
+        rows = deduplicate(rows)
+        deltas = RollupDeltas(self.using)
+        with transaction.atomic(using=self.using):
+            with self.connection.cursor() as cursor:
+                self.stage(cursor, rows)
+                inserted, updated = self.merge_conflicts(cursor, deltas)
+            deltas.apply()
+        return inserted, updated, len(rows) - inserted - updated
+
+
+def get_rating_loader(using=DEFAULT_DB_ALIAS):
+    """
+    Возвращает загрузчик оценок для БД: COPY для PostgreSQL,
+    bulk_create для остальных (SQLite при DEBUG=True).
+    """
+    if connections[using].vendor == "postgresql":
+        return PostgresCopyLoader(using)
+    return BulkCreateLoader(using)
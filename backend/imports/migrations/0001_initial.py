@@ -0,0 +1,46 @@
+# Generated by Django 4.2 on 2026-10-18 05:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=500, unique=True, verbose_name='Путь к файлу')),
+                ('file_hash', models.CharField(blank=True, max_length=64, verbose_name='SHA-256 файла')),
+                ('imported_at', models.DateTimeField(auto_now=True, verbose_name='Дата последнего импорта')),
+            ],
+            options={
+                'verbose_name': 'Источник импорта',
+                'verbose_name_plural': 'Источники импорта',
+                'ordering': ('path',),
+            },
+        ),
+        migrations.CreateModel(
+            name='RowFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField(verbose_name='Хеш ключа строки')),
+                ('digest', models.BigIntegerField(verbose_name='Хеш содержимого строки')),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fingerprints', to='imports.importsource', verbose_name='Источник')),
+            ],
+            options={
+                'verbose_name': 'Отпечаток строки',
+                'verbose_name_plural': 'Отпечатки строк',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='rowfingerprint',
+            constraint=models.UniqueConstraint(fields=('source', 'key'), name='unique_source_row_key'),
+        ),
+    ]
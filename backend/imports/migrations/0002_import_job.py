@@ -0,0 +1,41 @@
+# Generated by Django 4.2 on 2026-10-18 05:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import imports.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('imports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(max_length=500, storage=imports.models.get_upload_storage, upload_to='%Y/%m/%d/', verbose_name='Файл')),
+                ('upsert', models.BooleanField(default=True, verbose_name='Обновлять существующие оценки')),
+                ('status', models.CharField(choices=[('queued', 'В очереди'), ('running', 'Выполняется'), ('succeeded', 'Завершена'), ('failed', 'Ошибка')], default='queued', max_length=9, verbose_name='Статус')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата начала')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата окончания')),
+                ('rows_read', models.PositiveIntegerField(default=0, verbose_name='Прочитано строк')),
+                ('rows_inserted', models.PositiveIntegerField(default=0, verbose_name='Добавлено строк')),
+                ('rows_updated', models.PositiveIntegerField(default=0, verbose_name='Обновлено строк')),
+                ('rows_unchanged', models.PositiveIntegerField(default=0, verbose_name='Строк без изменений')),
+                ('rows_skipped', models.PositiveIntegerField(default=0, verbose_name='Пропущено строк')),
+                ('errors', models.JSONField(blank=True, default=list, verbose_name='Ошибки')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+            ],
+            options={
+                'verbose_name': 'Задача импорта',
+                'verbose_name_plural': 'Задачи импорта',
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
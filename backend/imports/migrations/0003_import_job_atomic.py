@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 07:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imports', '0002_import_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='atomic',
+            field=models.BooleanField(default=True, verbose_name='Загружать в одной транзакции'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-18 07:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imports', '0003_import_job_atomic'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Время последнего сигнала'),
+        ),
+        migrations.AlterField(
+            model_name='importjob',
+            name='atomic',
+            field=models.BooleanField(default=False, verbose_name='Загружать в одной транзакции'),
+        ),
+    ]
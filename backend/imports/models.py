@@ -0,0 +1,186 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.utils import timezone
+
+from imports.constants import (
+    FILE_HASH_MAX_LENGTH,
+    JOB_QUEUED,
+    JOB_STATUS_CHOICES,
+    JOB_STATUS_MAX_LENGTH,
+    SOURCE_PATH_MAX_LENGTH,
+    UPLOAD_TO,
+)
+
+
+def get_upload_storage():
+    """Хранилище загруженных файлов импорта, недоступное через /media/."""
+    return FileSystemStorage(location=settings.IMPORT_UPLOAD_ROOT)
+
+
+class ImportSource(models.Model):
+    """Модель источника импорта (загруженного файла)."""
+
+    path = models.CharField(
+        max_length=SOURCE_PATH_MAX_LENGTH,
+        verbose_name="Путь к файлу",
+        unique=True,
+    )
+    file_hash = models.CharField(
+        max_length=FILE_HASH_MAX_LENGTH,
+        verbose_name="SHA-256 файла",
+        blank=True,
+    )
+    imported_at = models.DateTimeField(
+        verbose_name="Дата последнего импорта",
+        auto_now=True,
+    )
+
+    class Meta:
+        verbose_name = "Источник импорта"
+        verbose_name_plural = "Источники импорта"
+        ordering = ("path",)
+
+    def __str__(self):
+        return self.path
+
+
+class RowFingerprint(models.Model):
+    """
+    Модель отпечатка строки источника.
+
+    key - хеш ключа строки (сотрудник, навык, дата),
+    digest - хеш всего содержимого строки.
+    """
+
+    source = models.ForeignKey(
+        ImportSource,
+        on_delete=models.CASCADE,
+        verbose_name="Источник",
+        related_name="fingerprints",
+    )
+    key = models.BigIntegerField(
+        verbose_name="Хеш ключа строки",
+    )
+    digest = models.BigIntegerField(
+        verbose_name="Хеш содержимого строки",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source", "key"],
+                name="unique_source_row_key",
+            )
+        ]
+        verbose_name = "Отпечаток строки"
+        verbose_name_plural = "Отпечатки строк"
+
+    def __str__(self):
+        return f"{self.source} - {self.key}"
+
+
+class ImportJob(models.Model):
+    """
+    Модель фоновой задачи импорта загруженного файла.
+
+    Счетчики строк обновляются после каждой пачки, поэтому по задаче
+    видны прогресс и скорость импорта во время выполнения. Время
+    последнего сигнала обновляется при чтении и загрузке каждой пачки:
+    по нему находятся задачи, процесс которых остановлен.
+    """
+
+    file = models.FileField(
+        upload_to=UPLOAD_TO,
+        storage=get_upload_storage,
+        max_length=SOURCE_PATH_MAX_LENGTH,
+        verbose_name="Файл",
+    )
+    upsert = models.BooleanField(
+        default=True,
+        verbose_name="Обновлять существующие оценки",
+    )
+    atomic = models.BooleanField(
+        default=False,
+        verbose_name="Загружать в одной транзакции",
+    )
+    status = models.CharField(
+        max_length=JOB_STATUS_MAX_LENGTH,
+        choices=JOB_STATUS_CHOICES,
+        default=JOB_QUEUED,
+        verbose_name="Статус",
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name="Автор",
+        related_name="import_jobs",
+    )
+    created_at = models.DateTimeField(
+        verbose_name="Дата создания",
+        auto_now_add=True,
+    )
+    started_at = models.DateTimeField(
+        verbose_name="Дата начала",
+        null=True,
+        blank=True,
+    )
+    heartbeat_at = models.DateTimeField(
+        verbose_name="Время последнего сигнала",
+        null=True,
+        blank=True,
+    )
+    finished_at = models.DateTimeField(
+        verbose_name="Дата окончания",
+        null=True,
+        blank=True,
+    )
+    rows_read = models.PositiveIntegerField(
+        verbose_name="Прочитано строк",
+        default=0,
+    )
+    rows_inserted = models.PositiveIntegerField(
+        verbose_name="Добавлено строк",
+        default=0,
+    )
+    rows_updated = models.PositiveIntegerField(
+        verbose_name="Обновлено строк",
+        default=0,
+    )
+    rows_unchanged = models.PositiveIntegerField(
+        verbose_name="Строк без изменений",
+        default=0,
+    )
+    rows_skipped = models.PositiveIntegerField(
+        verbose_name="Пропущено строк",
+        default=0,
+    )
+    errors = models.JSONField(
+        verbose_name="Ошибки",
+        default=list,
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = "Задача импорта"
+        verbose_name_plural = "Задачи импорта"
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"{self.file.name} - {self.get_status_display()}"
+
+    @property
+    def elapsed(self):
+        """Время выполнения задачи в секундах."""
+        if self.started_at is None:
+            return None
+        finished_at = self.finished_at or timezone.now()
+        return (finished_at - self.started_at).total_seconds()
+
+    @property
+    def rows_per_second(self):
+        if not self.elapsed:
+            return None
+        return self.rows_read / self.elapsed
@@ -0,0 +1,142 @@
+from datetime import date, datetime
+
+import pandas as pd
+from django.db import transaction
+
+from analytics.snapshot import build_snapshot
+from imports.constants import (
+    DATE_COLUMN,
+    EMPLOYEE_COLUMN,
+    FIRST_NAME_COLUMN,
+    LAST_NAME_COLUMN,
+    RATING_VALUE_COLUMN,
+    REQUIRED_COLUMNS,
+    SUITABILITY_COLUMN,
+    VERBOSITY_ROWS,
+)
+from imports.loaders import get_rating_loader
+from imports.resolvers import DimensionResolver
+from imports.stats import ImportStats
+from ratings.versions import make_data_version, new_data_version
+
+
+def publish_ratings():
+    """
+    Записывает снимок оценок по новой версии данных и затем делает
+    эту версию текущей. Пока снимок записывается, процессы считают
+    чарты по прежнему снимку и прежней версии, а не загружают оценки
+    из БД из-за устаревшего снимка.
+    """
+    version = make_data_version()
+    build_snapshot(data_version=version)
+    new_data_version(version)
+
+
+def to_date(value):
+    """Приводит значение ячейки с датой к datetime.date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+class RatingImportPipeline:
+    """
+    Загрузка оценок сотрудников из последовательности пачек строк.
+
+    Справочники разрешаются для каждой пачки целиком через
+    DimensionResolver, оценки записываются в БД загрузчиком
+    (см. imports.loaders) сразу после обработки пачки. В режиме
+    upsert существующие оценки обновляются, а не дублируются. Если
+    передано хранилище отпечатков (FingerprintStore), загружаются
+    только новые и изменившиеся строки источника. Функция on_chunk
+    вызывается со статистикой импорта после каждой пачки. Сообщение
+    о каждой строке выводится только при verbosity >= 3. Витрины
+    итогов меняются загрузчиком вместе с каждой пачкой оценок, снимок
+    оценок для расчета чартов в памяти и версия данных для кэша чартов
+    меняются после фиксации транзакции импорта.
+    """
+
+    def __init__(self, stdout, style, loader=None, upsert=False,
+                 fingerprints=None, on_chunk=None, verbosity=1):
+        self.stdout = stdout
+        self.style = style
+        self.loader = loader or get_rating_loader()
+        self.upsert = upsert
+        self.fingerprints = fingerprints
+        self.on_chunk = on_chunk
+        self.verbosity = verbosity
+        self.stats = ImportStats()
+        self.resolver = DimensionResolver()
+
+    def run(self, chunks):
+        self.stats.start()
+        for chunk in chunks:
+            self.process_chunk(chunk)
+            if self.on_chunk is not None:
+                self.on_chunk(self.stats)
+        if self.fingerprints is not None:
+            self.fingerprints.finish()
+        self.stats.finish()
+        if self.stats.rows_loaded:
+            transaction.on_commit(publish_ratings)
+        return self.stats
+
+    def prepare_chunk(self, chunk):
+        """
+        Отбрасывает строки с пустыми полями или именем сотрудника
+        не в формате "Фамилия Имя" и добавляет колонки с фамилией
+        и именем.
+        """
+        names = chunk[EMPLOYEE_COLUMN].astype(str).str.split()
+        valid = (
+            chunk[list(REQUIRED_COLUMNS)].notna().all(axis=1)
+            & names.str.len().eq(2)
+        )
+        for full_name in chunk.loc[~valid, EMPLOYEE_COLUMN]:
+            self.stats.rows_skipped += 1
+            self.stdout.write(self.style.ERROR(
+                f"Некорректная строка для сотрудника {full_name}")
+            )
+        names = names[valid]
+        return chunk[valid].assign(**{
+            LAST_NAME_COLUMN: names.str[0],
+            FIRST_NAME_COLUMN: names.str[1],
+        })
+
+    def process_chunk(self, chunk):
+        self.stats.rows_read += len(chunk)
+        self.stats.chunks += 1
+        if self.fingerprints is not None:
+            changed = self.fingerprints.filter_changed(chunk)
+            self.stats.rows_unchanged += len(chunk) - len(changed)
+            chunk = changed
+        chunk = self.prepare_chunk(chunk)
+        if chunk.empty:
+            return
+        self.resolver.resolve(chunk)
+        ratings = []
+        for row in chunk.to_dict("records"):
+            ratings.append((
+                self.resolver.get_employee_id(row),
+                self.resolver.get_skill_id(row),
+                to_date(row[DATE_COLUMN]),
+                int(row[RATING_VALUE_COLUMN]),
+                row[SUITABILITY_COLUMN],
+                *self.resolver.get_denormalized(row),
+            ))
+            if self.verbosity >= VERBOSITY_ROWS:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Employee {row[LAST_NAME_COLUMN]} '
+                    f'{row[FIRST_NAME_COLUMN]} processed')
+                )
+        if self.upsert:
+            inserted, updated, unchanged = self.loader.upsert(ratings)
+            self.stats.rows_inserted += inserted
+            self.stats.rows_updated += updated
+            self.stats.rows_unchanged += unchanged
+        else:
+            self.stats.rows_inserted += self.loader.load(ratings)
+        if self.fingerprints is not None:
+            self.fingerprints.save(chunk)
@@ -0,0 +1,85 @@
+import time
+from datetime import timedelta
+
+from imports.constants import DEFAULT_PROGRESS_INTERVAL
+
+
+class ProgressReporter:
+    """
+    Периодический вывод прогресса импорта.
+
+    Вместо сообщения о каждой строке не чаще раза в interval секунд
+    выводится строка с этапом, количеством обработанных строк,
+    скоростью и, если известно общее количество строк, оставшимся
+    временем. В конце этапа прогресс выводится всегда.
+    """
+
+    def __init__(self, stdout, style, interval=DEFAULT_PROGRESS_INTERVAL,
+                 enabled=True, clock=time.monotonic):
+        self.stdout = stdout
+        self.style = style
+        self.interval = interval
+        self.enabled = enabled
+        self.clock = clock
+        self.phase = None
+        self.total = None
+        self.rows = 0
+        self.started_at = None
+        self.reported_at = None
+        self.reported_rows = None
+
+    def start_phase(self, phase, total=None):
+        self.phase = phase
+        self.total = total
+        self.rows = 0
+        self.reported_rows = None
+        self.started_at = self.reported_at = self.clock()
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.clock() - self.started_at
+        return self.rows / elapsed if elapsed else 0.0
+
+    @property
+    def eta(self):
+        """Оставшееся время этапа в секундах или None."""
+        rows_per_second = self.rows_per_second
+        if not self.total or not rows_per_second:
+            return None
+        return max(self.total - self.rows, 0) / rows_per_second
+
+    def update(self, rows):
+        """Запоминает количество обработанных строк этапа."""
+        self.rows = rows
+        if self.clock() - self.reported_at >= self.interval:
+            self.report()
+
+    def track(self, chunks):
+        """Пропускает через себя пачки строк, отмечая прогресс."""
+        for chunk in chunks:
+            yield chunk
+            self.update(self.rows + len(chunk))
+
+    def finish_phase(self):
+        # Итог этапа не повторяет только что выведенную строку
+        if self.rows != self.reported_rows:
+            self.report()
+
+    def format(self):
+        rows = f"строк: {self.rows}"
+        if self.total:
+            rows += f" из {self.total} ({self.rows / self.total:.0%})"
+        line = (
+            f"[{self.phase}] {rows}, "
+            f"скорость: {self.rows_per_second:.0f} строк/с"
+        )
+        eta = self.eta
+        if eta is not None:
+            line += f", осталось: {timedelta(seconds=round(eta))}"
+        return line
+
+    def report(self):
+        self.reported_at = self.clock()
+        self.reported_rows = self.rows
+        if self.enabled:
+            self.stdout.write(self.format())
@@ -0,0 +1,301 @@
+import csv
+import glob
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from imports.constants import (
+    CSV_DELIMITERS,
+    CSV_ENCODING,
+    CSV_FORMAT,
+    DEFAULT_CHUNK_SIZE,
+    FORMAT_EXTENSIONS,
+    FORMAT_SIGNATURES,
+    PARQUET_FORMAT,
+    REQUIRED_COLUMNS,
+    SOURCE_ATTR,
+    SOURCE_EXTENSIONS,
+    XLSX_FORMAT,
+)
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet необязателен, без pyarrow читаются xlsx и csv
+    pq = None
+
+
+def _normalize_header(values):
+    """Приводит заголовок листа к списку строковых имен колонок."""
+    return [
+        str(value).strip() if value is not None else ""
+        for value in values
+    ]
+
+
+def _with_source(chunks, source):
+    """
+    Отмечает пачки источником (файл, лист) в DataFrame.attrs, чтобы
+    проверка файла называла место ошибки (см. ImportValidator).
+    """
+    for chunk in chunks:
+        chunk.attrs[SOURCE_ATTR] = source
+        yield chunk
+
+
+def _iter_sheet_chunks(workbook, sheet, chunk_size):
+    """Построчно читает лист и отдает строки пачками DataFrame."""
+    try:
+        rows = sheet.iter_rows(values_only=True)
+        header = _normalize_header(next(rows, ()))
+        chunk = []
+        for values in rows:
+            # Пустые строки в конце листа пропускаем
+            if all(value is None for value in values):
+                continue
+            chunk.append(values)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame.from_records(chunk, columns=header)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame.from_records(chunk, columns=header)
+    finally:
+        workbook.close()
+
+
+def iter_xlsx_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE,
+                     sheet_name=None):
+    """
+    Потоковое чтение листа Excel-файла пачками по chunk_size строк.
+
+    Книга открывается в режиме read_only, поэтому в памяти одновременно
+    находится не больше одной пачки строк. Ошибки открытия файла
+    возникают сразу при вызове, а не при первой итерации.
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    sheet = workbook[sheet_name] if sheet_name else workbook.active
+    return _with_source(
+        _iter_sheet_chunks(workbook, sheet, chunk_size),
+        (file_path, sheet.title),
+    )
+
+
+def iter_csv_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Потоковое чтение CSV-файла пачками по chunk_size строк."""
+    return _with_source(
+        pd.read_csv(
+            file_path, chunksize=chunk_size, **_csv_options(file_path)
+        ),
+        (file_path, None),
+    )
+
+
+def iter_parquet_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Потоковое чтение Parquet-файла пачками по chunk_size строк.
+
+    Читаются только нужные колонки, группы строк файла
+    разбираются pyarrow без построчного обхода в Python.
+    """
+    parquet_file = _get_parquet_module().ParquetFile(file_path)
+    return _with_source(
+        (
+            batch.to_pandas()
+            for batch in parquet_file.iter_batches(
+                batch_size=chunk_size,
+                columns=list(REQUIRED_COLUMNS),
+            )
+        ),
+        (file_path, None),
+    )
+
+
+def _get_parquet_module():
+    if pq is None:
+        raise ImportError("Для чтения Parquet-файлов нужен пакет pyarrow.")
+    return pq
+
+
+def _csv_delimiter(file_path):
+    """Определяет разделитель колонок CSV-файла по строке заголовка."""
+    with open(file_path, encoding=CSV_ENCODING) as file:
+        header = file.readline()
+    try:
+        return csv.Sniffer().sniff(header, CSV_DELIMITERS).delimiter
+    except csv.Error:
+        return CSV_DELIMITERS[0]
+
+
+def _csv_options(file_path):
+    """Параметры pd.read_csv для CSV-файла."""
+    return {
+        "sep": _csv_delimiter(file_path),
+        "encoding": CSV_ENCODING,
+        "usecols": list(REQUIRED_COLUMNS),
+        "skip_blank_lines": True,
+    }
+
+
+def get_file_format(file_path):
+    """
+    Формат файла по расширению, а при незнакомом расширении -
+    по сигнатуре в начале файла. Остальные файлы считаются CSV.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    for file_format, extensions in FORMAT_EXTENSIONS.items():
+        if extension in extensions:
+            return file_format
+    with open(file_path, "rb") as file:
+        signature = file.read(max(map(len, FORMAT_SIGNATURES.values())))
+    for file_format, prefix in FORMAT_SIGNATURES.items():
+        if signature.startswith(prefix):
+            return file_format
+    return CSV_FORMAT
+
+
+def read_header(file_path):
+    """Названия колонок CSV- или Parquet-файла."""
+    if get_file_format(file_path) == PARQUET_FORMAT:
+        return _get_parquet_module().read_schema(file_path).names
+    options = _csv_options(file_path)
+    del options["usecols"]
+    return _normalize_header(
+        pd.read_csv(file_path, nrows=0, **options).columns
+    )
+
+
+def find_files(path):
+    """
+    Файлы для импорта: сам файл, все поддерживаемые файлы каталога
+    или файлы, подходящие под маску glob.
+    """
+    if os.path.isdir(path):
+        return sorted(
+            os.path.join(path, name)
+            for name in os.listdir(path)
+            if name.lower().endswith(SOURCE_EXTENSIONS)
+        )
+    if any(char in path for char in "*?["):
+        return sorted(glob.glob(path))
+    return [path] if os.path.exists(path) else []
+
+
+def find_sheets(file_path):
+    """
+    Листы книги, в заголовке которых есть все нужные колонки.
+
+    В CSV- и Parquet-файлах листов нет, для них возвращается [None],
+    если в файле есть нужные колонки.
+    """
+    if get_file_format(file_path) != XLSX_FORMAT:
+        if set(REQUIRED_COLUMNS) <= set(read_header(file_path)):
+            return [None]
+        return []
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheets = []
+        for sheet in workbook.worksheets:
+            header = _normalize_header(
+                next(sheet.iter_rows(max_row=1, values_only=True), ())
+            )
+            if set(REQUIRED_COLUMNS) <= set(header):
+                sheets.append(sheet.title)
+        return sheets
+    finally:
+        workbook.close()
+
+
+def find_sources(files):
+    """Пары (файл, лист) для импорта из списка файлов."""
+    return [
+        (file_path, sheet_name)
+        for file_path in files
+        for sheet_name in find_sheets(file_path)
+    ]
+
+
+def read_sheet(source):
+    """Читает лист (file_path, sheet_name) целиком в DataFrame."""
+    file_path, sheet_name = source
+    file_format = get_file_format(file_path)
+    if file_format == CSV_FORMAT:
+        frame = pd.read_csv(file_path, **_csv_options(file_path))
+    elif file_format == PARQUET_FORMAT:
+        frame = _get_parquet_module().read_table(
+            file_path, columns=list(REQUIRED_COLUMNS)
+        ).to_pandas()
+    else:
+        frame = pd.read_excel(
+            file_path, sheet_name=sheet_name, engine="openpyxl"
+        )
+    frame.attrs[SOURCE_ATTR] = source
+    return frame
+
+
+def iter_source_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Потоковое чтение листа (file_path, sheet_name) любого формата."""
+    file_path, sheet_name = source
+    file_format = get_file_format(file_path)
+    if file_format == CSV_FORMAT:
+        return iter_csv_chunks(file_path, chunk_size)
+    if file_format == PARQUET_FORMAT:
+        return iter_parquet_chunks(file_path, chunk_size)
+    return iter_xlsx_chunks(file_path, chunk_size, sheet_name)
+
+
+def iter_sources_chunks(sources, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Последовательное потоковое чтение нескольких листов."""
+    for source in sources:
+        yield from iter_source_chunks(source, chunk_size)
+
+
+def iter_parallel(sources, workers):
+    """
+    Читает листы в пуле процессов и отдает их в исходном порядке.
+
+    Разбор xlsx упирается в процессор, поэтому листы разбираются
+    параллельно. Одновременно в работе не больше 2 * workers листов,
+    чтобы прочитанные, но не обработанные листы не копились в памяти.
+    Процессы запускаются через spawn и не наследуют соединения с БД.
+    """
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        pending = deque()
+        for source in sources:
+            pending.append(executor.submit(read_sheet, source))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class ReadError(Exception):
+    """Ошибка чтения файла во время обработки потоковых пачек."""
+
+
+def iter_read_errors(chunks):
+    """
+    Отдает пачки ленивого чтения, заменяя ошибки чтения на ReadError,
+    чтобы их можно было отличить от ошибок проверки и записи в БД.
+    """
+    chunks = iter(chunks)
+    while True:
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            return
+        except Exception as error:
+            raise ReadError(error) from error
+        yield chunk
+
+
+def split_chunks(frames, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Разбивает поток DataFrame на пачки не длиннее chunk_size."""
+    for frame in frames:
+        for start in range(0, len(frame), chunk_size):
+            yield frame.iloc[start:start + chunk_size]
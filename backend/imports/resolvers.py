@@ -0,0 +1,223 @@
+from employees.models import Employee, Position, Team
+from imports.constants import (
+    COMPETENCE_COLUMN,
+    DOMAIN_COLUMN,
+    FIRST_NAME_COLUMN,
+    GRADE_COLUMN,
+    LAST_NAME_COLUMN,
+    LOOKUP_BATCH_SIZE,
+    POSITION_COLUMN,
+    SKILL_COLUMN,
+    TEAM_COLUMN,
+)
+from ratings.models import Competence, Domain, Skill
+
+
+def batched(values, size=LOOKUP_BATCH_SIZE):
+    """Разбивает последовательность на списки не длиннее size."""
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class DimensionResolver:
+    """
+    Множественное разрешение справочников при импорте.
+
+    Для пачки строк собирает уникальные должности, команды, домены,
+    компетенции, навыки и сотрудников, создает недостающие через
+    bulk_create и получает их id несколькими запросами на справочник.
+    Найденные id кешируются между пачками. Для навыков кешируются
+    также компетенция и домен, которые копируются в оценки.
+    """
+
+    def __init__(self):
+        self.positions = {}
+        self.teams = {}
+        self.domains = {}
+        self.competences = {}
+        self.skills = {}
+        self.skill_parents = {}
+        self.employees = {}
+
+    def resolve(self, chunk):
+        """Заполняет кеши id для всех справочников пачки."""
+        self._resolve_by_name(
+            Position,
+            self.positions,
+            {name: {} for name in chunk[POSITION_COLUMN].unique()},
+        )
+        self._resolve_by_name(
+            Team,
+            self.teams,
+            {name: {} for name in chunk[TEAM_COLUMN].unique()},
+        )
+        self._resolve_by_name(
+            Domain,
+            self.domains,
+            {name: {} for name in chunk[DOMAIN_COLUMN].unique()},
+        )
+        competences = chunk.drop_duplicates(COMPETENCE_COLUMN)
+        self._resolve_by_name(
+            Competence,
+            self.competences,
+            {
+                name: {"domain_id": self.domains[domain]}
+                for name, domain in zip(
+                    competences[COMPETENCE_COLUMN],
+                    competences[DOMAIN_COLUMN],
+                )
+            },
+        )
+        skills = chunk.drop_duplicates(SKILL_COLUMN)
+        self._resolve_by_name(
+            Skill,
+            self.skills,
+            {
+                name: {"competence_id": self.competences[competence]}
+                for name, competence in zip(
+                    skills[SKILL_COLUMN],
+                    skills[COMPETENCE_COLUMN],
+                )
+            },
+        )
+        self._resolve_skill_parents()
+        self._resolve_employees(chunk)
+
+    def employee_key(self, row):
+        """Ключ сотрудника в кеше для строки файла."""
+        return (
+            row[FIRST_NAME_COLUMN],
+            row[LAST_NAME_COLUMN],
+            row[GRADE_COLUMN],
+            self.positions[row[POSITION_COLUMN]],
+            self.teams[row[TEAM_COLUMN]],
+        )
+
+    def get_employee_id(self, row):
+        return self.employees[self.employee_key(row)]
+
+    def get_skill_id(self, row):
+        return self.skills[row[SKILL_COLUMN]]
+
+    def get_denormalized(self, row):
+        """
+        Команда, должность, грейд сотрудника и компетенция, домен
+        навыка для оценки из строки файла.
+
+        Компетенция и домен берутся из навыка в БД: существующий навык
+        может относиться не к той компетенции, что указана в строке.
+        """
+        competence_id, domain_id = self.skill_parents[self.get_skill_id(row)]
+        return (
+            self.teams[row[TEAM_COLUMN]],
+            self.positions[row[POSITION_COLUMN]],
+            row[GRADE_COLUMN],
+            competence_id,
+            domain_id,
+        )
+
+    @staticmethod
+    def _fetch_ids(model, names):
+        ids = {}
+        for names_batch in batched(names):
+            ids.update(
+                model.objects.filter(
+                    name__in=names_batch
+                ).values_list("name", "id")
+            )
+        return ids
+
+    def _resolve_by_name(self, model, cache, objects):
+        """
+        Разрешает справочник с уникальным именем.
+
+        objects - словарь {имя: поля для создания нового объекта}.
+        """
+        missing = [name for name in objects if name not in cache]
+        if not missing:
+            return
+        cache.update(self._fetch_ids(model, missing))
+        new_objects = [
+            model(name=name, **objects[name])
+            for name in missing
+            if name not in cache
+        ]
+        if new_objects:
+            model.objects.bulk_create(new_objects, ignore_conflicts=True)
+            cache.update(
+                self._fetch_ids(model, [obj.name for obj in new_objects])
+            )
+
+    def _resolve_skill_parents(self):
+        missing = [
+            skill_id for skill_id in self.skills.values()
+            if skill_id not in self.skill_parents
+        ]
+        for skill_ids in batched(missing):
+            for skill_id, *parents in Skill.objects.filter(
+                id__in=skill_ids,
+            ).values_list(
+                "id",
+                "competence_id",
+                "competence__domain_id",
+            ):
+                self.skill_parents[skill_id] = tuple(parents)
+
+    def _fetch_employee_ids(self, keys):
+        last_names = {key[1] for key in keys}
+        ids = {}
+        for last_names_batch in batched(last_names):
+            employees = Employee.objects.filter(
+                last_name__in=last_names_batch,
+            ).values_list(
+                "first_name",
+                "last_name",
+                "grade",
+                "position_id",
+                "team_id",
+                "id",
+            ).order_by(
+                "id",
+            )
+            for *key, employee_id in employees:
+                key = tuple(key)
+                if key in keys:
+                    ids.setdefault(key, employee_id)
+        return ids
+
+    def _resolve_employees(self, chunk):
+        keys = {
+            self.employee_key(row)
+            for row in chunk[[
+                FIRST_NAME_COLUMN,
+                LAST_NAME_COLUMN,
+                GRADE_COLUMN,
+                POSITION_COLUMN,
+                TEAM_COLUMN,
+            ]].drop_duplicates().to_dict("records")
+        }
+        missing = keys - self.employees.keys()
+        if not missing:
+            return
+        self.employees.update(self._fetch_employee_ids(missing))
+        missing -= self.employees.keys()
+        if not missing:
+            return
+        # bulk_create не вызывает Employee.save(), поэтому full_name
+        # заполняем явно
+        Employee.objects.bulk_create(
+            [
+                Employee(
+                    first_name=first_name,
+                    last_name=last_name,
+                    full_name=f"{last_name} {first_name}",
+                    grade=grade,
+                    position_id=position_id,
+                    team_id=team_id,
+                )
+                for first_name, last_name, grade, position_id, team_id
+                in missing
+            ],
+        )
+        self.employees.update(self._fetch_employee_ids(missing))
@@ -0,0 +1,93 @@
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def get_peak_memory_mb():
+    """Пиковый объем памяти процесса (RSS) в мегабайтах."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # На macOS ru_maxrss возвращается в байтах, на Linux - в килобайтах
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+class ImportStats:
+    """Счетчики и производительность импорта."""
+
+    def __init__(self):
+        self.rows_read = 0
+        self.rows_inserted = 0
+        self.rows_updated = 0
+        self.rows_unchanged = 0
+        self.rows_skipped = 0
+        self.chunks = 0
+        self.started_at = None
+        self.finished_at = None
+
+    def start(self):
+        self.started_at = time.monotonic()
+
+    def finish(self):
+        self.finished_at = time.monotonic()
+
+    @property
+    def rows_loaded(self):
+        return self.rows_inserted + self.rows_updated
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        finished_at = self.finished_at or time.monotonic()
+        return finished_at - self.started_at
+
+    @property
+    def rows_per_second(self):
+        if not self.elapsed:
+            return 0.0
+        return self.rows_read / self.elapsed
+
+    @property
+    def peak_memory_mb(self):
+        return get_peak_memory_mb()
+
+    def as_dict(self):
+        """Итоги импорта для структурированных логов."""
+        peak_memory = self.peak_memory_mb
+        return {
+            "rows_read": self.rows_read,
+            "rows_inserted": self.rows_inserted,
+            "rows_updated": self.rows_updated,
+            "rows_unchanged": self.rows_unchanged,
+            "rows_skipped": self.rows_skipped,
+            "chunks": self.chunks,
+            "elapsed": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "peak_memory_mb": (
+                round(peak_memory, 1) if peak_memory is not None else None
+            ),
+        }
+
+    def summary(self):
+        peak_memory = self.peak_memory_mb
+        peak_memory = (
+            f"{peak_memory:.1f} МБ" if peak_memory is not None else "н/д"
+        )
+        return (
+            f"Прочитано строк: {self.rows_read}, "
+            f"добавлено: {self.rows_inserted}, "
+            f"обновлено: {self.rows_updated}, "
+            f"без изменений: {self.rows_unchanged}, "
+            f"пропущено: {self.rows_skipped}, "
+            f"пачек: {self.chunks}. "
+            f"Время: {self.elapsed:.1f} с, "
+            f"скорость: {self.rows_per_second:.0f} строк/с, "
+            f"пиковая память: {peak_memory}"
+        )
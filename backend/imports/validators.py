@@ -0,0 +1,248 @@
+from collections import Counter, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from employees.constants import (
+    FIRST_NAME_MIN_LENGTH,
+    GRADE_CHOICES,
+    LAST_NAME_MIN_LENGTH,
+    VALID_NAME_REGEX,
+)
+from imports.constants import (
+    DATE_COLUMN,
+    EMPLOYEE_COLUMN,
+    GRADE_COLUMN,
+    RATING_VALUE_COLUMN,
+    PARQUET_FORMAT,
+    REQUIRED_COLUMNS,
+    SOURCE_ATTR,
+    SUITABILITY_COLUMN,
+    VALIDATION_REPORT_LIMIT,
+)
+from imports.fingerprints import KEY_COLUMNS, hash_columns
+from imports.readers import get_file_format
+from ratings.models import Rating
+
+# Ошибка в строке row листа sheet файла file; у CSV и Parquet нет
+# листа, у пачек без источника (см. SOURCE_ATTR) нет файла и листа
+RowError = namedtuple(
+    "RowError",
+    ("row", "column", "value", "message", "file", "sheet"),
+    defaults=(None, None),
+)
+
+GRADES = [grade for grade, _ in GRADE_CHOICES]
+SUITABILITIES = [suitability for suitability, _ in Rating.SUITABILITY_CHOICES]
+RATING_VALUES = [value for value, _ in Rating.RATING_CHOICES]
+
+
+class ImportValidator:
+    """
+    Проверка входного файла до записи в БД.
+
+    Каждая пачка проверяется целиком операциями pandas над колонками,
+    повторы ключа (сотрудник, навык, дата) ищутся по всему файлу
+    в finish(). Строки нумеруются заново на каждом листе и в каждом
+    файле, источник пачки берется из chunk.attrs[SOURCE_ATTR].
+    """
+
+    def __init__(self):
+        self.errors = []
+        self.rows = 0
+        self.missing_columns = []
+        self._key_hashes = []
+        self._row_numbers = []
+        self._chunk_sources = []
+        # Источники в порядке проверки и номер следующей строки
+        # текущего источника
+        self._sources = {}
+        self._source = None
+        self._next_row = 0
+
+    @property
+    def is_valid(self):
+        return not self.errors and not self.missing_columns
+
+    @staticmethod
+    def get_first_row(source):
+        """
+        Номер первой строки данных источника: в Parquet нет строки
+        заголовка, в CSV и на листах XLSX - первая строка.
+        """
+        if source is not None and (
+            get_file_format(source[0]) == PARQUET_FORMAT
+        ):
+            return 1
+        return 2
+
+    def get_row_numbers(self, chunk):
+        """Номера строк пачки на ее листе или в ее файле."""
+        source = chunk.attrs.get(SOURCE_ATTR)
+        if source is not None:
+            source = tuple(source)
+        if source not in self._sources:
+            self._sources[source] = len(self._sources)
+        if source != self._source or not self.rows:
+            self._source = source
+            self._next_row = self.get_first_row(source)
+        row_numbers = np.arange(len(chunk)) + self._next_row
+        self._next_row += len(chunk)
+        self.rows += len(chunk)
+        return row_numbers
+
+    def add_errors(self, chunk, mask, column, message, row_numbers):
+        file, sheet = self._source or (None, None)
+        for row, value in zip(row_numbers[mask], chunk.loc[mask, column]):
+            self.errors.append(
+                RowError(int(row), column, value, message, file, sheet)
+            )
+
+    def validate(self, chunk):
+        row_numbers = self.get_row_numbers(chunk)
+        missing = [
+            column for column in REQUIRED_COLUMNS
+            if column not in chunk.columns
+        ]
+        if missing:
+            self.missing_columns = missing
+            return
+        chunk = chunk.reset_index(drop=True)
+
+        empty = chunk[list(REQUIRED_COLUMNS)].isna()
+        for column in REQUIRED_COLUMNS:
+            self.add_errors(
+                chunk, empty[column].to_numpy(), column,
+                "пустое значение", row_numbers,
+            )
+        filled = ~empty.any(axis=1).to_numpy()
+
+        # Имена повторяются во многих строках, поэтому проверяются
+        # только уникальные значения
+        employees = chunk[EMPLOYEE_COLUMN].astype(str)
+        names = pd.Series(employees.unique())
+        parts = names.str.split()
+        names = names[parts.str.len().eq(2)]
+        two_words = employees.isin(names).to_numpy()
+        self.add_errors(
+            chunk, filled & ~two_words, EMPLOYEE_COLUMN,
+            "ожидается формат 'Фамилия Имя'", row_numbers,
+        )
+        last_names = parts[names.index].str[0]
+        first_names = parts[names.index].str[1]
+        names = names[
+            last_names.str.match(VALID_NAME_REGEX)
+            & first_names.str.match(VALID_NAME_REGEX)
+            & last_names.str.len().ge(LAST_NAME_MIN_LENGTH)
+            & first_names.str.len().ge(FIRST_NAME_MIN_LENGTH)
+        ]
+        valid_names = employees.isin(names).to_numpy()
+        self.add_errors(
+            chunk, filled & two_words & ~valid_names, EMPLOYEE_COLUMN,
+            "недопустимые символы или длина имени", row_numbers,
+        )
+
+        self.add_errors(
+            chunk, filled & ~chunk[GRADE_COLUMN].isin(GRADES).to_numpy(),
+            GRADE_COLUMN, "недопустимый грейд", row_numbers,
+        )
+        self.add_errors(
+            chunk,
+            filled & ~chunk[SUITABILITY_COLUMN].isin(SUITABILITIES)
+            .to_numpy(),
+            SUITABILITY_COLUMN, "недопустимое соответствие", row_numbers,
+        )
+        rating_values = pd.to_numeric(
+            chunk[RATING_VALUE_COLUMN], errors="coerce"
+        )
+        self.add_errors(
+            chunk, filled & ~rating_values.isin(RATING_VALUES).to_numpy(),
+            RATING_VALUE_COLUMN, "оценка должна быть целым числом от 1 до 5",
+            row_numbers,
+        )
+        dates = pd.to_datetime(chunk[DATE_COLUMN], errors="coerce")
+        self.add_errors(
+            chunk, filled & dates.isna().to_numpy(),
+            DATE_COLUMN, "некорректная дата", row_numbers,
+        )
+
+        self._key_hashes.append(hash_columns(chunk, KEY_COLUMNS).to_numpy())
+        self._row_numbers.append(row_numbers)
+        self._chunk_sources.append(self._source)
+
+    def finish(self):
+        """Ищет строки с повторяющимся ключом по всем файлам и листам."""
+        if not self._key_hashes:
+            return
+        key_hashes = np.concatenate(self._key_hashes)
+        row_numbers = np.concatenate(self._row_numbers)
+        chunk_numbers = np.repeat(
+            np.arange(len(self._row_numbers)),
+            [len(numbers) for numbers in self._row_numbers],
+        )
+        _, inverse, counts = np.unique(
+            key_hashes, return_inverse=True, return_counts=True
+        )
+        repeated = counts[inverse] > 1
+        for row, chunk_number in zip(
+            row_numbers[repeated], chunk_numbers[repeated]
+        ):
+            file, sheet = self._chunk_sources[chunk_number] or (None, None)
+            self.errors.append(RowError(
+                int(row),
+                ", ".join(KEY_COLUMNS),
+                None,
+                "повтор оценки сотрудника по навыку на дату",
+                file,
+                sheet,
+            ))
+        self._key_hashes = []
+        self._row_numbers = []
+        self._chunk_sources = []
+
+    def run(self, chunks):
+        for chunk in chunks:
+            self.validate(chunk)
+            if self.missing_columns:
+                break
+        self.finish()
+        return self
+
+    @staticmethod
+    def get_location(error):
+        """Файл, лист и строка ошибки для отчета."""
+        if error.file is None:
+            return f"Строка {error.row}"
+        if error.sheet is None:
+            return f"Файл {error.file}, строка {error.row}"
+        return f"Файл {error.file}, лист {error.sheet}, строка {error.row}"
+
+    def report(self, limit=VALIDATION_REPORT_LIMIT):
+        """Текстовый отчет об ошибках проверки."""
+        if self.missing_columns:
+            return [
+                "В файле нет колонок: " + ", ".join(self.missing_columns)
+            ]
+        lines = [
+            f"Проверено строк: {self.rows}, ошибок: {len(self.errors)}"
+        ]
+        counts = Counter(
+            (error.column, error.message) for error in self.errors
+        )
+        for (column, message), count in counts.most_common():
+            lines.append(f"  {column}: {message} - {count}")
+        errors = sorted(
+            self.errors,
+            key=lambda error: (
+                self._sources.get((error.file, error.sheet), 0), error.row
+            ),
+        )
+        for error in errors[:limit]:
+            lines.append(
+                f"{self.get_location(error)}, {error.column}: "
+                f"{error.message}"
+                + (f" ({error.value!r})" if error.value is not None else "")
+            )
+        if len(self.errors) > limit:
+            lines.append(f"... и еще {len(self.errors) - limit}")
+        return lines
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class RatingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ratings'
+
+    def ready(self):
+        # Регистрация сигналов, обновляющих денормализованные поля оценок
+        from ratings import signals  # noqa: F401
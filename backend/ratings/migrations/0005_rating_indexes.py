@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-18 05:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_alter_employee_first_name_alter_employee_last_name'),
+        ('ratings', '0004_rating_unique_employee_skill_rating_on_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['employee', 'skill', 'rating_value'], name='rating_empl_skill_value_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['suitability', 'skill', 'employee'], name='rating_suit_skill_empl_idx'),
+        ),
+        migrations.AlterField(
+            model_name='rating',
+            name='employee',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='employees.employee', verbose_name='Сотрудник'),
+        ),
+    ]
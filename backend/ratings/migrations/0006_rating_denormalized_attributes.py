@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-18 05:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0005_alter_employee_first_name_alter_employee_last_name'),
+        ('ratings', '0005_rating_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rating',
+            name='competence',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='ratings.competence', verbose_name='Компетенция навыка'),
+        ),
+        migrations.AddField(
+            model_name='rating',
+            name='domain',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='ratings.domain', verbose_name='Домен навыка'),
+        ),
+        migrations.AddField(
+            model_name='rating',
+            name='grade',
+            field=models.CharField(blank=True, choices=[('Junior', 'Джуниор'), ('Middle', 'Мидл'), ('Senior', 'Сеньор'), ('Intern', 'Cтажер'), ('Lead', 'Ведущий специалист'), ('Head', 'Руководитель')], db_index=True, editable=False, max_length=6, verbose_name='Грейд сотрудника'),
+        ),
+        migrations.AddField(
+            model_name='rating',
+            name='position',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='employees.position', verbose_name='Должность сотрудника'),
+        ),
+        migrations.AddField(
+            model_name='rating',
+            name='team',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='employees.team', verbose_name='Команда сотрудника'),
+        ),
+    ]
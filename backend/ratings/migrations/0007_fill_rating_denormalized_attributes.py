@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-18 05:35
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def fill_denormalized(apps, schema_editor):
+    """Заполняет атрибуты сотрудника и навыка в существующих оценках."""
+    Rating = apps.get_model("ratings", "Rating")
+    Employee = apps.get_model("employees", "Employee")
+    Skill = apps.get_model("ratings", "Skill")
+    employee = Employee.objects.filter(pk=OuterRef("employee_id"))
+    skill = Skill.objects.filter(pk=OuterRef("skill_id"))
+    Rating.objects.update(
+        team_id=Subquery(employee.values("team_id")[:1]),
+        position_id=Subquery(employee.values("position_id")[:1]),
+        grade=Subquery(employee.values("grade")[:1]),
+        competence_id=Subquery(skill.values("competence_id")[:1]),
+        domain_id=Subquery(skill.values("competence__domain_id")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ratings', '0006_rating_denormalized_attributes'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_denormalized, migrations.RunPython.noop),
+    ]
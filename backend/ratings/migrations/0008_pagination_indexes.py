@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 07:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ratings', '0007_fill_rating_denormalized_attributes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['employee', 'rating_date', 'id'], name='rating_empl_date_id_idx'),
+        ),
+    ]
@@ -1,11 +1,14 @@
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.models import Q
 
-from employees.models import Employee
+from employees.constants import GRADE_CHOICES, GRADE_MAX_LENGTH
+from employees.models import Employee, Position, Team
 from ratings.constants import (
     COMPETENCE_NAME_MAX_LENGTH,
     DOMAIN_NAME_MAX_LENGTH,
     SKILL_NAME_MAX_LENGTH,
 )
+from ratings.versions import bump_data_version
 
 
 class Domain(models.Model):
@@ -74,6 +77,174 @@ class Skill(models.Model):
         return self.name
 
 
+def get_rollup_deltas(using):
+    """Разница итогов витрин для изменения оценок в БД using."""
+    # rollups.models импортирует модели этого приложения
+    from rollups.deltas import RollupDeltas
+
+    return RollupDeltas(using)
+
+
+# Поля ключа уникальности оценки
+KEY_FIELDS = ("employee", "skill", "rating_date")
+# Денормализованные поля оценки и источники их значений в моделях
+# сотрудника и навыка (см. Rating.fill_denormalized)
+EMPLOYEE_FIELDS = {
+    "team_id": "team_id",
+    "position_id": "position_id",
+    "grade": "grade",
+}
+SKILL_FIELDS = {
+    "competence_id": "competence_id",
+    "domain_id": "competence__domain_id",
+}
+
+
+class RatingQuerySet(models.QuerySet):
+    """
+    Массовые операции с оценками. Итоги витрин (приложение rollups)
+    меняются на разницу в той же транзакции, что и сами оценки, версия
+    данных для кэша чартов - после ее фиксации. Денормализованные
+    атрибуты сотрудника и навыка заполняются, как в Rating.save().
+    """
+
+    def get_attributes(self, model, fields, pks):
+        """Значения fields объектов model с ключами pks по ключу."""
+        rows = model._base_manager.using(self.db).filter(
+            pk__in=pks
+        ).values_list("pk", *fields.values())
+        return {pk: dict(zip(fields, values)) for pk, *values in rows}
+
+    def fill_denormalized(self, objs):
+        """
+        Заполняет атрибуты сотрудника и навыка в оценках, где их нет,
+        двумя запросами на все оценки.
+        """
+        missing = [
+            obj for obj in objs
+            if any(
+                getattr(obj, field) in (None, "")
+                for field in (*EMPLOYEE_FIELDS, *SKILL_FIELDS)
+            )
+        ]
+        if not missing:
+            return
+        employees = self.get_attributes(
+            Employee, EMPLOYEE_FIELDS, {obj.employee_id for obj in missing}
+        )
+        skills = self.get_attributes(
+            Skill, SKILL_FIELDS, {obj.skill_id for obj in missing}
+        )
+        for obj in missing:
+            for field, value in {
+                **employees.get(obj.employee_id, {}),
+                **skills.get(obj.skill_id, {}),
+            }.items():
+                setattr(obj, field, value)
+
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False,
+                    update_conflicts=False, update_fields=None,
+                    unique_fields=None):
+        objs = list(objs)
+        self.fill_denormalized(objs)
+        deltas = get_rollup_deltas(self.db)
+        with transaction.atomic(using=self.db, savepoint=False):
+            bump_data_version(self.db)
+            if not (ignore_conflicts or update_conflicts):
+                created = super().bulk_create(objs, batch_size)
+                deltas.add_objects(created)
+                deltas.apply()
+                return created
+            # Часть оценок может уже быть в БД: их вклад заменяется
+            # вкладом тех же оценок после вставки
+            existing = self.get_existing(objs)
+            for ratings in existing:
+                deltas.add_ratings(ratings, -1)
+            created = super().bulk_create(
+                objs,
+                batch_size,
+                ignore_conflicts,
+                update_conflicts,
+                update_fields,
+                unique_fields,
+            )
+            for ratings in existing:
+                deltas.add_ratings(ratings)
+            deltas.apply()
+        return created
+
+    def get_batch_size(self, fields, objs):
+        return max(connections[self.db].ops.bulk_batch_size(fields, objs), 1)
+
+    def get_existing(self, objs):
+        """
+        Оценки с теми же ключами (сотрудник, навык, дата), что и у objs:
+        список querysets по пачкам ключей. Querysets читаются до и после
+        вставки, поэтому после вставки в них есть и новые оценки.
+
+        Оценки ищутся по точным ключам, а не по всем сочетаниям
+        сотрудников, навыков и дат objs, которых в БД может быть
+        намного больше.
+        """
+        keys = list({
+            (obj.employee_id, obj.skill_id, obj.rating_date) for obj in objs
+        })
+        ratings = self.model._base_manager.using(self.db)
+        batch_size = self.get_batch_size(KEY_FIELDS, keys)
+        return [
+            ratings.filter(Q(
+                *(
+                    Q(employee_id=employee_id, skill_id=skill_id,
+                      rating_date=rating_date)
+                    for employee_id, skill_id, rating_date
+                    in keys[start:start + batch_size]
+                ),
+                _connector=Q.OR,
+            ))
+            for start in range(0, len(keys), batch_size)
+        ]
+
+    def update(self, **kwargs):
+        # Оценка другого сотрудника или навыка получает его атрибуты
+        for name, model, fields in (
+            ("employee", Employee, EMPLOYEE_FIELDS),
+            ("skill", Skill, SKILL_FIELDS),
+        ):
+            value = kwargs.get(name, kwargs.get(f"{name}_id"))
+            if value is not None:
+                pk = getattr(value, "pk", value)
+                kwargs.update(
+                    self.get_attributes(model, fields, [pk]).get(pk, {})
+                )
+        deltas = get_rollup_deltas(self.db)
+        with transaction.atomic(using=self.db, savepoint=False):
+            # После обновления оценки могут не подходить под фильтры
+            # queryset, поэтому новые значения читаются по id
+            pks = list(self.values_list("pk", flat=True))
+            deltas.add_ratings(self, -1)
+            rows = super().update(**kwargs)
+            updated = self.model._base_manager.using(self.db)
+            batch_size = self.get_batch_size(["pk"], pks)
+            for start in range(0, len(pks), batch_size):
+                deltas.add_ratings(
+                    updated.filter(pk__in=pks[start:start + batch_size])
+                )
+            deltas.apply()
+            bump_data_version(self.db)
+        return rows
+
+    update.alters_data = True
+
+    def delete(self):
+        with transaction.atomic(using=self.db, savepoint=False):
+            get_rollup_deltas(self.db).add_ratings(self, -1).apply()
+            bump_data_version(self.db)
+            return super().delete()
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
 class Rating(models.Model):
     """Модель оценки навыков сотрудников."""
 
@@ -93,6 +264,8 @@ class Rating(models.Model):
         Employee,
         on_delete=models.CASCADE,
         verbose_name="Сотрудник",
+        # Покрывается индексом rating_empl_skill_value_idx
+        db_index=False,
     )
     skill = models.ForeignKey(
         Skill,
@@ -114,6 +287,53 @@ class Rating(models.Model):
         choices=SUITABILITY_CHOICES,
         default=NOT_REQUIRED,
     )
+    # Копии атрибутов сотрудника и навыка, чтобы фильтровать и
+    # группировать оценки без JOIN. Заполняются в save(), bulk_create(),
+    # update() и при импорте, при изменении Employee, Skill
+    # и Competence обновляются сигналами
+    # (см. ratings.signals).
+    team = models.ForeignKey(
+        Team,
+        on_delete=models.CASCADE,
+        verbose_name="Команда сотрудника",
+        related_name="+",
+        null=True,
+        editable=False,
+    )
+    position = models.ForeignKey(
+        Position,
+        on_delete=models.CASCADE,
+        verbose_name="Должность сотрудника",
+        related_name="+",
+        null=True,
+        editable=False,
+    )
+    grade = models.CharField(
+        max_length=GRADE_MAX_LENGTH,
+        verbose_name="Грейд сотрудника",
+        choices=GRADE_CHOICES,
+        blank=True,
+        db_index=True,
+        editable=False,
+    )
+    competence = models.ForeignKey(
+        Competence,
+        on_delete=models.CASCADE,
+        verbose_name="Компетенция навыка",
+        related_name="+",
+        null=True,
+        editable=False,
+    )
+    domain = models.ForeignKey(
+        Domain,
+        on_delete=models.CASCADE,
+        verbose_name="Домен навыка",
+        related_name="+",
+        null=True,
+        editable=False,
+    )
+
+    objects = RatingQuerySet.as_manager()
 
     class Meta:
         constraints = [
@@ -130,6 +350,29 @@ class Rating(models.Model):
                 )
             )
         ]
+        # Индексы под фильтры RatingFilter и запросы чартов.
+        # Фильтр по дате обслуживает уникальный индекс
+        # (rating_date, skill, employee).
+        indexes = [
+            # Фильтры по сотруднику, его команде, должности и грейду,
+            # средняя оценка по навыкам сотрудника
+            models.Index(
+                fields=["employee", "skill", "rating_value"],
+                name="rating_empl_skill_value_idx",
+            ),
+            # Количество сотрудников, подходящих по навыку (чарт 1,
+            # bus-фактор)
+            models.Index(
+                fields=["suitability", "skill", "employee"],
+                name="rating_suit_skill_empl_idx",
+            ),
+            # Списки оценок по страницам: оценки сотрудника по датам
+            # (см. api.v1.pagination)
+            models.Index(
+                fields=["employee", "rating_date", "id"],
+                name="rating_empl_date_id_idx",
+            ),
+        ]
         verbose_name = "Оценка навыков сотрудника"
         verbose_name_plural = "Оценки навыков сотрудников"
         default_related_name = "ratings"
@@ -141,3 +384,36 @@ class Rating(models.Model):
     def __str__(self):
         return (f"{self.employee.last_name} {self.employee.first_name} - "
                 f"{self.skill} '{self.rating_value}'")
+
+    def save(self, *args, **kwargs):
+        self.fill_denormalized()
+        using = kwargs.get("using") or router.db_for_write(
+            type(self), instance=self
+        )
+        deltas = get_rollup_deltas(using)
+        with transaction.atomic(using=using, savepoint=False):
+            if self.pk is not None:
+                deltas.add_ratings(
+                    type(self)._base_manager.filter(pk=self.pk), -1
+                )
+            super().save(*args, **kwargs)
+            deltas.add_objects([self])
+            deltas.apply()
+            bump_data_version(using)
+
+    def delete(self, using=None, keep_parents=False):
+        using = using or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            get_rollup_deltas(using).add_ratings(
+                type(self)._base_manager.filter(pk=self.pk), -1
+            ).apply()
+            bump_data_version(using)
+            return super().delete(using, keep_parents)
+
+    def fill_denormalized(self):
+        """Копирует в оценку атрибуты сотрудника и навыка."""
+        self.team_id = self.employee.team_id
+        self.position_id = self.employee.position_id
+        self.grade = self.employee.grade
+        self.competence_id = self.skill.competence_id
+        self.domain_id = self.skill.competence.domain_id
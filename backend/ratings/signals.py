@@ -0,0 +1,70 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from employees.models import Employee, Position, Team
+from ratings.models import Competence, Domain, Rating, Skill
+from ratings.versions import bump_data_version
+
+
+@receiver(post_save, sender=Employee)
+def update_employee_ratings(sender, instance, created, raw=False, **kwargs):
+    """Обновляет в оценках команду, должность и грейд сотрудника."""
+    if created or raw:
+        return
+    Rating.objects.filter(
+        employee=instance,
+    ).exclude(
+        team_id=instance.team_id,
+        position_id=instance.position_id,
+        grade=instance.grade,
+    ).update(
+        team_id=instance.team_id,
+        position_id=instance.position_id,
+        grade=instance.grade,
+    )
+
+
+@receiver(post_save, sender=Skill)
+def update_skill_ratings(sender, instance, created, raw=False, **kwargs):
+    """Обновляет в оценках компетенцию и домен навыка."""
+    if created or raw:
+        return
+    domain_id = instance.competence.domain_id
+    Rating.objects.filter(
+        skill=instance,
+    ).exclude(
+        competence_id=instance.competence_id,
+        domain_id=domain_id,
+    ).update(
+        competence_id=instance.competence_id,
+        domain_id=domain_id,
+    )
+
+
+@receiver(post_save, sender=Competence)
+def update_competence_ratings(sender, instance, created, raw=False,
+                              **kwargs):
+    """Обновляет в оценках домен компетенции."""
+    if created or raw:
+        return
+    Rating.objects.filter(
+        competence=instance,
+    ).exclude(
+        domain_id=instance.domain_id,
+    ).update(
+        domain_id=instance.domain_id,
+    )
+
+
+@receiver((post_save, post_delete), sender=Employee)
+@receiver((post_save, post_delete), sender=Position)
+@receiver((post_save, post_delete), sender=Team)
+@receiver((post_save, post_delete), sender=Skill)
+@receiver((post_save, post_delete), sender=Competence)
+@receiver((post_save, post_delete), sender=Domain)
+def bump_dimension_version(sender, instance, using, **kwargs):
+    """
+    Меняет версию данных для кэша чартов: в ответах чартов есть имена
+    и атрибуты объектов справочников.
+    """
+    bump_data_version(using)
@@ -0,0 +1,68 @@
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+# Ключ версии данных в кэше чартов
+DATA_VERSION_KEY = "ratings:data_version"
+
+
+def get_version_cache():
+    return caches[settings.CHART_CACHE_ALIAS]
+
+
+def is_data_version_tracked():
+    """
+    Версия данных нужна кэшу чартов (USE_CHART_CACHE), условным
+    GET-запросам (USE_CONDITIONAL_GET) и расчету чартов в памяти
+    (ANALYTICS_ENGINE_VIEWS), без них она не меняется.
+    """
+    return bool(
+        settings.USE_CHART_CACHE
+        or settings.USE_CONDITIONAL_GET
+        or settings.ANALYTICS_ENGINE_VIEWS
+    )
+
+
+def make_data_version():
+    return str(time.time_ns())
+
+
+def new_data_version(version=None):
+    """
+    Записывает новую версию данных version или, если она не задана,
+    make_data_version(). Версия - время, а не счетчик: если ключ
+    версии вытеснен из кэша, новая версия все равно не совпадет
+    с версией уже закэшированных ответов.
+    """
+    if not is_data_version_tracked():
+        return None
+    version = version or make_data_version()
+    get_version_cache().set(DATA_VERSION_KEY, version, None)
+    return version
+
+
+def get_data_version():
+    """Текущая версия оценок и справочников."""
+    cache = get_version_cache()
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, make_data_version(), None)
+        version = cache.get(DATA_VERSION_KEY)
+    return version
+
+
+def get_data_modified(version):
+    """Время записи версии данных version (UTC)."""
+    return datetime.fromtimestamp(int(version) / 10 ** 9, tz=timezone.utc)
+
+
+def bump_data_version(using=DEFAULT_DB_ALIAS):
+    """
+    Меняет версию данных после фиксации текущей транзакции: ответ,
+    посчитанный до фиксации, не попадет в кэш под новой версией.
+    """
+    if is_data_version_tracked():
+        transaction.on_commit(new_data_version, using=using)
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class RollupsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'rollups'
+    verbose_name = 'Витрины итогов оценок'
+
+    def ready(self):
+        # Регистрация сигналов, меняющих витрины при удалении сотрудников
+        from rollups import signals  # noqa: F401
@@ -0,0 +1,61 @@
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+
+from ratings.models import Rating
+from rollups.models import ROLLUP_MODELS
+
+COUNTER_FIELDS = ("rating_count", "rating_sum", "yes_count", "required_count")
+
+
+def get_counters():
+    """Агрегаты оценок для полей-счетчиков витрины."""
+    return {
+        "rating_count": Count("id"),
+        "rating_sum": Sum("rating_value"),
+        "yes_count": Count("id", filter=Q(suitability=Rating.YES)),
+        "required_count": Count(
+            "id", filter=~Q(suitability=Rating.NOT_REQUIRED)
+        ),
+    }
+
+
+def aggregate_ratings(model, ratings):
+    """Оценки, сгруппированные по измерениям витрины model."""
+    return ratings.values(
+        *model.GROUP_FIELDS
+    ).annotate(
+        **get_counters()
+    ).order_by()
+
+
+def insert_rollup(model, ratings):
+    """
+    Заполняет витрину итогами по оценкам ratings одним запросом
+    INSERT ... SELECT, без выгрузки строк в Python.
+    """
+    quote_name = connection.ops.quote_name
+    columns = ", ".join(
+        quote_name(model._meta.get_field(name).column)
+        for name in model.GROUP_FIELDS + COUNTER_FIELDS
+    )
+    sql, params = aggregate_ratings(model, ratings).query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote_name(model._meta.db_table)} ({columns}) "
+            f"{sql}",
+            params,
+        )
+
+
+def refresh_rollups():
+    """
+    Строит витрины заново по всем оценкам.
+
+    При изменении оценок витрины меняются на разницу (см.
+    rollups.deltas), полный пересчет нужен только для проверки
+    или восстановления витрин.
+    """
+    with transaction.atomic():
+        for model in ROLLUP_MODELS:
+            model.objects.all().delete()
+            insert_rollup(model, Rating.objects.all())
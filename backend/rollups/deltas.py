@@ -0,0 +1,153 @@
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from ratings.models import Rating
+from rollups.builders import COUNTER_FIELDS, aggregate_ratings
+from rollups.models import ROLLUP_MODELS
+
+# Поля оценки, от которых зависят итоги витрин
+RATING_FIELDS = tuple(
+    dict.fromkeys(
+        field
+        for model in ROLLUP_MODELS
+        for field in model.GROUP_FIELDS
+    )
+) + ("rating_value", "suitability")
+
+
+def get_rating_values(rating):
+    """Значения полей оценки, от которых зависят итоги витрин."""
+    return {
+        field: getattr(rating, Rating._meta.get_field(field).attname)
+        for field in RATING_FIELDS
+    }
+
+
+def get_rating_counters(rating):
+    """Вклад оценки в счетчики ячейки витрины."""
+    return (
+        1,
+        rating["rating_value"],
+        int(rating["suitability"] == Rating.YES),
+        int(rating["suitability"] != Rating.NOT_REQUIRED),
+    )
+
+
+class RollupDeltas:
+    """
+    Разница итогов витрин, накопленная по ячейкам.
+
+    Вклады оценок прибавляются (sign=1) или вычитаются (sign=-1),
+    вклады с одинаковым ключом ячейки складываются. apply() меняет
+    каждую ячейку на накопленную разницу запросом
+    INSERT ... ON CONFLICT DO UPDATE в текущей транзакции, поэтому
+    итоги меняются вместе с оценками без пересчета по всем оценкам.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self.cells = {model: {} for model in ROLLUP_MODELS}
+
+    def add_cell(self, model, values, counters, sign):
+        key = tuple(values[field] for field in model.KEY_FIELDS)
+        cell = self.cells[model].get(key)
+        if cell is None:
+            cell = self.cells[model][key] = [None, [0] * len(COUNTER_FIELDS)]
+        if cell[0] is None or sign > 0:
+            # Измерения ячейки берутся из прибавленных оценок: при
+            # переносе оценок ячейка с тем же ключом получает новые
+            # компетенцию, домен или команду сотрудника
+            cell[0] = {field: values[field] for field in model.GROUP_FIELDS}
+        cell[1] = [
+            total + sign * counter
+            for total, counter in zip(cell[1], counters)
+        ]
+
+    def add_rating(self, rating, sign=1):
+        """Добавляет вклад оценки - словаря значений RATING_FIELDS."""
+        counters = get_rating_counters(rating)
+        for model in self.cells:
+            self.add_cell(model, rating, counters, sign)
+        return self
+
+    def add_objects(self, ratings, sign=1):
+        """Добавляет вклады экземпляров Rating."""
+        for rating in ratings:
+            self.add_rating(get_rating_values(rating), sign)
+        return self
+
+    def add_ratings(self, ratings, sign=1):
+        """Добавляет вклады оценок queryset, сгруппированные в БД."""
+        for model in self.cells:
+            for row in aggregate_ratings(model, ratings.using(self.using)):
+                self.add_cell(
+                    model,
+                    row,
+                    [row[field] for field in COUNTER_FIELDS],
+                    sign,
+                )
+        return self
+
+    def upsert(self, model, cells):
+        connection = connections[self.using]
+        quote_name = connection.ops.quote_name
+        table = quote_name(model._meta.db_table)
+        fields = [
+            model._meta.get_field(name)
+            for name in model.GROUP_FIELDS + COUNTER_FIELDS
+        ]
+        columns = [quote_name(field.column) for field in fields]
+        key_columns = [
+            quote_name(model._meta.get_field(name).column)
+            for name in model.KEY_FIELDS
+        ]
+        assignments = [
+            f"{column} = EXCLUDED.{column}"
+            for column in columns[:len(model.GROUP_FIELDS)]
+            if column not in key_columns
+        ] + [
+            f"{column} = {table}.{column} + EXCLUDED.{column}"
+            for column in columns[len(model.GROUP_FIELDS):]
+        ]
+        batch_size = connection.ops.bulk_batch_size(fields, cells)
+        placeholders = f"({', '.join(['%s'] * len(fields))})"
+        with connection.cursor() as cursor:
+            for start in range(0, len(cells), batch_size):
+                batch = cells[start:start + batch_size]
+                params = []
+                for values, counters in batch:
+                    params.extend(
+                        values[name] for name in model.GROUP_FIELDS
+                    )
+                    params.extend(counters)
+                cursor.execute(
+                    f"INSERT INTO {table} ({', '.join(columns)}) "
+                    f"VALUES {', '.join([placeholders] * len(batch))} "
+                    f"ON CONFLICT ({', '.join(key_columns)}) "
+                    f"DO UPDATE SET {', '.join(assignments)}",
+                    params,
+                )
+
+    def delete_empty(self, model, keys):
+        """Удаляет ячейки без оценок среди ячеек с ключами keys."""
+        lookups = {
+            f"{field}__in": {key[index] for key in keys}
+            for index, field in enumerate(model.KEY_FIELDS)
+        }
+        model.objects.using(self.using).filter(
+            rating_count=0, **lookups
+        ).delete()
+
+    def apply(self):
+        """Меняет ячейки витрин на накопленную разницу."""
+        with transaction.atomic(using=self.using):
+            for model, cells in self.cells.items():
+                if not cells:
+                    continue
+                self.upsert(model, list(cells.values()))
+                emptied = [
+                    key for key, (_, counters) in cells.items()
+                    if counters[0] <= 0
+                ]
+                if emptied:
+                    self.delete_empty(model, emptied)
+        self.cells = {model: {} for model in ROLLUP_MODELS}
@@ -0,0 +1,67 @@
+# Generated by Django 4.2 on 2026-10-18 05:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('ratings', '0007_fill_rating_denormalized_attributes'),
+        ('employees', '0005_alter_employee_first_name_alter_employee_last_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillDateRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grade', models.CharField(blank=True, choices=[('Junior', 'Джуниор'), ('Middle', 'Мидл'), ('Senior', 'Сеньор'), ('Intern', 'Cтажер'), ('Lead', 'Ведущий специалист'), ('Head', 'Руководитель')], db_index=True, max_length=6, verbose_name='Грейд сотрудника')),
+                ('rating_count', models.PositiveIntegerField(default=0, verbose_name='Количество оценок')),
+                ('rating_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('yes_count', models.PositiveIntegerField(default=0, verbose_name="Количество оценок с соответствием 'да'")),
+                ('required_count', models.PositiveIntegerField(default=0, verbose_name='Количество оценок, где навык требуется')),
+                ('rating_date', models.DateField(verbose_name='Дата оценки')),
+                ('competence', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='ratings.competence', verbose_name='Компетенция навыка')),
+                ('domain', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='ratings.domain', verbose_name='Домен навыка')),
+                ('position', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='employees.position', verbose_name='Должность сотрудника')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='ratings.skill', verbose_name='Навык')),
+                ('team', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='employees.team', verbose_name='Команда сотрудника')),
+            ],
+            options={
+                'verbose_name': 'Итоги оценок по навыку на дату',
+                'verbose_name_plural': 'Итоги оценок по навыкам на даты',
+            },
+        ),
+        migrations.CreateModel(
+            name='EmployeeSkillRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grade', models.CharField(blank=True, choices=[('Junior', 'Джуниор'), ('Middle', 'Мидл'), ('Senior', 'Сеньор'), ('Intern', 'Cтажер'), ('Lead', 'Ведущий специалист'), ('Head', 'Руководитель')], db_index=True, max_length=6, verbose_name='Грейд сотрудника')),
+                ('rating_count', models.PositiveIntegerField(default=0, verbose_name='Количество оценок')),
+                ('rating_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('yes_count', models.PositiveIntegerField(default=0, verbose_name="Количество оценок с соответствием 'да'")),
+                ('required_count', models.PositiveIntegerField(default=0, verbose_name='Количество оценок, где навык требуется')),
+                ('competence', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='ratings.competence', verbose_name='Компетенция навыка')),
+                ('domain', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='ratings.domain', verbose_name='Домен навыка')),
+                ('employee', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='employees.employee', verbose_name='Сотрудник')),
+                ('position', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='employees.position', verbose_name='Должность сотрудника')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='ratings.skill', verbose_name='Навык')),
+                ('team', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='employees.team', verbose_name='Команда сотрудника')),
+            ],
+            options={
+                'verbose_name': 'Итоги оценок сотрудника по навыку',
+                'verbose_name_plural': 'Итоги оценок сотрудников по навыкам',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='skilldaterollup',
+            constraint=models.UniqueConstraint(fields=('rating_date', 'skill', 'team', 'position', 'grade'), name='unique_skill_date_rollup'),
+        ),
+        migrations.AddConstraint(
+            model_name='employeeskillrollup',
+            constraint=models.UniqueConstraint(fields=('employee', 'skill'), name='unique_employee_skill_rollup'),
+        ),
+    ]
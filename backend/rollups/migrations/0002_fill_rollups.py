@@ -0,0 +1,54 @@
+# Generated by Django 4.2 on 2026-10-18 05:50
+
+from django.db import migrations
+from django.db.models import Count, Q, Sum
+
+ROLLUP_GROUP_FIELDS = {
+    "EmployeeSkillRollup": (
+        "employee", "skill", "team", "position", "grade", "competence",
+        "domain",
+    ),
+    "SkillDateRollup": (
+        "rating_date", "skill", "team", "position", "grade", "competence",
+        "domain",
+    ),
+}
+COUNTERS = {
+    "rating_count": Count("id"),
+    "rating_sum": Sum("rating_value"),
+    "yes_count": Count("id", filter=Q(suitability="да")),
+    "required_count": Count("id", filter=~Q(suitability="не требуется")),
+}
+
+
+def fill_rollups(apps, schema_editor):
+    """Строит витрины по существующим оценкам."""
+    Rating = apps.get_model("ratings", "Rating")
+    quote_name = schema_editor.connection.ops.quote_name
+    for model_name, group_fields in ROLLUP_GROUP_FIELDS.items():
+        model = apps.get_model("rollups", model_name)
+        columns = ", ".join(
+            quote_name(model._meta.get_field(name).column)
+            for name in group_fields + tuple(COUNTERS)
+        )
+        sql, params = Rating.objects.values(
+            *group_fields
+        ).annotate(
+            **COUNTERS
+        ).order_by().query.sql_with_params()
+        schema_editor.execute(
+            f"INSERT INTO {quote_name(model._meta.db_table)} ({columns}) "
+            f"{sql}",
+            params,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rollups', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2 on 2026-10-18 05:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rollups', '0002_fill_rollups'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='employeeskillrollup',
+            name='rating_count',
+            field=models.IntegerField(default=0, verbose_name='Количество оценок'),
+        ),
+        migrations.AlterField(
+            model_name='employeeskillrollup',
+            name='rating_sum',
+            field=models.IntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.AlterField(
+            model_name='employeeskillrollup',
+            name='required_count',
+            field=models.IntegerField(default=0, verbose_name='Количество оценок, где навык требуется'),
+        ),
+        migrations.AlterField(
+            model_name='employeeskillrollup',
+            name='yes_count',
+            field=models.IntegerField(default=0, verbose_name="Количество оценок с соответствием 'да'"),
+        ),
+        migrations.AlterField(
+            model_name='skilldaterollup',
+            name='rating_count',
+            field=models.IntegerField(default=0, verbose_name='Количество оценок'),
+        ),
+        migrations.AlterField(
+            model_name='skilldaterollup',
+            name='rating_sum',
+            field=models.IntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.AlterField(
+            model_name='skilldaterollup',
+            name='required_count',
+            field=models.IntegerField(default=0, verbose_name='Количество оценок, где навык требуется'),
+        ),
+        migrations.AlterField(
+            model_name='skilldaterollup',
+            name='yes_count',
+            field=models.IntegerField(default=0, verbose_name="Количество оценок с соответствием 'да'"),
+        ),
+    ]
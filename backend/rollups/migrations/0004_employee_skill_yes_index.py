@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-18 07:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rollups', '0003_signed_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employeeskillrollup',
+            index=models.Index(condition=models.Q(('yes_count__gt', 0)), fields=['skill', 'employee'], name='empl_skill_rollup_yes_idx'),
+        ),
+    ]
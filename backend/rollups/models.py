@@ -0,0 +1,170 @@
+from django.db import models
+
+from employees.constants import GRADE_CHOICES, GRADE_MAX_LENGTH
+from employees.models import Employee, Position, Team
+from ratings.models import Competence, Domain, Skill
+
+
+class RatingRollup(models.Model):
+    """
+    Общие поля витрин с итогами оценок.
+
+    Кроме измерений группировки витрина хранит количество и сумму
+    оценок, количество оценок "да" и оценок, где навык требуется,
+    поэтому средние и доли считаются без чтения самих оценок.
+    Счетчики меняются на разницу при изменении оценок (см.
+    rollups.deltas), поэтому они знаковые: разница бывает
+    отрицательной.
+    """
+
+    # Группировка, по которой витрина строится из оценок
+    GROUP_FIELDS = ()
+    # Параметры RatingFilter, которые можно применить к витрине
+    FILTER_FIELDS = ()
+    # Поля ограничения уникальности ячейки витрины
+    KEY_FIELDS = ()
+
+    skill = models.ForeignKey(
+        Skill,
+        on_delete=models.CASCADE,
+        verbose_name="Навык",
+        related_name="+",
+    )
+    team = models.ForeignKey(
+        Team,
+        on_delete=models.CASCADE,
+        verbose_name="Команда сотрудника",
+        related_name="+",
+        null=True,
+    )
+    position = models.ForeignKey(
+        Position,
+        on_delete=models.CASCADE,
+        verbose_name="Должность сотрудника",
+        related_name="+",
+        null=True,
+    )
+    grade = models.CharField(
+        max_length=GRADE_MAX_LENGTH,
+        verbose_name="Грейд сотрудника",
+        choices=GRADE_CHOICES,
+        blank=True,
+        db_index=True,
+    )
+    competence = models.ForeignKey(
+        Competence,
+        on_delete=models.CASCADE,
+        verbose_name="Компетенция навыка",
+        related_name="+",
+        null=True,
+    )
+    domain = models.ForeignKey(
+        Domain,
+        on_delete=models.CASCADE,
+        verbose_name="Домен навыка",
+        related_name="+",
+        null=True,
+    )
+    rating_count = models.IntegerField(
+        verbose_name="Количество оценок",
+        default=0,
+    )
+    rating_sum = models.IntegerField(
+        verbose_name="Сумма оценок",
+        default=0,
+    )
+    yes_count = models.IntegerField(
+        verbose_name="Количество оценок с соответствием 'да'",
+        default=0,
+    )
+    required_count = models.IntegerField(
+        verbose_name="Количество оценок, где навык требуется",
+        default=0,
+    )
+
+    class Meta:
+        abstract = True
+
+
+class EmployeeSkillRollup(RatingRollup):
+    """Итоги оценок сотрудника по навыку за все даты."""
+
+    GROUP_FIELDS = (
+        "employee", "skill", "team", "position", "grade", "competence",
+        "domain",
+    )
+    FILTER_FIELDS = (
+        "team", "grade", "position", "skill", "employee", "competence",
+        "domain",
+    )
+    KEY_FIELDS = ("employee", "skill")
+
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        verbose_name="Сотрудник",
+        related_name="+",
+        # Покрывается ограничением unique_employee_skill_rollup
+        db_index=False,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["employee", "skill"],
+                name="unique_employee_skill_rollup",
+            ),
+        ]
+        indexes = [
+            # Bus-фактор: сотрудники навыка с соответствием "да"
+            models.Index(
+                fields=["skill", "employee"],
+                condition=models.Q(yes_count__gt=0),
+                name="empl_skill_rollup_yes_idx",
+            ),
+        ]
+        verbose_name = "Итоги оценок сотрудника по навыку"
+        verbose_name_plural = "Итоги оценок сотрудников по навыкам"
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.skill_id}"
+
+
+class SkillDateRollup(RatingRollup):
+    """
+    Итоги оценок по навыку на дату в разрезе команды, должности
+    и грейда сотрудников.
+    """
+
+    GROUP_FIELDS = (
+        "rating_date", "skill", "team", "position", "grade", "competence",
+        "domain",
+    )
+    FILTER_FIELDS = (
+        "team", "grade", "position", "skill", "competence", "domain",
+        "start_date", "end_date",
+    )
+    KEY_FIELDS = ("rating_date", "skill", "team", "position", "grade")
+
+    rating_date = models.DateField(
+        verbose_name="Дата оценки",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["rating_date", "skill", "team", "position", "grade"],
+                name="unique_skill_date_rollup",
+            ),
+        ]
+        verbose_name = "Итоги оценок по навыку на дату"
+        verbose_name_plural = "Итоги оценок по навыкам на даты"
+
+    def __str__(self):
+        return f"{self.rating_date} - {self.skill_id}"
+
+
+# Витрины в порядке предпочтения: итогов на даты обычно меньше, чем
+# итогов сотрудников, так как сотрудники с одинаковыми командой,
+# должностью и грейдом попадают в одну строку
+ROLLUP_MODELS = (SkillDateRollup, EmployeeSkillRollup)
@@ -0,0 +1,18 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from employees.models import Employee
+from ratings.models import Rating
+from rollups.deltas import RollupDeltas
+
+# Изменения оценок, в том числе обновление копий атрибутов сотрудника
+# и навыка из ratings.signals, меняют витрины через RatingQuerySet.
+# Остается каскадное удаление оценок, которое идет мимо него.
+
+
+@receiver(pre_delete, sender=Employee)
+def delete_employee_rollups(sender, instance, using, **kwargs):
+    """Вычитает из итогов на даты оценки удаляемого сотрудника."""
+    RollupDeltas(using).add_ratings(
+        Rating.objects.filter(employee=instance), -1
+    ).apply()
@@ -0,0 +1,214 @@
+#           План тестирования снимков оценок
+#    1) Проверка записи и открытия снимка: колонки оценок
+#       отображаются в память только для чтения
+#    2) Проверка расчета чартов по снимку без запросов к БД
+#    3) Проверка перехода процесса на новый снимок и удаления
+#       старых снимков
+#    4) Проверка, что более старый снимок не заменяет текущий
+#    5) Проверка записи снимка после импорта
+#    6) Проверка, что снимок по прежней версии данных не используется,
+#       а загруженные из БД оценки записываются в новый снимок
+#    7) Проверка, что снимок по новой версии данных записывает один
+#       процесс, а остальные открывают записанный снимок
+
+import shutil
+import tempfile
+import threading
+from datetime import date
+from io import StringIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from django.core.management.color import no_style
+from django.test import override_settings
+from model_bakery import baker
+from rest_framework.test import APITestCase
+
+from analytics.dataset import DIMENSIONS, RATING_COLUMNS, RatingDataset
+from analytics.engine import get_engine, reset_engine
+from analytics.snapshot import (
+    CURRENT_FILE,
+    LOCK_FILE,
+    build_snapshot,
+    open_snapshot,
+    read_data_version,
+    read_version,
+    save_snapshot,
+    snapshot_lock,
+    write_snapshot,
+)
+from imports.constants import REQUIRED_COLUMNS
+from imports.pipeline import RatingImportPipeline
+from ratings.models import Rating
+from ratings.versions import get_data_version
+from tests.tests_imports.tests_pipeline import ROWS
+from tests.tests_views.tests_chart_cache import CHART_CACHES
+from tests.tests_views.tests_engine_views import get_items
+from tests.tests_views.tests_rollup_views import ChartDataMixin
+
+
+class TestSnapshot(ChartDataMixin, APITestCase):
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings = override_settings(
+            ANALYTICS_SNAPSHOT_DIR=str(self.directory)
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        reset_engine()
+        self.addCleanup(reset_engine)
+
+    def test_write_and_open(self):
+        """Проверяет запись и открытие снимка."""
+        dataset = RatingDataset.load()
+        self.assertTrue(write_snapshot(dataset, self.directory, "1"))
+        self.assertEqual(read_version(self.directory), "1")
+        snapshot = open_snapshot(self.directory, "1")
+        for name in RATING_COLUMNS:
+            with self.subTest(column=name):
+                column = getattr(snapshot, name)
+                self.assertIsInstance(column, np.memmap)
+                self.assertFalse(column.flags.writeable)
+                np.testing.assert_array_equal(column, getattr(dataset, name))
+        for name in DIMENSIONS:
+            with self.subTest(dimension=name):
+                expected = getattr(dataset, name)
+                dimension = getattr(snapshot, name)
+                self.assertEqual(dimension.columns, expected.columns)
+                for field in ("ids", "names") + expected.columns:
+                    np.testing.assert_array_equal(
+                        getattr(dimension, field), getattr(expected, field)
+                    )
+        self.assertEqual(snapshot.grades.tolist(), dataset.grades.tolist())
+        self.assertEqual(snapshot.dates.tolist(), dataset.dates.tolist())
+
+    def test_snapshot_responses(self):
+        """
+        Проверяет, что чарты считаются по снимку без запросов к БД
+        и совпадают с ответами, посчитанными запросами к БД.
+        """
+        build_snapshot()
+        for url, filters in self.urls:
+            with self.subTest(url=url, filters=filters):
+                with override_settings(ANALYTICS_ENGINE_VIEWS=["*"]):
+                    with self.assertNumQueries(0):
+                        response = self.client.get(url, filters)
+                with override_settings(USE_ROLLUPS=False):
+                    expected = self.client.get(url, filters)
+                self.assertEqual(
+                    get_items(response.data), get_items(expected.data)
+                )
+
+    def test_version_swap(self):
+        """
+        Проверяет переход на новый снимок и удаление старых снимков.
+        """
+        first = build_snapshot()
+        engine = get_engine()
+        self.assertIs(get_engine(), engine)
+        baker.make(
+            "ratings.Rating",
+            employee=self.employee,
+            skill=self.skill,
+            rating_date=date(2024, 3, 1),
+        )
+        second = build_snapshot()
+        new_engine = get_engine()
+        self.assertIsNot(new_engine, engine)
+        self.assertEqual(len(new_engine.dataset), len(engine.dataset) + 1)
+        third = build_snapshot()
+        self.assertEqual(
+            sorted(path.name for path in self.directory.iterdir()),
+            sorted([CURRENT_FILE, LOCK_FILE, second, third]),
+        )
+        self.assertLess(first, second)
+        # Колонки удаленного снимка остаются доступны открывшему его
+        # процессу
+        self.assertGreater(int(engine.dataset.value.sum()), 0)
+
+    def test_stale_snapshot(self):
+        """Проверяет, что более старый снимок не заменяет текущий."""
+        dataset = RatingDataset.load()
+        self.assertTrue(write_snapshot(dataset, self.directory, "2"))
+        self.assertFalse(write_snapshot(dataset, self.directory, "1"))
+        self.assertEqual(read_version(self.directory), "2")
+        self.assertFalse((self.directory / "1").exists())
+
+    def test_import(self):
+        """Проверяет запись снимка после импорта."""
+        pipeline = RatingImportPipeline(StringIO(), no_style())
+        with self.captureOnCommitCallbacks(execute=True):
+            pipeline.run(
+                [pd.DataFrame.from_records(ROWS, columns=REQUIRED_COLUMNS)]
+            )
+        version = read_version(self.directory)
+        self.assertIsNotNone(version)
+        self.assertEqual(
+            len(open_snapshot(self.directory, version)),
+            len(RatingDataset.load()),
+        )
+
+    @override_settings(ANALYTICS_ENGINE_VIEWS=["*"], CACHES=CHART_CACHES)
+    def test_data_version(self):
+        """
+        Проверяет, что снимок по прежней версии данных не используется,
+        а загруженные из БД оценки записываются в новый снимок.
+        """
+        first = build_snapshot()
+        engine = get_engine()
+        self.assertEqual(engine.data_version, get_data_version())
+        with self.captureOnCommitCallbacks(execute=True):
+            baker.make(
+                "ratings.Rating",
+                employee=self.employee,
+                skill=self.skill,
+                rating_date=date(2024, 3, 1),
+            )
+        new_engine = get_engine()
+        self.assertEqual(len(new_engine.dataset), Rating.objects.count())
+        self.assertEqual(new_engine.data_version, get_data_version())
+        # Записавший снимок процесс тоже отображает его в память
+        self.assertIsInstance(new_engine.dataset.value, np.memmap)
+        version = read_version(self.directory)
+        self.assertGreater(version, first)
+        self.assertEqual(
+            read_data_version(self.directory, version), get_data_version()
+        )
+        # Другой процесс открывает новый снимок без запросов к БД
+        reset_engine()
+        with self.assertNumQueries(0):
+            engine = get_engine()
+        self.assertEqual(len(engine.dataset), len(new_engine.dataset))
+
+    @override_settings(ANALYTICS_ENGINE_VIEWS=["*"], CACHES=CHART_CACHES)
+    def test_rebuild_lock(self):
+        """
+        Проверяет, что процесс, ждущий блокировку снимка, открывает
+        снимок, записанный другим процессом, а не читает оценки из БД.
+        """
+        build_snapshot()
+        get_engine()
+        with self.captureOnCommitCallbacks(execute=True):
+            baker.make(
+                "ratings.Rating",
+                employee=self.employee,
+                skill=self.skill,
+                rating_date=date(2024, 3, 1),
+            )
+        engines = []
+        thread = threading.Thread(
+            target=lambda: engines.append(get_engine())
+        )
+        # Другой процесс записывает снимок по новой версии данных
+        with snapshot_lock(self.directory):
+            thread.start()
+            thread.join(0.2)
+            self.assertTrue(thread.is_alive())
+            version = save_snapshot(self.directory, get_data_version())
+        thread.join(5)
+        self.assertEqual(read_version(self.directory), version)
+        self.assertEqual(len(engines[0].dataset), Rating.objects.count())
+        self.assertEqual(engines[0].data_version, get_data_version())
@@ -0,0 +1,91 @@
+#           План тестирования импорта CSV- и Parquet-файлов
+#    1) Проверка определения формата по расширению и сигнатуре
+#    2) Проверка чтения CSV с разделителем ';' и BOM
+#    3) Проверка чтения Parquet целиком и пачками
+#    4) Проверка импорта CSV-файла командой
+
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+
+import pandas as pd
+from django.core.management import call_command
+from django.test import TestCase
+
+from imports.constants import (
+    CSV_ENCODING,
+    CSV_FORMAT,
+    PARQUET_FORMAT,
+    REQUIRED_COLUMNS,
+    XLSX_FORMAT,
+)
+from imports.readers import (
+    find_sources,
+    get_file_format,
+    iter_source_chunks,
+    pq,
+    read_sheet
+)
+from ratings.models import Rating
+from tests.tests_imports.tests_pipeline import ROWS, make_workbook
+
+
+class TestColumnarFormats(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.frame = pd.DataFrame(ROWS, columns=REQUIRED_COLUMNS)
+        # Лишние колонки выгрузки не читаются
+        self.frame["комментарий"] = "text"
+
+    def make_file(self, name):
+        file_path = os.path.join(self.directory, name)
+        if name.endswith(".parquet"):
+            self.frame.to_parquet(file_path, index=False)
+        else:
+            self.frame.to_csv(
+                file_path, sep=";", index=False, encoding=CSV_ENCODING
+            )
+        return file_path
+
+    def test_file_format(self):
+        self.assertEqual(get_file_format("ratings.CSV"), CSV_FORMAT)
+        self.assertEqual(get_file_format(make_workbook(ROWS)), XLSX_FORMAT)
+        self.assertEqual(
+            get_file_format(self.make_file("ratings.txt")), CSV_FORMAT
+        )
+
+    def test_csv(self):
+        file_path = self.make_file("ratings.csv")
+        sources = find_sources([file_path])
+        self.assertEqual(sources, [(file_path, None)])
+        frame = read_sheet(sources[0])
+        self.assertEqual(tuple(frame.columns), REQUIRED_COLUMNS)
+        self.assertEqual(len(frame), len(ROWS))
+        chunks = list(iter_source_chunks(sources[0], chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+
+    @unittest.skipUnless(pq, "Для Parquet нужен pyarrow")
+    def test_parquet(self):
+        file_path = self.make_file("ratings.parquet")
+        signature_path = os.path.join(self.directory, "ratings.bin")
+        shutil.copy(file_path, signature_path)
+        self.assertEqual(get_file_format(signature_path), PARQUET_FORMAT)
+        frame = read_sheet((file_path, None))
+        self.assertEqual(tuple(frame.columns), REQUIRED_COLUMNS)
+        self.assertEqual(len(frame), len(ROWS))
+        chunks = list(iter_source_chunks((file_path, None), chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+
+    def test_missing_columns(self):
+        self.frame = self.frame.drop(columns=[REQUIRED_COLUMNS[0]])
+        self.assertEqual(find_sources([self.make_file("ratings.csv")]), [])
+
+    def test_import_csv(self):
+        file_path = self.make_file("ratings.csv")
+        for options in ((), ("--stream", "--upsert")):
+            call_command("import_xlsx", file_path, *options, stdout=StringIO())
+        self.assertEqual(Rating.objects.count(), len(ROWS))
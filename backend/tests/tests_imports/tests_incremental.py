@@ -0,0 +1,74 @@
+#           План тестирования инкрементального импорта
+#    1) Проверка, что неизменный файл повторно не загружается
+#    2) Проверка загрузки только изменившихся строк
+#    3) Проверка импорта файла по пути из аргумента команды
+
+import os
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.color import no_style
+from django.test import TestCase
+
+from imports.fingerprints import FingerprintStore
+from imports.models import ImportSource, RowFingerprint
+from imports.pipeline import RatingImportPipeline
+from imports.readers import iter_xlsx_chunks
+from ratings.models import Rating
+from tests.tests_imports.tests_pipeline import ROWS, make_workbook
+
+
+class TestIncrementalImport(TestCase):
+
+    def setUp(self):
+        self.file_path = make_workbook(ROWS)
+        self.addCleanup(os.remove, self.file_path)
+
+    def run_incremental(self, file_path):
+        pipeline = RatingImportPipeline(
+            StringIO(),
+            no_style(),
+            upsert=True,
+            fingerprints=FingerprintStore(file_path),
+        )
+        return pipeline.run(iter_xlsx_chunks(file_path))
+
+    def test_unchanged_file(self):
+        """Проверяет, что хеш загруженного файла запоминается."""
+        self.assertFalse(FingerprintStore(self.file_path).is_unchanged)
+        self.run_incremental(self.file_path)
+        self.assertTrue(FingerprintStore(self.file_path).is_unchanged)
+        self.assertEqual(RowFingerprint.objects.count(), len(ROWS))
+
+    def test_changed_rows(self):
+        """Проверяет, что загружаются только изменившиеся строки."""
+        self.run_incremental(self.file_path)
+        changed_row = ROWS[1][:8] + (1, "нет")
+        with open(make_workbook([ROWS[0], changed_row, ROWS[2]]), "rb") as f:
+            changed_file = f.read()
+        with open(self.file_path, "wb") as f:
+            f.write(changed_file)
+        stats = self.run_incremental(self.file_path)
+        self.assertEqual(stats.rows_unchanged, 2)
+        self.assertEqual(stats.rows_updated, 1)
+        self.assertEqual(stats.rows_inserted, 0)
+        self.assertEqual(
+            Rating.objects.get(skill__name="Python").rating_value,
+            1,
+        )
+
+    def test_command_file_path(self):
+        """Проверяет импорт файла, переданного аргументом команды."""
+        out = StringIO()
+        call_command("import_xlsx", self.file_path, "--incremental",
+                     stdout=out)
+        self.assertEqual(Rating.objects.count(), len(ROWS))
+        self.assertTrue(
+            ImportSource.objects.filter(
+                path=os.path.abspath(self.file_path)
+            ).exists()
+        )
+        call_command("import_xlsx", self.file_path, "--incremental",
+                     stdout=out)
+        self.assertIn("Файл не изменился", out.getvalue())
+        self.assertEqual(Rating.objects.count(), len(ROWS))
@@ -0,0 +1,99 @@
+#           План тестирования загрузчиков оценок
+#    1) Проверка выбора загрузчика по типу БД
+#    2) Проверка загрузки оценок выбранным загрузчиком
+#    3) Проверка upsert: добавление, обновление и пропуск
+#       не изменившихся оценок
+
+from datetime import date
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from model_bakery import baker
+
+from imports.loaders import (
+    RATING_ATTNAMES,
+    BulkCreateLoader,
+    PostgresCopyLoader,
+    get_rating_loader
+)
+from ratings.models import Rating
+
+
+def make_row(employee, skill, rating_date, rating_value, suitability):
+    """Строка оценки для загрузчика с денормализованными полями."""
+    return (
+        employee.id,
+        skill.id,
+        rating_date,
+        rating_value,
+        suitability,
+        employee.team_id,
+        employee.position_id,
+        employee.grade,
+        skill.competence_id,
+        skill.competence.domain_id,
+    )
+
+
+class TestRatingLoaders(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = baker.make(
+            "employees.Employee",
+            last_name="employee",
+            first_name="1",
+        )
+        cls.skills = baker.make("ratings.Skill", _quantity=2)
+        cls.rows = [
+            make_row(cls.employee, skill, date(2024, 1, 1), 4, "да")
+            for skill in cls.skills
+        ]
+
+    def assert_loaded(self, loader):
+        self.assertEqual(loader.load(self.rows), len(self.rows))
+        self.assertEqual(
+            set(Rating.objects.values_list(*RATING_ATTNAMES)),
+            set(self.rows),
+        )
+
+    def test_loader_choice(self):
+        """Проверяет, что COPY используется только для PostgreSQL."""
+        expected_loader = (
+            PostgresCopyLoader
+            if connection.vendor == "postgresql"
+            else BulkCreateLoader
+        )
+        self.assertIsInstance(get_rating_loader(), expected_loader)
+
+    def test_bulk_create_loader(self):
+        self.assert_loaded(BulkCreateLoader())
+
+    @skipUnless(connection.vendor == "postgresql", "Требуется PostgreSQL")
+    def test_copy_loader(self):
+        self.assert_loaded(PostgresCopyLoader())
+
+    def assert_upserted(self, loader):
+        loader.load(self.rows)
+        first, second = self.rows
+        new_skill = baker.make("ratings.Skill")
+        rows = [
+            first,
+            second[:3] + (5, "нет") + second[5:],
+            make_row(self.employee, new_skill, date(2024, 1, 1), 3, "да"),
+        ]
+        self.assertEqual(loader.upsert(rows), (1, 1, 1))
+        self.assertEqual(Rating.objects.count(), 3)
+        self.assertEqual(
+            Rating.objects.get(skill_id=second[1]).suitability,
+            "нет",
+        )
+        self.assertEqual(loader.upsert(rows), (0, 0, 3))
+
+    def test_bulk_create_upsert(self):
+        self.assert_upserted(BulkCreateLoader())
+
+    @skipUnless(connection.vendor == "postgresql", "Требуется PostgreSQL")
+    def test_copy_upsert(self):
+        self.assert_upserted(PostgresCopyLoader())
@@ -0,0 +1,130 @@
+#           План тестирования импорта нескольких файлов и листов
+#    1) Проверка поиска файлов в каталоге и по маске glob
+#    2) Проверка, что импортируются только листы с нужными колонками
+#    3) Проверка параллельного чтения листов в пуле процессов
+#    4) Проверка импорта каталога командой
+#    5) Проверка отчета об ошибке чтения листа при потоковом импорте
+
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from openpyxl import Workbook
+
+from imports.constants import REQUIRED_COLUMNS
+from imports import readers
+from imports.readers import (
+    find_files,
+    find_sources,
+    iter_parallel,
+    read_sheet
+)
+from ratings.models import Rating
+from tests.tests_imports.tests_pipeline import ROWS
+
+
+def save_workbook(file_path, sheets):
+    """Сохраняет книгу с листами {название: (заголовок, строки)}."""
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for title, (header, rows) in sheets.items():
+        sheet = workbook.create_sheet(title)
+        sheet.append(header)
+        for row in rows:
+            sheet.append(row)
+    workbook.save(file_path)
+
+
+class TestMultiSourceImport(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.first_file = os.path.join(self.directory, "dep_1.xlsx")
+        self.second_file = os.path.join(self.directory, "dep_2.xlsx")
+        save_workbook(self.first_file, {
+            "a": (REQUIRED_COLUMNS, ROWS[:1]),
+            "b": (REQUIRED_COLUMNS, ROWS[1:2]),
+            "notes": (("комментарий",), (("text",),)),
+        })
+        save_workbook(self.second_file, {
+            "a": (REQUIRED_COLUMNS, ROWS[2:]),
+        })
+        open(os.path.join(self.directory, "readme.txt"), "w").close()
+
+    def test_find_files(self):
+        files = [self.first_file, self.second_file]
+        self.assertEqual(find_files(self.directory), files)
+        self.assertEqual(
+            find_files(os.path.join(self.directory, "dep_*.xlsx")),
+            files,
+        )
+        self.assertEqual(find_files(self.first_file), [self.first_file])
+        self.assertEqual(
+            find_files(os.path.join(self.directory, "missing.xlsx")),
+            [],
+        )
+
+    def test_find_sources(self):
+        """Проверяет, что листы без нужных колонок пропускаются."""
+        self.assertEqual(
+            find_sources(find_files(self.directory)),
+            [
+                (self.first_file, "a"),
+                (self.first_file, "b"),
+                (self.second_file, "a"),
+            ],
+        )
+
+    def test_parallel_read(self):
+        """Проверяет порядок и содержимое листов из пула процессов."""
+        sources = find_sources(find_files(self.directory))
+        frames = list(iter_parallel(sources, workers=2))
+        self.assertEqual(len(frames), len(sources))
+        for frame, source in zip(frames, sources):
+            self.assertTrue(frame.equals(read_sheet(source)))
+
+    def test_import_directory(self):
+        call_command(
+            "import_xlsx", self.directory, "--workers", "2",
+            stdout=StringIO(),
+        )
+        self.assertEqual(Rating.objects.count(), len(ROWS))
+
+    def test_stream_read_error(self):
+        """
+        Проверяет, что ошибка чтения листа при потоковой проверке
+        и загрузке выводится сообщением, а об успешном чтении файла
+        сообщается только после чтения первой пачки.
+        """
+        iter_source_chunks = readers.iter_source_chunks
+        # Номера вызовов чтения листа: 3 листа при проверке, затем
+        # 3 листа при загрузке
+        for failed_call, success in ((1, False), (2, True), (5, True)):
+            calls = []
+
+            def read(source, chunk_size, failed_call=failed_call):
+                calls.append(source)
+                if len(calls) == failed_call:
+                    raise ValueError("лист поврежден")
+                return iter_source_chunks(source, chunk_size)
+
+            out = StringIO()
+            with self.subTest(failed_call=failed_call), mock.patch.object(
+                readers, "iter_source_chunks", side_effect=read
+            ):
+                call_command(
+                    "import_xlsx", self.directory, "--stream", stdout=out
+                )
+                self.assertIn(
+                    "Ошибка при чтении файла: лист поврежден",
+                    out.getvalue(),
+                )
+                self.assertEqual(
+                    "Файл успешно прочитан" in out.getvalue(), success
+                )
+                self.assertNotIn("Прочитано строк", out.getvalue())
@@ -0,0 +1,138 @@
+#           План тестирования потокового импорта
+#    1) Проверка чтения Excel-файла пачками заданного размера
+#    2) Проверка загрузки оценок и справочников из пачек
+#    3) Проверка пропуска строк с некорректным именем сотрудника
+#    4) Проверка повторного использования существующих справочников
+#    5) Проверка, что число запросов не зависит от числа строк
+
+import os
+import tempfile
+from datetime import datetime
+from io import StringIO
+
+from django.core.management.color import no_style
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from openpyxl import Workbook
+
+from employees.models import Employee, Position, Team
+from imports.constants import REQUIRED_COLUMNS
+from imports.pipeline import RatingImportPipeline
+from imports.readers import iter_xlsx_chunks
+from ratings.models import Competence, Domain, Rating, Skill
+
+ROWS = [
+    (
+        "Иванов Иван", "Аналитик", "Команда 1", "Hard skills",
+        "Анализ", "SQL", "Junior", datetime(2024, 1, 1), 3, "да",
+    ),
+    (
+        "Иванов Иван", "Аналитик", "Команда 1", "Hard skills",
+        "Анализ", "Python", "Junior", datetime(2024, 1, 1), 4, "нет",
+    ),
+    (
+        "Петров Петр", "Дизайнер", "Команда 2", "Soft skills",
+        "Коммуникация", "Переговоры", "Middle", datetime(2024, 1, 1), 5,
+        "не требуется",
+    ),
+]
+
+
+def make_workbook(rows):
+    """Создает временный Excel-файл с заданными строками."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(REQUIRED_COLUMNS)
+    for row in rows:
+        sheet.append(row)
+    file = tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False)
+    file.close()
+    workbook.save(file.name)
+    return file.name
+
+
+class TestRatingImportPipeline(TestCase):
+
+    def setUp(self):
+        self.file_path = make_workbook(ROWS)
+        self.addCleanup(os.remove, self.file_path)
+
+    def run_pipeline(self, chunks):
+        pipeline = RatingImportPipeline(StringIO(), no_style())
+        return pipeline.run(chunks)
+
+    def test_chunks(self):
+        """Проверяет, что файл читается пачками по chunk_size строк."""
+        chunks = list(iter_xlsx_chunks(self.file_path, chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        self.assertEqual(tuple(chunks[0].columns), REQUIRED_COLUMNS)
+
+    def test_import(self):
+        """Проверяет загрузку оценок и справочников."""
+        stats = self.run_pipeline(
+            iter_xlsx_chunks(self.file_path, chunk_size=2)
+        )
+        self.assertEqual(stats.rows_read, 3)
+        self.assertEqual(stats.rows_loaded, 3)
+        self.assertEqual(stats.chunks, 2)
+        self.assertEqual(Rating.objects.count(), 3)
+        self.assertEqual(Employee.objects.count(), 2)
+        self.assertEqual(Position.objects.count(), 2)
+        self.assertEqual(Team.objects.count(), 2)
+        self.assertEqual(Domain.objects.count(), 2)
+        self.assertEqual(Competence.objects.count(), 2)
+        self.assertEqual(Skill.objects.count(), 3)
+        rating = Rating.objects.get(skill__name="Python")
+        self.assertEqual(rating.employee.full_name, "Иванов Иван")
+        self.assertEqual(str(rating.rating_date), "2024-01-01")
+        self.assertEqual(rating.rating_value, 4)
+        self.assertEqual(rating.suitability, "нет")
+        self.assertEqual(rating.team.name, "Команда 1")
+        self.assertEqual(rating.position.name, "Аналитик")
+        self.assertEqual(rating.grade, "Junior")
+        self.assertEqual(rating.competence.name, "Анализ")
+        self.assertEqual(rating.domain.name, "Hard skills")
+
+    def test_skip_invalid_name(self):
+        """Проверяет, что строки с некорректным именем пропускаются."""
+        file_path = make_workbook(
+            [("Иванов Иван Иванович",) + ROWS[0][1:]] + ROWS[1:]
+        )
+        self.addCleanup(os.remove, file_path)
+        stats = self.run_pipeline(iter_xlsx_chunks(file_path))
+        self.assertEqual(stats.rows_skipped, 1)
+        self.assertEqual(Rating.objects.count(), 2)
+
+    def test_reuse_existing_dimensions(self):
+        """Проверяет, что повторный импорт не дублирует справочники."""
+        self.run_pipeline(iter_xlsx_chunks(self.file_path))
+        Rating.objects.all().delete()
+        self.run_pipeline(iter_xlsx_chunks(self.file_path))
+        self.assertEqual(Rating.objects.count(), 3)
+        self.assertEqual(Employee.objects.count(), 2)
+        self.assertEqual(Skill.objects.count(), 3)
+        self.assertEqual(
+            Employee.objects.get(last_name="Петров").full_name,
+            "Петров Петр",
+        )
+
+    def test_queries_do_not_depend_on_rows(self):
+        """Проверяет, что число запросов не растет с числом строк."""
+        with CaptureQueriesContext(connection) as small_import:
+            self.run_pipeline(iter_xlsx_chunks(self.file_path))
+        Rating.objects.all().delete()
+        Employee.objects.all().delete()
+        file_path = make_workbook([
+            (f"Сидоров {name}",) + row[1:]
+            for name in ("Алексей", "Борис", "Виктор", "Глеб")
+            for row in ROWS
+        ])
+        self.addCleanup(os.remove, file_path)
+        with CaptureQueriesContext(connection) as large_import:
+            self.run_pipeline(iter_xlsx_chunks(file_path))
+        self.assertEqual(Rating.objects.count(), 12)
+        self.assertLessEqual(
+            len(large_import.captured_queries),
+            len(small_import.captured_queries),
+        )
@@ -0,0 +1,97 @@
+#           План тестирования вывода прогресса импорта
+#    1) Проверка вывода прогресса не чаще заданного интервала
+#    2) Проверка расчета скорости и оставшегося времени
+#    3) Проверка, что сообщения о строках выводятся только при -v 3
+#    4) Проверка итогов импорта в формате JSON
+
+import json
+import os
+from io import StringIO
+
+import pandas as pd
+from django.core.management import call_command
+from django.core.management.base import OutputWrapper
+from django.core.management.color import no_style
+from django.test import TestCase
+
+from imports.progress import ProgressReporter
+from tests.tests_imports.tests_pipeline import ROWS, make_workbook
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProgressReporter(TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.out = StringIO()
+        self.progress = ProgressReporter(
+            OutputWrapper(self.out), no_style(), interval=10,
+            clock=self.clock,
+        )
+
+    def lines(self):
+        return self.out.getvalue().splitlines()
+
+    def test_interval(self):
+        self.progress.start_phase("загрузка", total=400)
+        self.clock.now = 5
+        self.progress.update(100)
+        self.assertEqual(self.lines(), [])
+        self.clock.now = 10
+        self.progress.update(200)
+        self.assertEqual(
+            self.lines(),
+            ["[загрузка] строк: 200 из 400 (50%), "
+             "скорость: 20 строк/с, осталось: 0:00:10"],
+        )
+        # В конце этапа уже выведенный прогресс не повторяется
+        self.progress.finish_phase()
+        self.assertEqual(len(self.lines()), 1)
+        self.clock.now = 20
+        self.progress.update(400)
+        self.progress.finish_phase()
+        self.assertEqual(len(self.lines()), 2)
+
+    def test_track(self):
+        chunks = [pd.DataFrame({"a": range(3)}), pd.DataFrame({"a": [1]})]
+        self.progress.start_phase("проверка")
+        self.clock.now = 2
+        self.assertEqual(len(list(self.progress.track(chunks))), 2)
+        self.assertIsNone(self.progress.eta)
+        self.progress.finish_phase()
+        self.assertEqual(
+            self.lines(), ["[проверка] строк: 4, скорость: 2 строк/с"]
+        )
+
+
+class TestImportCommandOutput(TestCase):
+
+    def setUp(self):
+        self.file_path = make_workbook(ROWS)
+        self.addCleanup(os.remove, self.file_path)
+
+    def call_import(self, *options):
+        out = StringIO()
+        call_command(
+            "import_xlsx", self.file_path, "--upsert", *options, stdout=out
+        )
+        return out.getvalue()
+
+    def test_row_messages(self):
+        self.assertNotIn("processed", self.call_import())
+        output = self.call_import("--verbosity", "3")
+        self.assertEqual(output.count("processed"), len(ROWS))
+
+    def test_json_summary(self):
+        output = self.call_import("--json-summary")
+        summary = json.loads(output.splitlines()[-1])
+        self.assertEqual(summary["rows_read"], len(ROWS))
+        self.assertEqual(summary["rows_inserted"], len(ROWS))
@@ -0,0 +1,135 @@
+#           План тестирования проверки файла перед импортом
+#    1) Проверка, что корректный файл не содержит ошибок
+#    2) Проверка обнаружения ошибок по каждой колонке
+#    3) Проверка обнаружения повторов ключа в разных пачках
+#    4) Проверка, что --dry-run и файл с ошибками не пишут в БД
+#    5) Проверка нумерации строк на каждом листе и в каждом файле
+#       и имен файла и листа в отчете
+
+import os
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from openpyxl import load_workbook
+
+from imports.constants import REQUIRED_COLUMNS
+from imports.readers import (
+    find_sources,
+    iter_sources_chunks,
+    iter_xlsx_chunks,
+)
+from imports.validators import ImportValidator
+from ratings.models import Rating
+from tests.tests_imports.tests_pipeline import ROWS, make_workbook
+
+
+class TestImportValidator(TestCase):
+
+    def validate(self, rows, chunk_size=1000):
+        file_path = make_workbook(rows)
+        self.addCleanup(os.remove, file_path)
+        return ImportValidator().run(iter_xlsx_chunks(file_path, chunk_size))
+
+    def test_valid_file(self):
+        validator = self.validate(ROWS)
+        self.assertTrue(validator.is_valid)
+        self.assertEqual(validator.rows, len(ROWS))
+
+    def test_row_errors(self):
+        """Проверяет, что ошибки находятся в нужных строках и колонках."""
+        row = ROWS[0]
+        rows = [
+            ("Иванов Иван Иванович",) + row[1:],
+            ("Iv@nov Ivan",) + row[1:],
+            row[:5] + ("Skill 1", "Jun") + row[7:],
+            row[:5] + ("Skill 2",) + row[6:8] + (7, "да"),
+            row[:5] + ("Skill 3",) + row[6:9] + ("может быть",),
+            row[:5] + ("Skill 4", row[6], "не дата") + row[8:],
+            row[:2] + (None,) + row[3:5] + ("Skill 5",) + row[6:],
+        ]
+        validator = self.validate(rows)
+        self.assertFalse(validator.is_valid)
+        self.assertEqual(
+            sorted((error.row, error.column) for error in validator.errors),
+            [
+                (2, "сотрудник"),
+                (3, "сотрудник"),
+                (4, "грейд"),
+                (5, "оценка_"),
+                (6, "соответствие"),
+                (7, "дата"),
+                (8, "команда"),
+            ],
+        )
+
+    def test_duplicate_keys(self):
+        """Проверяет поиск повторов ключа между пачками."""
+        validator = self.validate(ROWS + [ROWS[0]], chunk_size=2)
+        self.assertEqual(
+            [error.row for error in validator.errors],
+            [2, 5],
+        )
+
+    def test_missing_columns(self):
+        validator = ImportValidator().run([
+            next(iter_xlsx_chunks(make_workbook(ROWS))).drop(
+                columns=["грейд"]
+            )
+        ])
+        self.assertFalse(validator.is_valid)
+        self.assertEqual(validator.missing_columns, ["грейд"])
+
+    def test_command_does_not_write(self):
+        """Проверяет, что проверка выполняется до записи в БД."""
+        file_path = make_workbook(ROWS)
+        self.addCleanup(os.remove, file_path)
+        call_command("import_xlsx", file_path, "--dry-run", stdout=StringIO())
+        self.assertFalse(Rating.objects.exists())
+
+        file_path = make_workbook(ROWS + [ROWS[0][:8] + (0, "да")])
+        self.addCleanup(os.remove, file_path)
+        out = StringIO()
+        call_command("import_xlsx", file_path, "--stream", stdout=out)
+        self.assertIn("Импорт отменен", out.getvalue())
+        self.assertFalse(Rating.objects.exists())
+
+    def test_sources(self):
+        """
+        Проверяет, что строки нумеруются заново на каждом листе
+        и в каждом файле, а ошибки называют файл и лист.
+        """
+        bad_row = ROWS[0][:5] + ("Skill 0",) + ROWS[0][6:8] + (0, "да")
+        first_path = make_workbook(ROWS + [bad_row])
+        self.addCleanup(os.remove, first_path)
+        workbook = load_workbook(first_path)
+        workbook.active.title = "Январь"
+        sheet = workbook.create_sheet("Февраль")
+        sheet.append(REQUIRED_COLUMNS)
+        sheet.append(bad_row[:7] + (ROWS[0][7].replace(month=2),) + (0, "да"))
+        workbook.save(first_path)
+        second_path = make_workbook([bad_row[:5] + ("Skill 1",) + bad_row[6:]])
+        self.addCleanup(os.remove, second_path)
+
+        validator = ImportValidator().run(iter_sources_chunks(
+            find_sources([first_path, second_path]), chunk_size=2
+        ))
+        self.assertEqual(validator.rows, 6)
+        self.assertEqual(
+            [
+                (error.file, error.sheet, error.row)
+                for error in validator.errors
+            ],
+            [
+                (first_path, "Январь", 5),
+                (first_path, "Февраль", 2),
+                (second_path, "Sheet", 2),
+            ],
+        )
+        report = validator.report()
+        self.assertIn(
+            f"Файл {first_path}, лист Февраль, строка 2, оценка_", report[-2]
+        )
+        self.assertTrue(report[-1].startswith(
+            f"Файл {second_path}, лист Sheet, строка 2"
+        ))
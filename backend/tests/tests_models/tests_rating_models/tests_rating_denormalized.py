@@ -0,0 +1,137 @@
+#        План тестирования денормализованных полей модели Rating
+# 1) Проверка заполнения полей при сохранении оценки
+# 2) Проверка обновления полей при изменении сотрудника
+# 3) Проверка обновления полей при переносе навыка в другую компетенцию
+# 4) Проверка обновления поля domain при изменении компетенции
+# 5) Проверка заполнения полей в Rating.objects.bulk_create
+# 6) Проверка обновления полей в Rating.objects.update при смене
+#    сотрудника или навыка
+
+from datetime import date
+
+from model_bakery import baker
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from employees.constants import MIDDLE, SENIOR
+from ratings.models import Rating
+
+
+class TestRatingDenormalizedFields(TestCase):
+    """
+    Тесты копий атрибутов сотрудника и навыка в модели Rating.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = baker.make(
+            "employees.Employee",
+            first_name="Иван",
+            last_name="Иванов",
+            grade=MIDDLE,
+        )
+        cls.skill = baker.make("ratings.Skill")
+        cls.rating = baker.make(
+            "ratings.Rating",
+            employee=cls.employee,
+            skill=cls.skill,
+        )
+
+    def assert_denormalized(self, rating):
+        rating.refresh_from_db()
+        employee = rating.employee
+        competence = rating.skill.competence
+        self.assertEqual(rating.team_id, employee.team_id)
+        self.assertEqual(rating.position_id, employee.position_id)
+        self.assertEqual(rating.grade, employee.grade)
+        self.assertEqual(rating.competence_id, competence.id)
+        self.assertEqual(rating.domain_id, competence.domain_id)
+
+    def test_fill_on_save(self):
+        """Проверка заполнения полей при сохранении оценки."""
+        self.assert_denormalized(self.rating)
+        self.assertEqual(self.rating.grade, MIDDLE)
+
+    def test_employee_update(self):
+        """Проверка обновления полей при изменении сотрудника."""
+        self.employee.team = baker.make("employees.Team")
+        self.employee.position = baker.make("employees.Position")
+        self.employee.grade = SENIOR
+        self.employee.save()
+        self.assert_denormalized(self.rating)
+        self.assertEqual(
+            Rating.objects.filter(grade=SENIOR).count(),
+            1,
+        )
+
+    def test_skill_update(self):
+        """
+        Проверка обновления полей при переносе навыка
+        в другую компетенцию.
+        """
+        self.skill.competence = baker.make("ratings.Competence")
+        self.skill.save()
+        self.assert_denormalized(self.rating)
+
+    def test_competence_update(self):
+        """Проверка обновления поля domain при изменении компетенции."""
+        competence = self.skill.competence
+        competence.domain = baker.make("ratings.Domain")
+        competence.save()
+        self.assert_denormalized(self.rating)
+
+    def test_bulk_create(self):
+        """
+        Проверка заполнения полей в bulk_create: оценки без атрибутов
+        заполняются двумя запросами, заполненные не меняются.
+        """
+        employees = baker.make(
+            "employees.Employee",
+            first_name="Петр",
+            last_name=iter(["Петров", "Сидоров", "Смирнов"]),
+            _quantity=3,
+        )
+        ratings = [
+            Rating(
+                employee=employee,
+                skill=self.skill,
+                rating_date=date(2024, 1, 1),
+                rating_value=3,
+            )
+            for employee in employees
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            Rating.objects.bulk_create(ratings)
+        for rating in ratings:
+            self.assert_denormalized(rating)
+        for rating in ratings:
+            rating.pk = None
+            rating.rating_date = date(2024, 2, 1)
+        with CaptureQueriesContext(connection) as filled_queries:
+            Rating.objects.bulk_create(ratings)
+        self.assertEqual(len(queries) - len(filled_queries), 2)
+        for rating in Rating.objects.filter(rating_date=date(2024, 2, 1)):
+            self.assert_denormalized(rating)
+
+    def test_queryset_update(self):
+        """
+        Проверка обновления полей в update при смене сотрудника
+        или навыка оценки.
+        """
+        employee = baker.make(
+            "employees.Employee",
+            first_name="Петр",
+            last_name="Петров",
+            grade=SENIOR,
+        )
+        ratings = Rating.objects.filter(pk=self.rating.pk)
+        ratings.update(employee=employee)
+        self.assert_denormalized(self.rating)
+        self.assertEqual(self.rating.grade, SENIOR)
+        ratings.update(skill_id=baker.make("ratings.Skill").pk)
+        self.assert_denormalized(self.rating)
+        self.assertNotEqual(
+            self.rating.competence_id, self.skill.competence_id
+        )
@@ -0,0 +1,76 @@
+#           План тестирования построения витрин итогов оценок
+#    1) Проверка построения витрин по оценкам
+
+from datetime import date
+
+from django.test import TestCase
+from model_bakery import baker
+
+from ratings.models import Rating
+from rollups.builders import (
+    COUNTER_FIELDS,
+    aggregate_ratings,
+    refresh_rollups,
+)
+from rollups.models import ROLLUP_MODELS, EmployeeSkillRollup
+
+
+def get_rows(model, queryset):
+    fields = model.GROUP_FIELDS + COUNTER_FIELDS
+    return sorted(
+        tuple(row[field] for field in fields)
+        for row in queryset.values(*fields)
+    )
+
+
+class TestRollups(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employees = baker.make(
+            "employees.Employee",
+            last_name="Иванов",
+            first_name="Иван",
+            _quantity=2,
+        )
+        cls.skills = baker.make("ratings.Skill", _quantity=2)
+        for employee in cls.employees:
+            for skill in cls.skills:
+                for rating_date, rating_value, suitability in (
+                    (date(2024, 1, 1), 3, Rating.YES),
+                    (date(2024, 2, 1), 4, Rating.NO),
+                    (date(2024, 3, 1), 5, Rating.NOT_REQUIRED),
+                ):
+                    baker.make(
+                        "ratings.Rating",
+                        employee=employee,
+                        skill=skill,
+                        rating_date=rating_date,
+                        rating_value=rating_value,
+                        suitability=suitability,
+                    )
+
+    def assert_rollups_actual(self):
+        """Витрины совпадают с итогами, посчитанными по оценкам."""
+        for model in ROLLUP_MODELS:
+            with self.subTest(model=model.__name__):
+                self.assertEqual(
+                    get_rows(model, model.objects.all()),
+                    get_rows(
+                        model, aggregate_ratings(model, Rating.objects.all())
+                    ),
+                )
+
+    def test_refresh_rollups(self):
+        """Проверяет построение витрин по оценкам."""
+        for model in ROLLUP_MODELS:
+            model.objects.all().delete()
+        refresh_rollups()
+        self.assert_rollups_actual()
+        rollup = EmployeeSkillRollup.objects.get(
+            employee=self.employees[0], skill=self.skills[0]
+        )
+        self.assertEqual(rollup.rating_count, 3)
+        self.assertEqual(rollup.rating_sum, 12)
+        self.assertEqual(rollup.yes_count, 1)
+        self.assertEqual(rollup.required_count, 2)
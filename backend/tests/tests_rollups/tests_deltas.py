@@ -0,0 +1,260 @@
+#           План тестирования изменения витрин на разницу итогов
+#    1) Проверка изменения витрин при добавлении, изменении
+#       и удалении оценки
+#    2) Проверка, что меняются только ячейки измененных оценок
+#    3) Проверка массовых операций: bulk_create, update, delete
+#    4) Проверка изменения витрин при изменении сотрудника,
+#       навыка и компетенции и при удалении сотрудника
+#    5) Проверка изменения витрин загрузчиками и импортом
+#    6) Проверка, что bulk_create с конфликтами читает из БД только
+#       оценки с ключами вставляемых оценок
+
+from datetime import date
+from io import StringIO
+from unittest import skipUnless
+
+import pandas as pd
+from django.core.management.color import no_style
+from django.db import connection
+from django.test import TestCase
+from model_bakery import baker
+
+from imports.constants import REQUIRED_COLUMNS
+from imports.loaders import BulkCreateLoader, PostgresCopyLoader
+from imports.pipeline import RatingImportPipeline
+from ratings.models import Rating
+from rollups.builders import aggregate_ratings
+from rollups.models import ROLLUP_MODELS, EmployeeSkillRollup
+from tests.tests_imports.tests_loaders import make_row
+from tests.tests_imports.tests_pipeline import ROWS
+from tests.tests_rollups.tests_builders import get_rows
+
+
+class TestRollupDeltas(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employees = baker.make(
+            "employees.Employee",
+            last_name="Иванов",
+            first_name="Иван",
+            _quantity=2,
+        )
+        cls.skills = baker.make("ratings.Skill", _quantity=2)
+        for employee in cls.employees:
+            for skill in cls.skills:
+                for rating_date, rating_value, suitability in (
+                    (date(2024, 1, 1), 3, Rating.YES),
+                    (date(2024, 2, 1), 4, Rating.NO),
+                    (date(2024, 3, 1), 5, Rating.NOT_REQUIRED),
+                ):
+                    baker.make(
+                        "ratings.Rating",
+                        employee=employee,
+                        skill=skill,
+                        rating_date=rating_date,
+                        rating_value=rating_value,
+                        suitability=suitability,
+                    )
+
+    def assert_rollups_actual(self):
+        """Витрины совпадают с итогами, посчитанными по оценкам."""
+        for model in ROLLUP_MODELS:
+            with self.subTest(model=model.__name__):
+                self.assertEqual(
+                    get_rows(model, model.objects.all()),
+                    get_rows(
+                        model, aggregate_ratings(model, Rating.objects.all())
+                    ),
+                )
+
+    def test_rating_changes(self):
+        """
+        Проверяет изменение витрин при добавлении, изменении
+        и удалении оценки.
+        """
+        rating = baker.make(
+            "ratings.Rating",
+            employee=self.employees[0],
+            skill=self.skills[0],
+            rating_date=date(2024, 4, 1),
+            rating_value=1,
+        )
+        self.assert_rollups_actual()
+        rating.employee = self.employees[1]
+        rating.rating_date = date(2024, 5, 1)
+        rating.rating_value = 2
+        rating.suitability = Rating.YES
+        rating.save()
+        self.assert_rollups_actual()
+        rating.delete()
+        self.assert_rollups_actual()
+        self.assertFalse(
+            EmployeeSkillRollup.objects.filter(rating_count=0).exists()
+        )
+
+    def test_only_changed_cells(self):
+        """
+        Проверяет, что итоги меняются на разницу и не пересчитываются
+        по всем оценкам ячейки.
+        """
+        EmployeeSkillRollup.objects.filter(
+            employee=self.employees[1],
+        ).update(rating_sum=100)
+        rating = Rating.objects.get(
+            employee=self.employees[0],
+            skill=self.skills[0],
+            rating_date=date(2024, 1, 1),
+        )
+        rating.rating_value = 5
+        rating.save()
+        self.assertEqual(
+            EmployeeSkillRollup.objects.get(
+                employee=self.employees[0], skill=self.skills[0]
+            ).rating_sum,
+            14,
+        )
+        self.assertFalse(
+            EmployeeSkillRollup.objects.filter(
+                employee=self.employees[1],
+            ).exclude(
+                rating_sum=100,
+            ).exists()
+        )
+
+    def test_bulk_operations(self):
+        """Проверяет массовые операции с оценками."""
+        Rating.objects.filter(
+            suitability=Rating.NO,
+        ).update(
+            rating_value=1,
+            suitability=Rating.YES,
+        )
+        self.assert_rollups_actual()
+        new_ratings = [
+            Rating(
+                employee=employee,
+                skill=self.skills[0],
+                rating_date=date(2024, 4, 1),
+                rating_value=2,
+            )
+            for employee in self.employees
+        ]
+        for rating in new_ratings:
+            rating.fill_denormalized()
+        Rating.objects.bulk_create(new_ratings)
+        self.assert_rollups_actual()
+        for rating in new_ratings:
+            rating.pk = None
+            rating.rating_value = 4
+            rating.suitability = Rating.YES
+        Rating.objects.bulk_create(
+            new_ratings,
+            update_conflicts=True,
+            unique_fields=("rating_date", "skill", "employee"),
+            update_fields=("rating_value", "suitability"),
+        )
+        self.assert_rollups_actual()
+        Rating.objects.filter(skill=self.skills[1]).delete()
+        self.assert_rollups_actual()
+        self.assertFalse(
+            EmployeeSkillRollup.objects.filter(skill=self.skills[1]).exists()
+        )
+
+    def test_dimension_changes(self):
+        """
+        Проверяет изменение витрин при изменении сотрудника,
+        навыка и компетенции и при удалении сотрудника.
+        """
+        employee = self.employees[0]
+        employee.team = baker.make("employees.Team")
+        employee.save()
+        self.assert_rollups_actual()
+        skill = self.skills[0]
+        skill.competence = baker.make("ratings.Competence")
+        skill.save()
+        self.assert_rollups_actual()
+        competence = skill.competence
+        competence.domain = baker.make("ratings.Domain")
+        competence.save()
+        self.assert_rollups_actual()
+        employee.delete()
+        self.assert_rollups_actual()
+
+    def assert_loader_deltas(self, loader):
+        employee = self.employees[0]
+        rows = [
+            make_row(employee, skill, date(2024, 1, 1), 1, Rating.NO)
+            for skill in self.skills
+        ] + [
+            make_row(employee, skill, date(2024, 4, 1), 2, Rating.YES)
+            for skill in self.skills
+        ]
+        loader.load(rows[2:])
+        self.assert_rollups_actual()
+        Rating.objects.filter(rating_date=date(2024, 4, 1)).delete()
+        self.assertEqual(loader.upsert(rows), (2, 2, 0))
+        self.assert_rollups_actual()
+
+    def test_bulk_create_loader(self):
+        """Проверяет изменение витрин загрузчиком bulk_create."""
+        self.assert_loader_deltas(BulkCreateLoader())
+
+    @skipUnless(connection.vendor == "postgresql", "Требуется PostgreSQL")
+    def test_copy_loader(self):
+        """Проверяет изменение витрин загрузчиком COPY."""
+        self.assert_loader_deltas(PostgresCopyLoader())
+
+    def test_import(self):
+        """Проверяет изменение витрин при импорте."""
+        pipeline = RatingImportPipeline(StringIO(), no_style(), upsert=True)
+        pipeline.run(
+            [pd.DataFrame.from_records(ROWS, columns=REQUIRED_COLUMNS)]
+        )
+        self.assertEqual(
+            EmployeeSkillRollup.objects.filter(
+                skill__name="Python"
+            ).count(),
+            1,
+        )
+        self.assert_rollups_actual()
+
+    def test_bulk_create_existing(self):
+        """
+        Проверяет, что при bulk_create с конфликтами читаются оценки
+        с теми же ключами, а не все сочетания сотрудников, навыков
+        и дат пачки.
+        """
+        keys = [
+            (self.employees[0], self.skills[0], date(2024, 1, 1)),
+            (self.employees[1], self.skills[1], date(2024, 2, 1)),
+            (self.employees[1], self.skills[0], date(2024, 4, 1)),
+        ]
+        ratings = [
+            Rating(
+                employee=employee,
+                skill=skill,
+                rating_date=rating_date,
+                rating_value=1,
+            )
+            for employee, skill, rating_date in keys
+        ]
+        existing = Rating.objects.get_existing(ratings)
+        self.assertCountEqual(
+            [
+                (rating.employee, rating.skill, rating.rating_date)
+                for queryset in existing
+                for rating in queryset
+            ],
+            keys[:2],
+        )
+        Rating.objects.bulk_create(
+            ratings,
+            update_conflicts=True,
+            unique_fields=("rating_date", "skill", "employee"),
+            update_fields=("rating_value", "suitability"),
+        )
+        self.assertEqual(
+            sum(queryset.all().count() for queryset in existing), len(keys)
+        )
+        self.assert_rollups_actual()
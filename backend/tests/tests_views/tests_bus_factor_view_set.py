@@ -1,3 +1,10 @@
+#           План тестирования Bus-фактора
+#    1) Проверка навыка с наименьшим Bus-фактором и ответа 404, если
+#       навыков с соответствием "да" нет
+#    2) Проверка списка навыков с наименьшим Bus-фактором: LIMIT,
+#       порядок при равенстве, разрезы по командам и один запрос к БД
+#    3) Проверка ответа 400 на неверные параметры списка
+
 from model_bakery import baker
 
 from rest_framework import status
@@ -91,3 +98,84 @@ class TestBusFactorViewSet(APITestCase):
             expected_response_data,
             "Ответ не совпадает с ожидаемым."
         )
+
+    def test_no_skills(self):
+        """Проверяет ответ 404, если навыков с соответствием "да" нет."""
+        response = self.client.get(self.url, {"skill": self.skills[0].id})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_top(self):
+        """
+        Проверяет список навыков с наименьшим Bus-фактором и порядок
+        навыков с равным Bus-фактором.
+        """
+        url = reverse("api:bus_factor-top")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            [
+                {
+                    "rank": 1,
+                    "skill_id": self.skills[3].id,
+                    "skill": "Skill_#3",
+                    "bus_factor": 2,
+                },
+                {
+                    "rank": 2,
+                    "skill_id": self.skills[2].id,
+                    "skill": "Skill_#2",
+                    "bus_factor": 3,
+                },
+            ],
+        )
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {"limit": 1})
+        self.assertEqual(
+            [item["skill"] for item in response.data], ["Skill_#3"]
+        )
+
+    def test_top_by_scope(self):
+        """
+        Проверяет разрез по командам: в команде второго и третьего
+        сотрудников у навыков по одному сотруднику, первым идет навык
+        с меньшим названием.
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("api:bus_factor-top"),
+                {"scope": "team", "limit": 1},
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = sorted(
+            (
+                {
+                    "scope_id": employee.team_id,
+                    "scope": employee.team.name,
+                    "rank": 1,
+                    "skill_id": self.skills[2].id,
+                    "skill": "Skill_#2",
+                    "bus_factor": 1,
+                }
+                for employee in (
+                    self.employee_1, self.employee_2, self.employee_3
+                )
+            ),
+            key=lambda item: (item["scope"], item["scope_id"]),
+        )
+        self.assertEqual(response.data, expected)
+
+    def test_top_invalid_params(self):
+        """Проверяет ответ 400 на неверные параметры списка."""
+        url = reverse("api:bus_factor-top")
+        for params in (
+            {"limit": 0},
+            {"limit": 101},
+            {"limit": "много"},
+            {"scope": "position"},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(
+                    response.status_code, status.HTTP_400_BAD_REQUEST
+                )
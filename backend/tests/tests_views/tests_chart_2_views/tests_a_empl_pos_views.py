@@ -1,6 +1,9 @@
 #           План тестирования EmployeePositionsViewSet
 #    1) Проверка корректной калькуляции процента сотрудников по должностям
 #    2) Проверка сортировки
+#    3) Проверка, что сотрудник с несколькими оценками учитывается
+#       один раз и после смены должности - только на новой должности,
+#       а ответ считается одним запросом
 
 from model_bakery import baker
 
@@ -8,6 +11,8 @@ from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
 
+from ratings.models import Rating
+
 
 class TestEmployeePositionsViewSet(APITestCase):
 
@@ -136,3 +141,49 @@ class TestEmployeePositionsViewSet(APITestCase):
             response.data,
             expected_response_data,
         )
+
+    def test_total_counts_employee_once(self):
+        """
+        Проверяет, что сотрудник с несколькими оценками учитывается
+        в количестве сотрудников один раз, а после смены должности -
+        только на новой должности.
+        """
+        baker.make(
+            "ratings.Rating",
+            employee=self.employee_1,
+            _quantity=2,
+        )
+        # Оценки сотрудника переходят на новую должность сигналом
+        self.employee_1.position = self.position_2
+        self.employee_1.save()
+        self.assertEqual(
+            Rating.objects.filter(
+                employee=self.employee_1, position=self.position_2
+            ).count(),
+            3,
+        )
+        expected_response_data = [
+            {
+                'position': 'position_1',
+                'position_employee_count': 1,
+                'total_employee_count': 3,
+                'percentage': 33.3
+            },
+            {
+                'position': 'position_2',
+                'position_employee_count': 2,
+                'total_employee_count': 3,
+                'percentage': 66.7
+            },
+        ]
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            response.data
+        )
+        self.assertEqual(
+            response.data,
+            expected_response_data,
+        )
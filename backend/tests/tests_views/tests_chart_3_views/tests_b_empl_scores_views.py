@@ -2,6 +2,9 @@
 #    1) Проверка корректного отображения балов сотрудников
 #    по навыкам и датам
 #    2) Проверка сортировки
+#    3) Проверка постраничного вывода по курсору: переходы по ссылкам
+#    next и previous, один запрос к БД на страницу, тезки, сотрудник
+#    без полного имени на границе страниц
 
 from datetime import date
 
@@ -11,6 +14,8 @@ from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
 
+from employees.models import Employee
+
 
 class TestEmployeeScoresViewSet(APITestCase):
 
@@ -122,7 +127,7 @@ class TestEmployeeScoresViewSet(APITestCase):
             response.data
         )
         self.assertEqual(
-            response.data,
+            response.data["results"],
             expected_response_data,
         )
 
@@ -167,6 +172,86 @@ class TestEmployeeScoresViewSet(APITestCase):
             response.data
         )
         self.assertEqual(
-            response.data,
+            response.data["results"],
             expected_response_data,
         )
+
+    def test_pagination(self):
+        """
+        Проверяет переходы по страницам по ссылкам next и previous
+        и порядок оценок тезок.
+        """
+        namesake = baker.make(
+            "employees.Employee",
+            last_name="employee",
+            first_name="2",
+        )
+        baker.make(
+            "ratings.Rating",
+            employee=namesake,
+            skill=self.skill_3,
+            rating_date=self.today_date,
+            rating_value=1,
+        )
+        pages = []
+        url = f"{self.url}?page_size=1"
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data)
+            url = response.data["next"]
+        self.assertEqual(
+            [
+                [item["rating_value"] for item in page["results"]]
+                for page in pages
+            ],
+            [[4], [5], [1], [3]],
+        )
+        self.assertIsNone(pages[0]["previous"])
+        response = self.client.get(pages[-1]["previous"])
+        self.assertEqual(response.data["results"], pages[-2]["results"])
+        self.assertEqual(
+            self.client.get(response.data["previous"]).data["results"],
+            pages[-3]["results"],
+        )
+
+    def test_pagination_blank_name(self):
+        """
+        Проверяет, что оценки сотрудника, сохраненного без полного
+        имени, не теряются и не повторяются на границе страниц.
+        """
+        employee = baker.prepare(
+            "employees.Employee",
+            last_name="employee",
+            first_name="4",
+            _save_related=True,
+        )
+        # bulk_create не вызывает Employee.save(), имя остается пустым
+        employee, = Employee.objects.bulk_create([employee])
+        self.assertEqual(Employee.objects.get(pk=employee.pk).full_name, "")
+        for skill, rating_value in ((self.skill_1, 2), (self.skill_2, 1)):
+            baker.make(
+                "ratings.Rating",
+                employee=employee,
+                skill=skill,
+                rating_date=self.today_date,
+                rating_value=rating_value,
+            )
+        values = []
+        url = f"{self.url}?page_size=1"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            values += [item["rating_value"] for item in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(values, [2, 1, 4, 5, 3])
+
+    def test_invalid_cursor(self):
+        """Проверяет ответ 404 на неверный курсор."""
+        for cursor in ("курсор", "cD0xMjM=", "cD0lNUIlMjJ4JTIyJTVE"):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.url, {"cursor": cursor})
+                self.assertEqual(
+                    response.status_code, status.HTTP_404_NOT_FOUND
+                )
@@ -0,0 +1,167 @@
+#           План тестирования кэша ответов чартов
+#    1) Проверка, что повторный запрос чарта отдается из кэша без
+#       запросов к БД и совпадает с посчитанным ответом
+#    2) Проверка нормализации параметров фильтра в ключе кэша
+#    3) Проверка смены версии данных при изменении оценок,
+#       справочников и после импорта
+#    4) Проверка, что ответ на неверный фильтр не кэшируется
+#    5) Проверка счетчиков кэша
+#    6) Проверка, что ответ движка по прежней версии данных
+#       не кэшируется
+
+from io import StringIO
+from unittest import mock
+
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management.color import no_style
+from django.test import override_settings
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from analytics.dataset import RatingDataset
+from analytics.engine import AnalyticsEngine, reset_engine
+from imports.constants import REQUIRED_COLUMNS
+from imports.pipeline import RatingImportPipeline
+from ratings.models import Rating
+from ratings.versions import get_data_version
+from tests.tests_imports.tests_pipeline import ROWS
+from tests.tests_views.tests_rollup_views import ChartDataMixin
+
+CHART_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "charts": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tests_chart_cache",
+    },
+}
+
+
+@override_settings(USE_CHART_CACHE=True, CACHES=CHART_CACHES)
+class TestChartCache(ChartDataMixin, APITestCase):
+
+    def setUp(self):
+        caches["charts"].clear()
+
+    def test_cached_responses(self):
+        """
+        Проверяет, что повторный запрос отдается из кэша без запросов
+        к БД.
+        """
+        for url, filters in self.urls:
+            with self.subTest(url=url, filters=filters):
+                response = self.client.get(url, filters)
+                self.assertEqual(response["X-Chart-Cache"], "miss")
+                with self.assertNumQueries(0):
+                    cached = self.client.get(url, filters)
+                self.assertEqual(cached["X-Chart-Cache"], "hit")
+                self.assertEqual(cached.data, response.data)
+
+    def test_normalized_filters(self):
+        """Проверяет нормализацию параметров фильтра в ключе кэша."""
+        url = reverse("api:skill_level-list")
+        team = self.employee.team_id
+        self.client.get(f"{url}?team={team}&start_date=2024-02-01")
+        for query, status in (
+            (f"team=0{team}&start_date=2024-02-01", "hit"),
+            (f"start_date=2024-02-01&team={team}&grade=", "hit"),
+            (f"team={team}&start_date=2024-02-01&format=json", "miss"),
+            (f"team={team}", "miss"),
+        ):
+            with self.subTest(query=query):
+                self.assertEqual(
+                    self.client.get(f"{url}?{query}")["X-Chart-Cache"],
+                    status,
+                )
+
+    def assert_invalidated(self, change):
+        url = reverse("api:skill_level-list")
+        self.client.get(url)
+        version = get_data_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        self.assertNotEqual(get_data_version(), version)
+        self.assertEqual(self.client.get(url)["X-Chart-Cache"], "miss")
+
+    def test_invalidation(self):
+        """
+        Проверяет смену версии данных при изменении оценок,
+        справочников и после импорта.
+        """
+        rating = Rating.objects.filter(skill=self.skill).first()
+        rating.rating_value = 1
+        self.assert_invalidated(rating.save)
+        self.assert_invalidated(
+            lambda: Rating.objects.filter(skill=self.skill).update(
+                rating_value=2
+            )
+        )
+        self.skill.name = "Новое название"
+        self.assert_invalidated(self.skill.save)
+        pipeline = RatingImportPipeline(StringIO(), no_style())
+        self.assert_invalidated(
+            lambda: pipeline.run(
+                [pd.DataFrame.from_records(ROWS, columns=REQUIRED_COLUMNS)]
+            )
+        )
+        response = self.client.get(reverse("api:skill_level-list"))
+        self.assertIn(
+            "Новое название",
+            [item["skill_name"] for item in response.data],
+        )
+
+    def test_invalid_filter(self):
+        """Проверяет, что ответ на неверный фильтр не кэшируется."""
+        url = reverse("api:skill_level-list")
+        for _ in range(2):
+            response = self.client.get(url, {"team": "команда"})
+            self.assertEqual(response.status_code, 400)
+            self.assertNotIn("X-Chart-Cache", response)
+
+    def test_stats(self):
+        """Проверяет счетчики кэша."""
+        url = reverse("api:chart_cache_stats-list")
+        self.assertEqual(self.client.get(url).status_code, 403)
+        chart_url = reverse("api:skill_level-list")
+        for _ in range(3):
+            self.client.get(chart_url)
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                username="admin", is_staff=True
+            )
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data,
+            {
+                "enabled": True,
+                "data_version": get_data_version(),
+                "hits": 2,
+                "misses": 1,
+                "coalesced": 0,
+            },
+        )
+
+    @override_settings(ANALYTICS_ENGINE_VIEWS=["*"])
+    def test_stale_engine(self):
+        """
+        Проверяет, что ответ движка, загруженного по другой версии
+        данных, отдается, но не кэшируется.
+        """
+        reset_engine()
+        self.addCleanup(reset_engine)
+        url = reverse("api:skill_level-list")
+        stale_engine = AnalyticsEngine(RatingDataset.load(), "0")
+        with mock.patch(
+            "api.v1.mixins.get_engine", return_value=stale_engine
+        ):
+            for _ in range(2):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response["X-Chart-Cache"], "miss")
+        self.assertEqual(self.client.get(url)["X-Chart-Cache"], "miss")
+        self.assertEqual(self.client.get(url)["X-Chart-Cache"], "hit")
@@ -0,0 +1,113 @@
+#           План тестирования прогрева кэша чартов
+#    1) Проверка, что прогрев записывает в кэш ответы чартов без
+#       фильтров, с фильтрами и после "проваливания"
+#    2) Проверка, что повторный прогрев не пересчитывает ответы
+#    3) Проверка прогрева после импорта командой и команды прогрева
+
+import json
+import os
+from io import StringIO
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from api.v1.warmup import ChartWarmup, get_warmup_requests
+from employees.models import Position, Team
+from ratings.models import Skill
+from tests.tests_imports.tests_pipeline import ROWS, make_workbook
+from tests.tests_views.tests_chart_cache import CHART_CACHES
+from tests.tests_views.tests_rollup_views import ChartDataMixin
+
+
+@override_settings(
+    USE_CHART_CACHE=True,
+    CACHES=CHART_CACHES,
+    CHART_WARMUP_FILTERS=["team", "grade"],
+    # Потоки не видят данные транзакции теста
+    CHART_WARMUP_WORKERS=1,
+)
+class TestChartWarmup(ChartDataMixin, APITestCase):
+
+    def setUp(self):
+        caches["charts"].clear()
+
+    def test_warmup(self):
+        """
+        Проверяет, что прогрев записывает в кэш ответы чартов без
+        фильтров, с фильтрами и после "проваливания".
+        """
+        requests = get_warmup_requests()
+        paths = {path for path, _ in requests}
+        self.assertIn(reverse("api:bus_factor-list"), paths)
+        self.assertIn(
+            reverse("api:skill_employee-list", args=(self.skill.pk,)), paths
+        )
+        self.assertIn(
+            reverse(
+                "api:employee_rating-list",
+                args=(self.employee.position_id, self.employee.grade),
+            ),
+            paths,
+        )
+        self.assertIn(
+            (
+                reverse("api:skill_level-list"),
+                {"team": self.employee.team_id},
+            ),
+            requests,
+        )
+        self.assertIn(
+            (reverse("api:skill_level-list"), {"grade": self.employee.grade}),
+            requests,
+        )
+        warmup = ChartWarmup().run()
+        self.assertEqual(warmup.requests, len(requests))
+        self.assertEqual(warmup.populated, len(requests))
+        self.assertEqual(warmup.errors, 0)
+        for path, query in requests:
+            with self.subTest(path=path, query=query):
+                with self.assertNumQueries(0):
+                    response = self.client.get(path, query)
+                self.assertEqual(response["X-Chart-Cache"], "hit")
+
+    def test_repeated_warmup(self):
+        """Проверяет, что повторный прогрев не пересчитывает ответы."""
+        ChartWarmup().run()
+        warmup = ChartWarmup().run()
+        self.assertEqual(warmup.populated, 0)
+        self.assertIn("записано ответов 0, ошибок 0", warmup.summary())
+
+    def test_commands(self):
+        """Проверяет прогрев после импорта и команду прогрева."""
+        file_path = make_workbook(ROWS)
+        self.addCleanup(os.remove, file_path)
+        stdout = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command(
+                "import_xlsx",
+                file_path,
+                "--json-summary",
+                "--workers", "1",
+                stdout=stdout,
+            )
+        summary = json.loads(stdout.getvalue().splitlines()[-1])
+        self.assertGreater(summary["warmup"]["populated"], 0)
+        self.assertEqual(
+            summary["warmup"]["requests"], len(get_warmup_requests())
+        )
+        self.assertGreater(Team.objects.count(), 1)
+        self.assertGreater(Position.objects.count(), 1)
+        self.assertGreater(Skill.objects.count(), 1)
+        stdout = StringIO()
+        call_command("import_xlsx", file_path, "--upsert", stdout=stdout)
+        self.assertNotIn("Кэш чартов прогрет", stdout.getvalue())
+        stdout = StringIO()
+        call_command("warm_chart_cache", stdout=stdout)
+        self.assertIn("Кэш чартов прогрет", stdout.getvalue())
+        with override_settings(USE_CHART_CACHE=False):
+            stdout = StringIO()
+            call_command("warm_chart_cache", stdout=stdout)
+        self.assertIn("выключен", stdout.getvalue())
@@ -0,0 +1,112 @@
+#           План тестирования условных GET-запросов
+#    1) Проверка заголовков ETag, Last-Modified и Cache-Control
+#       у чартов и справочников
+#    2) Проверка ответа 304 на If-None-Match и If-Modified-Since без
+#       запросов к БД
+#    3) Проверка смены ETag при изменении данных, параметров запроса
+#       и заголовка Accept
+#    4) Проверка, что без USE_CONDITIONAL_GET заголовки не выдаются
+#    5) Проверка, что ответы с ошибкой не получают ETag
+#       и Last-Modified
+
+from django.test import override_settings
+from django.utils.http import http_date
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from ratings.models import Rating
+from ratings.versions import get_data_modified, get_data_version
+from tests.tests_views.tests_chart_cache import CHART_CACHES
+from tests.tests_views.tests_rollup_views import ChartDataMixin
+
+
+@override_settings(USE_CONDITIONAL_GET=True, CACHES=CHART_CACHES)
+class TestConditionalGet(ChartDataMixin, APITestCase):
+
+    def get_urls(self):
+        return self.urls + [
+            (reverse("api:skills-list"), {}),
+            (reverse("api:skills-detail", args=(self.skill.pk,)), {}),
+            (reverse("api:raitings-list"), {"team": self.employee.team_id}),
+        ]
+
+    def test_headers(self):
+        """Проверяет заголовки ETag, Last-Modified и Cache-Control."""
+        last_modified = http_date(
+            get_data_modified(get_data_version()).timestamp()
+        )
+        for url, filters in self.get_urls():
+            with self.subTest(url=url, filters=filters):
+                response = self.client.get(url, filters)
+                self.assertEqual(response.status_code, 200)
+                self.assertRegex(response["ETag"], r'^"[0-9a-f]{32}"$')
+                self.assertEqual(response["Last-Modified"], last_modified)
+                self.assertIn("no-cache", response["Cache-Control"])
+                self.assertIn("Accept", response["Vary"])
+
+    def test_not_modified(self):
+        """
+        Проверяет ответ 304 на If-None-Match и If-Modified-Since без
+        запросов к БД.
+        """
+        for url, filters in self.get_urls():
+            with self.subTest(url=url, filters=filters):
+                response = self.client.get(url, filters)
+                with self.assertNumQueries(0):
+                    cached = self.client.get(
+                        url, filters, HTTP_IF_NONE_MATCH=response["ETag"]
+                    )
+                self.assertEqual(cached.status_code, 304)
+                self.assertEqual(cached["ETag"], response["ETag"])
+                self.assertEqual(cached.content, b"")
+                with self.assertNumQueries(0):
+                    cached = self.client.get(
+                        url,
+                        filters,
+                        HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+                    )
+                self.assertEqual(cached.status_code, 304)
+
+    def test_etag_changes(self):
+        """
+        Проверяет смену ETag при изменении данных, параметров запроса
+        и заголовка Accept.
+        """
+        url = reverse("api:skill_level-list")
+        etag = self.client.get(url)["ETag"]
+        team = self.employee.team_id
+        for response in (
+            self.client.get(url, {"team": team}),
+            self.client.get(url, {"format": "json"}),
+            self.client.get(url, HTTP_ACCEPT="text/html"),
+        ):
+            with self.subTest(response=response):
+                self.assertNotEqual(response["ETag"], etag)
+        with self.captureOnCommitCallbacks(execute=True):
+            Rating.objects.filter(skill=self.skill).update(rating_value=1)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    @override_settings(USE_CONDITIONAL_GET=False)
+    def test_disabled(self):
+        """Проверяет, что без USE_CONDITIONAL_GET заголовки не выдаются."""
+        url = reverse("api:skill_level-list")
+        response = self.client.get(url)
+        self.assertNotIn("ETag", response)
+        self.assertNotIn("Last-Modified", response)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"etag"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_error_responses(self):
+        """Проверяет, что ответы с ошибкой не получают ETag."""
+        for url, filters, status_code in (
+            (reverse("api:skill_level-list"), {"team": "команда"}, 400),
+            (reverse("api:skills-detail", args=(0,)), {}, 404),
+            (reverse("api:employee_skills-list", args=(0,)), {}, 404),
+        ):
+            with self.subTest(url=url, filters=filters):
+                response = self.client.get(url, filters)
+                self.assertEqual(response.status_code, status_code)
+                self.assertNotIn("ETag", response)
+                self.assertNotIn("Last-Modified", response)
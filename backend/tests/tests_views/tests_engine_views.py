@@ -0,0 +1,137 @@
+#           План тестирования чартов по оценкам в памяти
+#    1) Для каждого чарта с каждым фильтром RatingFilter ответ движка
+#       совпадает с ответом, посчитанным запросами к БД
+#    2) Проверка, что движок не обращается к БД после загрузки
+#    3) Проверка ответов 400 на неверный фильтр и 404 на
+#       несуществующий объект в адресе
+#    4) Проверка загрузки оценок заново после сброса движка
+#    5) Проверка загрузки оценок заново после смены версии данных
+
+from datetime import date
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from model_bakery import baker
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from analytics.engine import reset_engine
+from ratings.models import Rating
+from tests.tests_views.tests_chart_cache import CHART_CACHES
+from tests.tests_views.tests_rollup_views import ChartDataMixin
+
+
+def get_items(data):
+    """
+    Строки ответа для сравнения. SQLite при приведении дроби к целому
+    отбрасывает дробную часть, а PostgreSQL и движок округляют, поэтому
+    на SQLite процент соответствия не сравнивается.
+    """
+    items = data if isinstance(data, list) else [data]
+    if connection.vendor != "postgresql":
+        items = [
+            {key: value for key, value in item.items() if key != "percentage"}
+            for item in items
+        ]
+    return sorted(map(repr, items))
+
+
+@override_settings(ANALYTICS_ENGINE_VIEWS=["*"], USE_ROLLUPS=False)
+class TestEngineViews(ChartDataMixin, APITestCase):
+
+    def setUp(self):
+        reset_engine()
+
+    def tearDown(self):
+        reset_engine()
+
+    def test_engine_responses(self):
+        """
+        Проверяет, что ответы движка совпадают с ответами,
+        посчитанными запросами к БД.
+        """
+        for url, filters in self.urls:
+            with self.subTest(url=url, filters=filters):
+                response = self.client.get(url, filters)
+                self.assertEqual(response.status_code, 200)
+                with override_settings(ANALYTICS_ENGINE_VIEWS=[]):
+                    expected = self.client.get(url, filters)
+                self.assertEqual(
+                    get_items(response.data), get_items(expected.data)
+                )
+
+    def test_no_queries(self):
+        """Проверяет, что после загрузки движок не обращается к БД."""
+        self.client.get(reverse("api:skill_level-list"))
+        for url, filters in self.urls:
+            with self.subTest(url=url, filters=filters):
+                with self.assertNumQueries(0):
+                    self.client.get(url, filters)
+
+    def test_errors(self):
+        """
+        Проверяет ответы на неверный фильтр и несуществующий объект
+        в адресе.
+        """
+        cases = (
+            (reverse("api:skill_level-list"), {"team": "команда"}, 400),
+            (
+                reverse("api:suitability_position-list"),
+                {"start_date": "2024-13-01"},
+                400,
+            ),
+            (reverse("api:employee_skills-list", args=(0,)), {}, 404),
+            (reverse("api:skill_employee-list", args=(0,)), {}, 404),
+            (reverse("api:grade_rating-list", args=(0,)), {}, 404),
+            (
+                reverse("api:employee_rating-list", args=(0, "Junior")),
+                {},
+                404,
+            ),
+        )
+        for url, filters, status_code in cases:
+            with self.subTest(url=url, filters=filters):
+                self.assertEqual(
+                    self.client.get(url, filters).status_code, status_code
+                )
+                with override_settings(ANALYTICS_ENGINE_VIEWS=[]):
+                    self.assertEqual(
+                        self.client.get(url, filters).status_code,
+                        status_code,
+                    )
+
+    def test_reset_engine(self):
+        """Проверяет загрузку оценок заново после сброса движка."""
+        url = reverse("api:skills_development-list")
+        self.assertEqual(len(self.client.get(url).data), 2)
+        baker.make(
+            "ratings.Rating",
+            employee=self.employee,
+            skill=self.skill,
+            rating_date=date(2024, 3, 1),
+        )
+        self.assertEqual(len(self.client.get(url).data), 2)
+        reset_engine()
+        self.assertEqual(len(self.client.get(url).data), 3)
+
+    @override_settings(USE_CHART_CACHE=True, CACHES=CHART_CACHES)
+    def test_data_version(self):
+        """
+        Проверяет, что после изменения оценок движок загружает их
+        заново, а не отдает ответ по прежним оценкам.
+        """
+        caches["charts"].clear()
+        url = reverse("api:skill_level-list")
+        filters = {"skill": self.skill.id}
+        before = self.client.get(url, filters).data
+        with self.captureOnCommitCallbacks(execute=True):
+            for rating in Rating.objects.filter(skill=self.skill):
+                rating.rating_value = 5
+                rating.save()
+        response = self.client.get(url, filters)
+        self.assertEqual(response["X-Chart-Cache"], "miss")
+        self.assertNotEqual(response.data, before)
+        with override_settings(ANALYTICS_ENGINE_VIEWS=[]):
+            expected = self.client.get(url, filters)
+        self.assertEqual(get_items(response.data), get_items(expected.data))
@@ -0,0 +1,195 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from imports.constants import (
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    JOB_TIMEOUT_MESSAGE,
+)
+from imports.jobs import process_job
+from imports.models import ImportJob
+from ratings.models import Rating
+from tests.tests_imports.tests_pipeline import ROWS, make_workbook
+
+
+class TestImportJobViewSet(APITestCase):
+
+    url = reverse("api:imports-list")
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = baker.make("auth.User", is_staff=True)
+        cls.user = baker.make("auth.User")
+
+    def setUp(self):
+        # Загруженные в тестах файлы сохраняются во временный каталог
+        upload_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, upload_root)
+        patcher = mock.patch.object(
+            ImportJob._meta.get_field("file"),
+            "storage",
+            FileSystemStorage(location=upload_root),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def upload(self, rows=ROWS, name="ratings.xlsx", **data):
+        with open(make_workbook(rows), "rb") as file:
+            upload = SimpleUploadedFile(name, file.read())
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(
+                self.url, {"file": upload, **data}, format="multipart"
+            )
+        return response, callbacks
+
+    def test_permissions(self):
+        response, _ = self.upload()
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(self.user)
+        response, _ = self.upload()
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(ImportJob.objects.exists())
+
+    def test_upload(self):
+        self.client.force_authenticate(self.admin)
+        response, callbacks = self.upload()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], JOB_QUEUED)
+        self.assertTrue(response.data["upsert"])
+        self.assertFalse(response.data["atomic"])
+        self.assertEqual(response.data["file_name"], "ratings.xlsx")
+        # Задача ждет процесс run_import_jobs
+        self.assertEqual(len(callbacks), 0)
+        self.assertFalse(Rating.objects.exists())
+        job = ImportJob.objects.get(pk=response.data["id"])
+        self.assertTrue(job.file.storage.exists(job.file.name))
+
+        process_job(response.data["id"])
+        self.assertIsNotNone(
+            ImportJob.objects.get(pk=job.pk).heartbeat_at
+        )
+        # Загруженный файл после импорта не нужен
+        self.assertFalse(job.file.storage.exists(job.file.name))
+        response = self.client.get(
+            reverse("api:imports-detail", args=(response.data["id"],))
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], JOB_SUCCEEDED)
+        self.assertEqual(response.data["rows_read"], len(ROWS))
+        self.assertEqual(response.data["rows_inserted"], len(ROWS))
+        self.assertIsNotNone(response.data["rows_per_second"])
+        self.assertEqual(response.data["errors"], [])
+        self.assertEqual(Rating.objects.count(), len(ROWS))
+
+    @override_settings(IMPORT_JOBS_IN_PROCESS=True)
+    def test_in_process(self):
+        self.client.force_authenticate(self.admin)
+        with mock.patch("imports.jobs.get_executor") as get_executor:
+            response, callbacks = self.upload()
+            # Импорт не выполняется в обработчике запроса
+            self.assertEqual(len(callbacks), 1)
+            get_executor.assert_not_called()
+            callbacks[0]()
+        get_executor.return_value.submit.assert_called_once_with(
+            mock.ANY, response.data["id"]
+        )
+
+    def test_invalid_file(self):
+        self.client.force_authenticate(self.admin)
+        rows = [("Иванов",) + ROWS[0][1:]]
+        response, _ = self.upload(rows)
+        process_job(response.data["id"])
+        job = ImportJob.objects.get(pk=response.data["id"])
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertTrue(job.errors)
+        self.assertFalse(Rating.objects.exists())
+        self.assertFalse(job.file.storage.exists(job.file.name))
+
+    @mock.patch("imports.jobs.DEFAULT_CHUNK_SIZE", 1)
+    def test_atomic(self):
+        """
+        Проверяет, что задача с atomic не оставляет части строк при
+        ошибке импорта, а задача без atomic сохраняет пачки, загруженные
+        до ошибки.
+        """
+        self.client.force_authenticate(self.admin)
+        for atomic, count in ((True, 0), (False, 2)):
+            with self.subTest(atomic=atomic), mock.patch(
+                "imports.jobs.save_progress",
+                side_effect=[None, RuntimeError("сбой")],
+            ):
+                response, _ = self.upload(atomic=atomic)
+                process_job(response.data["id"])
+                job = ImportJob.objects.get(pk=response.data["id"])
+                self.assertEqual(job.status, JOB_FAILED)
+                self.assertEqual(job.errors, ["Ошибка импорта: сбой"])
+                self.assertEqual(Rating.objects.count(), count)
+                self.assertFalse(job.file.storage.exists(job.file.name))
+
+    @override_settings(IMPORT_JOB_TIMEOUT=60)
+    def test_stale_jobs(self):
+        """
+        Проверяет, что задачи, от которых дольше IMPORT_JOB_TIMEOUT нет
+        сигнала, завершаются с ошибкой, а остальные продолжают
+        выполняться, даже если начаты давно.
+        """
+        self.client.force_authenticate(self.admin)
+        stale_id = self.upload()[0].data["id"]
+        running_id = self.upload()[0].data["id"]
+        started_at = timezone.now() - timedelta(seconds=61)
+        ImportJob.objects.filter(pk=stale_id).update(
+            status=JOB_RUNNING,
+            started_at=started_at,
+            heartbeat_at=started_at,
+        )
+        ImportJob.objects.filter(pk=running_id).update(
+            status=JOB_RUNNING,
+            started_at=started_at,
+            heartbeat_at=timezone.now(),
+        )
+        out = StringIO()
+        call_command("run_import_jobs", stdout=out)
+        self.assertIn("Прервано задач: 1", out.getvalue())
+        stale = ImportJob.objects.get(pk=stale_id)
+        self.assertEqual(stale.status, JOB_FAILED)
+        self.assertEqual(stale.errors, [JOB_TIMEOUT_MESSAGE])
+        self.assertIsNotNone(stale.finished_at)
+        self.assertFalse(stale.file.storage.exists(stale.file.name))
+        running = ImportJob.objects.get(pk=running_id)
+        self.assertEqual(running.status, JOB_RUNNING)
+        self.assertTrue(running.file.storage.exists(running.file.name))
+
+    def test_wrong_extension(self):
+        self.client.force_authenticate(self.admin)
+        response, _ = self.upload(name="ratings.txt")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("file", response.data)
+
+    def test_run_import_jobs(self):
+        self.client.force_authenticate(self.admin)
+        response, _ = self.upload()
+        call_command("run_import_jobs", stdout=StringIO())
+        job = ImportJob.objects.get(pk=response.data["id"])
+        self.assertEqual(job.status, JOB_SUCCEEDED)
+        self.assertIsNotNone(job.finished_at)
+        # Выполненная задача повторно не запускается
+        process_job(job.pk)
+        self.assertEqual(
+            ImportJob.objects.get(pk=job.pk).finished_at, job.finished_at
+        )
+        self.assertEqual(Rating.objects.count(), len(ROWS))
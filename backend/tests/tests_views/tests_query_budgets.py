@@ -0,0 +1,142 @@
+#           План тестирования количества запросов к БД
+#    1) Проверка, что у каждого адреса router_v1 есть бюджет запросов
+#       и ответ укладывается в него
+#    2) Проверка, что количество запросов не растет с количеством
+#       сотрудников, оценок и задач импорта в ответе
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from api.v1.urls import router_v1
+from ratings.models import Rating, Skill
+from tests.tests_views.tests_rollup_views import ChartDataMixin
+
+# Наибольшее количество запросов к БД на GET-запрос к адресу router_v1
+QUERY_BUDGETS = {
+    "api-root": 0,
+    "positions-list": 1,
+    "positions-detail": 1,
+    "teams-list": 1,
+    "teams-detail": 1,
+    "employees-list": 1,
+    "employees-detail": 1,
+    "domains-list": 1,
+    "domains-detail": 1,
+    "skills-list": 1,
+    "skills-detail": 1,
+    "competences-list": 1,
+    "competences-detail": 1,
+    "raitings-list": 1,
+    "raitings-detail": 1,
+    "suitability_position-list": 1,
+    # Проверка сотрудника и оценки
+    "employee_skills-list": 2,
+    "employees_count_with_skills-list": 1,
+    # Проверка навыка и сотрудники
+    "skill_employee-list": 2,
+    "employee_positions-list": 1,
+    "employee_grades-list": 1,
+    "employee_grades_positions-list": 1,
+    "skill_level-list": 1,
+    "employee_scores-list": 1,
+    "skills_development-list": 1,
+    "position_rating-list": 1,
+    # Проверка должности и оценки
+    "grade_rating-list": 2,
+    "employee_rating-list": 2,
+    "bus_factor-list": 1,
+    "bus_factor-top": 1,
+    "chart_cache_stats-list": 0,
+    "imports-list": 1,
+    "imports-detail": 1,
+}
+
+
+class TestQueryBudgets(ChartDataMixin, APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        baker.make("imports.ImportJob")
+
+    def setUp(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                username="admin", is_staff=True
+            )
+        )
+
+    def get_urls(self):
+        """Имена и адреса маршрутов router_v1 с параметрами из данных."""
+        values = {
+            "employee_id": self.employee.id,
+            "skill_id": self.skill.id,
+            "position_id": self.employee.position_id,
+            "grade_name": self.employee.grade,
+        }
+        urls = {}
+        for pattern in router_v1.urls:
+            params = set(pattern.pattern.regex.groupindex)
+            if "format" in params:
+                continue
+            kwargs = {name: values.get(name) for name in params}
+            if "pk" in params:
+                kwargs["pk"] = pattern.callback.cls.queryset.first().pk
+            urls[pattern.name] = reverse(f"api:{pattern.name}", kwargs=kwargs)
+        return urls
+
+    def count_queries(self):
+        counts = {}
+        for name, url in self.get_urls().items():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, (url, response.data))
+            counts[name] = len(queries)
+        return counts
+
+    def add_rows(self):
+        """Еще сотрудники с оценками по каждому навыку и задачи импорта."""
+        for employee in baker.make(
+            "employees.Employee",
+            last_name="Петров",
+            first_name=(f"Петр{number}" for number in range(5)),
+            team=self.employee.team,
+            position=self.employee.position,
+            grade=self.employee.grade,
+            _quantity=5,
+        ):
+            for skill in Skill.objects.all():
+                for month in (1, 2):
+                    baker.make(
+                        "ratings.Rating",
+                        employee=employee,
+                        skill=skill,
+                        rating_date=f"2024-0{month}-01",
+                        rating_value=month,
+                        suitability=Rating.YES,
+                    )
+        baker.make("imports.ImportJob", _quantity=3)
+
+    def test_budgets(self):
+        """
+        Проверяет, что у каждого адреса есть бюджет запросов и ответ
+        в него укладывается.
+        """
+        counts = self.count_queries()
+        self.assertEqual(set(counts), set(QUERY_BUDGETS))
+        for name, count in counts.items():
+            with self.subTest(name=name):
+                self.assertLessEqual(count, QUERY_BUDGETS[name])
+
+    def test_constant_queries(self):
+        """
+        Проверяет, что количество запросов не растет с количеством
+        строк в ответе.
+        """
+        counts = self.count_queries()
+        self.add_rows()
+        self.assertEqual(self.count_queries(), counts)
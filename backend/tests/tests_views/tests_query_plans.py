@@ -0,0 +1,164 @@
+#           План тестирования планов запросов чартов
+#    Для каждого чарта с каждым фильтром RatingFilter запросы
+#    к ratings_rating и витринам итогов с условием WHERE выполняются
+#    через EXPLAIN и проверяется, что таблицы читаются по условию
+#    индекса, а не целиком. Запросы без условий читают всю таблицу и
+#    не проверяются. Чарты проверяются с витринами и без них; витрины
+#    на порядки меньше оценок и без фильтров запроса читаются целиком.
+
+import json
+import unittest
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+RATING_TABLE = "ratings_rating"
+# Таблицы, которые не должны читаться целиком при фильтрах
+CHECKED_TABLES = (
+    RATING_TABLE,
+    "rollups_employeeskillrollup",
+    "rollups_skilldaterollup",
+)
+# Способы просмотра, которые отключаются при проверке планов
+SCAN_SETTINGS = ("enable_seqscan", "enable_indexscan", "enable_indexonlyscan")
+
+# Чарты без параметров в адресе
+CHART_VIEWS = (
+    "api:suitability_position-list",
+    "api:employees_count_with_skills-list",
+    "api:employee_positions-list",
+    "api:employee_grades-list",
+    "api:skill_level-list",
+    "api:employee_scores-list",
+    "api:skills_development-list",
+    "api:position_rating-list",
+    "api:bus_factor-list",
+    "api:raitings-list",
+)
+
+
+def iter_plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from iter_plan_nodes(child)
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql",
+    "Планы запросов проверяются на PostgreSQL",
+)
+class TestChartQueryPlans(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = baker.make(
+            "employees.Employee",
+            last_name="Иванов",
+            first_name="Иван",
+            grade="Middle",
+        )
+        cls.skill = baker.make("ratings.Skill", name="Python")
+        baker.make(
+            "ratings.Rating",
+            employee=cls.employee,
+            skill=cls.skill,
+            suitability="да",
+            rating_date="2024-02-01",
+        )
+        cls.filters = (
+            {},
+            {"employee": cls.employee.id},
+            {"team": cls.employee.team_id},
+            {"position": cls.employee.position_id},
+            {"grade": cls.employee.grade},
+            {"skill": cls.skill.id},
+            {"competence": cls.skill.competence_id},
+            {"domain": cls.skill.competence.domain_id},
+            {"start_date": "2024-01-01", "end_date": "2024-03-31"},
+        )
+        cls.urls = [
+            (reverse(view_name), filters)
+            for view_name in CHART_VIEWS
+            for filters in cls.filters
+        ] + [
+            (reverse("api:employee_skills-list", args=(cls.employee.id,)), {}),
+            (reverse("api:skill_employee-list", args=(cls.skill.id,)), {}),
+            (
+                reverse(
+                    "api:employee_grades_positions-list",
+                    args=(cls.employee.grade,),
+                ),
+                {},
+            ),
+            (
+                reverse(
+                    "api:grade_rating-list",
+                    args=(cls.employee.position_id,),
+                ),
+                {},
+            ),
+            (
+                reverse(
+                    "api:employee_rating-list",
+                    args=(cls.employee.position_id, cls.employee.grade),
+                ),
+                {},
+            ),
+        ]
+
+    def explain(self, sql):
+        """
+        План запроса в формате JSON. Без полного просмотра таблицы и
+        просмотра по индексу планировщику остается просмотр по битовой
+        карте, возможный только по условию индекса. Полный просмотр
+        таблицы или индекса выбирается, только если подходящего индекса
+        нет, как на таблице из миллионов строк, и не зависит от
+        статистики таблицы, которую автоанализ мог собрать по пустой
+        таблице между тестами.
+        """
+        with connection.cursor() as cursor:
+            for setting in SCAN_SETTINGS:
+                cursor.execute(f"SET LOCAL {setting} = off")
+            cursor.execute("EXPLAIN (FORMAT JSON) " + sql)
+            plan = cursor.fetchone()[0]
+            for setting in SCAN_SETTINGS:
+                cursor.execute(f"RESET {setting}")
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]["Plan"]
+
+    def assert_uses_index(self, url, sql):
+        for node in iter_plan_nodes(self.explain(sql)):
+            if node.get("Relation Name") not in CHECKED_TABLES:
+                continue
+            with self.subTest(url=url, node=node["Node Type"]):
+                self.assertNotEqual(node["Node Type"], "Seq Scan", sql)
+                self.assertTrue(
+                    "Index Cond" in node or "Recheck Cond" in node,
+                    f"Полный просмотр индекса: {sql}",
+                )
+
+    def assert_chart_queries_use_indexes(self, urls):
+        for url, filters in urls:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, filters)
+            self.assertEqual(response.status_code, 200, url)
+            for query in queries.captured_queries:
+                sql = query["sql"]
+                if " WHERE " in sql and any(
+                    table in sql for table in CHECKED_TABLES
+                ):
+                    self.assert_uses_index(url, sql)
+
+    def test_chart_queries_use_indexes(self):
+        self.assert_chart_queries_use_indexes(
+            (url, filters) for url, filters in self.urls if filters
+        )
+
+    @override_settings(USE_ROLLUPS=False)
+    def test_rating_queries_use_indexes(self):
+        self.assert_chart_queries_use_indexes(self.urls)
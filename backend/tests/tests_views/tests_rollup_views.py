@@ -0,0 +1,196 @@
+#           План тестирования чартов по витринам итогов
+#    Для каждого чарта с каждым фильтром RatingFilter ответ,
+#    посчитанный по витринам, совпадает с ответом по самим оценкам.
+#    Проверяется выбор витрины по фильтрам запроса.
+
+from datetime import date
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from ratings.models import Rating
+
+# Чарты без параметров в адресе
+CHART_VIEWS = (
+    "api:suitability_position-list",
+    "api:employees_count_with_skills-list",
+    "api:employee_positions-list",
+    "api:employee_grades-list",
+    "api:skill_level-list",
+    "api:skills_development-list",
+    "api:position_rating-list",
+    "api:bus_factor-list",
+)
+
+
+class ChartDataMixin:
+    """
+    Оценки трех сотрудников по четырем навыкам двух доменов на две даты
+    и адреса чартов со всеми фильтрами RatingFilter.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        domains = [
+            baker.make("ratings.Domain", name=name)
+            for name in ("Hard skills", "Soft skills")
+        ]
+        skills = [
+            baker.make(
+                "ratings.Skill",
+                competence=baker.make("ratings.Competence", domain=domain),
+                name=f"Навык {number}",
+            )
+            for number, domain in enumerate(domains * 2)
+        ]
+        employees = [
+            baker.make(
+                "employees.Employee",
+                last_name="Иванов",
+                first_name=f"Иван{'н' * number}",
+                grade=grade,
+            )
+            for number, grade in enumerate(("Junior", "Middle", "Senior"))
+        ]
+        suitabilities = (Rating.YES, Rating.NO, Rating.NOT_REQUIRED)
+        for number, (employee, skill) in enumerate(
+            (employee, skill) for employee in employees for skill in skills
+        ):
+            for month in (1, 2):
+                baker.make(
+                    "ratings.Rating",
+                    employee=employee,
+                    skill=skill,
+                    rating_date=date(2024, month, 1),
+                    rating_value=(number + month) % 5 + 1,
+                    suitability=suitabilities[(number + month) % 3],
+                )
+        cls.employee = employees[0]
+        cls.skill = skills[0]
+        cls.filters = (
+            {},
+            {"employee": cls.employee.id},
+            {"team": cls.employee.team_id},
+            {"position": cls.employee.position_id},
+            {"grade": cls.employee.grade},
+            {"skill": cls.skill.id},
+            {"competence": cls.skill.competence_id},
+            {"domain": cls.skill.competence.domain_id},
+            {"start_date": "2024-02-01"},
+        )
+        cls.urls = [
+            (reverse(view_name), filters)
+            for view_name in CHART_VIEWS
+            for filters in cls.filters
+        ] + [
+            (reverse("api:employee_skills-list", args=(cls.employee.id,)), {}),
+            # Вьюсет без filterset_class параметры фильтра не применяет
+            (
+                reverse("api:employee_skills-list", args=(cls.employee.id,)),
+                {"skill": cls.skill.id},
+            ),
+            (reverse("api:skill_employee-list", args=(cls.skill.id,)), {}),
+            (
+                reverse(
+                    "api:employee_grades_positions-list",
+                    args=(cls.employee.grade,),
+                ),
+                {},
+            ),
+            (
+                reverse(
+                    "api:grade_rating-list",
+                    args=(cls.employee.position_id,),
+                ),
+                {},
+            ),
+            (
+                reverse(
+                    "api:employee_rating-list",
+                    args=(cls.employee.position_id, cls.employee.grade),
+                ),
+                {},
+            ),
+            (reverse("api:bus_factor-top"), {}),
+        ] + [
+            (reverse("api:bus_factor-top"), {"scope": scope, "limit": 1})
+            for scope in ("team", "competence", "domain")
+        ]
+
+
+class TestRollupViews(ChartDataMixin, APITestCase):
+
+    def test_rollup_responses(self):
+        """
+        Проверяет, что ответы по витринам совпадают с ответами
+        по оценкам.
+        """
+        for url, filters in self.urls:
+            with self.subTest(url=url, filters=filters):
+                response = self.client.get(url, filters)
+                self.assertEqual(response.status_code, 200)
+                with override_settings(USE_ROLLUPS=False):
+                    expected = self.client.get(url, filters)
+                if isinstance(expected.data, list):
+                    self.assertEqual(
+                        sorted(map(repr, response.data)),
+                        sorted(map(repr, expected.data)),
+                    )
+                else:
+                    self.assertEqual(response.data, expected.data)
+
+    def get_tables(self, view_name, filters):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse(view_name), filters)
+        sql = " ".join(query["sql"] for query in queries.captured_queries)
+        return {
+            table
+            for table in (
+                "ratings_rating",
+                "rollups_employeeskillrollup",
+                "rollups_skilldaterollup",
+            )
+            if table in sql
+        }
+
+    def test_rollup_choice(self):
+        """Проверяет выбор витрины по фильтрам запроса."""
+        cases = (
+            (
+                "api:skill_level-list",
+                {"team": self.employee.team_id},
+                {"rollups_skilldaterollup"},
+            ),
+            (
+                "api:skill_level-list",
+                {"employee": self.employee.id},
+                {"rollups_employeeskillrollup"},
+            ),
+            (
+                "api:skill_level-list",
+                {"start_date": "2024-02-01"},
+                {"rollups_skilldaterollup"},
+            ),
+            (
+                "api:skills_development-list",
+                {},
+                {"rollups_skilldaterollup"},
+            ),
+            (
+                "api:suitability_position-list",
+                {"start_date": "2024-02-01"},
+                {"ratings_rating"},
+            ),
+            (
+                "api:skills_development-list",
+                {"employee": self.employee.id},
+                {"ratings_rating"},
+            ),
+        )
+        for view_name, filters, tables in cases:
+            with self.subTest(view_name=view_name, filters=filters):
+                self.assertEqual(self.get_tables(view_name, filters), tables)
@@ -0,0 +1,153 @@
+#           План тестирования объединения одновременных запросов
+#    1) Проверка, что одновременные вызовы с одним ключом выполняют
+#       функцию один раз и получают ее результат или исключение
+#    2) Проверка, что блокировка ключа разделяет потоки и процессы
+#    3) Проверка, что одновременные одинаковые запросы чарта получают
+#       ответ одного расчета
+
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from api.v1.chart_3.a_skills_level_views import SkillsLevelViewSet
+from api.v1.singleflight import SingleFlight, flight_lock
+from tests.tests_views.tests_chart_cache import CHART_CACHES
+
+# Время ожидания потоков теста, с
+TIMEOUT = 5
+
+
+def run_concurrently(function, count):
+    """
+    Вызывает function в count потоках одновременно, возвращает
+    результаты вызовов.
+    """
+    barrier = threading.Barrier(count)
+
+    def call(_):
+        barrier.wait(TIMEOUT)
+        return function()
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(call, range(count)))
+
+
+class TestSingleFlight(SimpleTestCase):
+
+    def test_shared_result(self):
+        """
+        Проверяет, что одновременные вызовы выполняют функцию один раз.
+        """
+        flights = SingleFlight()
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(TIMEOUT)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            leader = executor.submit(flights.do, "key", compute)
+            started.wait(TIMEOUT)
+            followers = [
+                executor.submit(flights.do, "key", compute)
+                for _ in range(3)
+            ]
+            other = executor.submit(flights.do, "other", lambda: "other")
+            self.assertEqual(other.result(TIMEOUT), ("other", False))
+            # Остальные вызовы успевают дождаться первого
+            time.sleep(0.2)
+            release.set()
+            self.assertEqual(leader.result(TIMEOUT), ("result", False))
+            for follower in followers:
+                self.assertEqual(follower.result(TIMEOUT), ("result", True))
+        self.assertEqual(len(calls), 1)
+        # Следующий вызов считает результат заново
+        self.assertEqual(flights.do("key", lambda: "new"), ("new", False))
+
+    def test_shared_error(self):
+        """Проверяет, что исключение получают все ожидающие вызовы."""
+        flights = SingleFlight()
+
+        def compute():
+            raise ValueError("ошибка")
+
+        results = run_concurrently(
+            lambda: self.assertRaises(
+                ValueError, flights.do, "key", compute
+            ),
+            3,
+        )
+        self.assertEqual(len(results), 3)
+        self.assertEqual(flights._calls, {})
+
+    def test_lock(self):
+        """Проверяет, что блокировка ключа разделяет потоки."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        acquired = threading.Event()
+
+        def acquire():
+            with flight_lock("key"):
+                acquired.set()
+
+        with override_settings(CHART_LOCK_DIR=directory):
+            with flight_lock("key"):
+                thread = threading.Thread(target=acquire)
+                thread.start()
+                self.assertFalse(acquired.wait(0.2))
+            self.assertTrue(acquired.wait(TIMEOUT))
+            thread.join(TIMEOUT)
+        with override_settings(CHART_LOCK_DIR=""):
+            with flight_lock("key"), flight_lock("key"):
+                pass
+
+
+@override_settings(USE_CHART_CACHE=True, CACHES=CHART_CACHES)
+class TestCoalescedRequests(SimpleTestCase):
+
+    def setUp(self):
+        caches["charts"].clear()
+
+    def test_coalesced_requests(self):
+        """
+        Проверяет, что одновременные одинаковые запросы чарта получают
+        ответ одного расчета.
+        """
+        calls = []
+
+        class ViewSet(SkillsLevelViewSet):
+
+            def get_cached_response(self, get_response, *args, **kwargs):
+                def compute(request, *args, **kwargs):
+                    calls.append(1)
+                    # Остальные запросы успевают дождаться расчета
+                    time.sleep(0.5)
+                    return Response([{"skill_name": "Python"}])
+                return super().get_cached_response(compute, *args, **kwargs)
+
+        view = ViewSet.as_view({"get": "list"})
+        factory = APIRequestFactory()
+        responses = run_concurrently(
+            lambda: view(factory.get("/", {"team": "1"})), 4
+        )
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(
+            sorted(response["X-Chart-Cache"] for response in responses),
+            ["coalesced"] * 3 + ["miss"],
+        )
+        for response in responses:
+            self.assertEqual(response.data, [{"skill_name": "Python"}])
+        self.assertEqual(
+            view(factory.get("/", {"team": "01"}))["X-Chart-Cache"], "hit"
+        )
@@ -0,0 +1,101 @@
+#           План тестирования выгрузок строками
+#    1) Проверка, что выгрузки NDJSON и CSV содержат те же строки
+#       в том же порядке, что и страницы списка
+#    2) Проверка, что выгрузка отдается потоком и читает строки
+#       порциями EXPORT_CHUNK_SIZE
+#    3) Проверка, что выгрузка учитывает фильтры и не кэшируется
+#    4) Проверка ответа на неверный фильтр в формате выгрузки
+
+import csv
+import io
+import json
+
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from ratings.models import Rating
+from tests.tests_views.tests_chart_cache import CHART_CACHES
+from tests.tests_views.tests_rollup_views import ChartDataMixin
+
+EXPORT_VIEWS = ("api:raitings-list", "api:employee_scores-list")
+
+
+@override_settings(
+    USE_CHART_CACHE=True, CACHES=CHART_CACHES, EXPORT_CHUNK_SIZE=5
+)
+class TestStreamingExport(ChartDataMixin, APITestCase):
+
+    def setUp(self):
+        caches["charts"].clear()
+
+    def get_results(self, url, filters=None):
+        return self.client.get(
+            url, {**(filters or {}), "page_size": 1000}
+        ).data["results"]
+
+    def get_export(self, url, export_format, filters=None):
+        response = self.client.get(
+            url, {**(filters or {}), "format": export_format}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        """Проверяет, что строки NDJSON совпадают со страницей списка."""
+        for view_name in EXPORT_VIEWS:
+            with self.subTest(view_name=view_name):
+                url = reverse(view_name)
+                response, content = self.get_export(url, "ndjson")
+                self.assertEqual(
+                    response["Content-Type"],
+                    "application/x-ndjson; charset=utf-8",
+                )
+                self.assertEqual(
+                    [json.loads(line) for line in content.splitlines()],
+                    json.loads(json.dumps(self.get_results(url))),
+                )
+
+    def test_csv(self):
+        """Проверяет, что строки CSV совпадают со страницей списка."""
+        for view_name in EXPORT_VIEWS:
+            with self.subTest(view_name=view_name):
+                url = reverse(view_name)
+                response, content = self.get_export(url, "csv")
+                self.assertIn(".csv", response["Content-Disposition"])
+                expected = self.get_results(url)
+                self.assertEqual(
+                    list(csv.DictReader(io.StringIO(content))),
+                    [
+                        {key: str(value) for key, value in item.items()}
+                        for item in expected
+                    ],
+                )
+
+    def test_streaming(self):
+        """
+        Проверяет, что выгрузка отдается частями по EXPORT_CHUNK_SIZE
+        строк, фильтруется и не попадает в кэш чартов.
+        """
+        url = reverse("api:employee_scores-list")
+        filters = {"team": self.employee.team_id}
+        response, content = self.get_export(url, "ndjson", filters)
+        self.assertEqual(
+            len(content.splitlines()),
+            Rating.objects.filter(team=self.employee.team_id).count(),
+        )
+        self.assertNotIn("X-Chart-Cache", response)
+        response = self.client.get(url, {"format": "ndjson"})
+        chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), -(-Rating.objects.count() // 5))
+
+    def test_invalid_filter(self):
+        """Проверяет ответ на неверный фильтр в формате выгрузки."""
+        response = self.client.get(
+            reverse("api:raitings-list"),
+            {"team": "команда", "format": "ndjson"},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("team", json.loads(response.content))